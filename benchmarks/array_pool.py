@@ -0,0 +1,39 @@
+""" Measures what an ArrayPool saves a table that keeps growing and shrinking.
+
+A table is filled with entries and then emptied, over and over, so every
+cycle rehashes up through TABLE_SIZES and back down. Reports seconds per
+cycle with and without a pool, and the pool's counters.
+
+`python -m benchmarks.array_pool [entries] [cycles]`
+"""
+from __future__ import annotations
+
+import sys
+from time import perf_counter
+
+from data_structures.array_pool import ArrayPool
+from data_structures.hash_table import LinearProbeTable
+
+
+def churn(table: LinearProbeTable, entries: int, cycles: int) -> float:
+    """ Seconds per fill-and-empty cycle. """
+    start = perf_counter()
+    for _ in range(cycles):
+        for i in range(entries):
+            table[i] = i
+        for i in range(entries):
+            del table[i]
+    return (perf_counter() - start) / cycles
+
+
+def main(entries: int, cycles: int) -> None:
+    pool = ArrayPool()
+    print(f"{'arrays':>8} {'s/cycle':>10}")
+    print(f"{'new':>8} {churn(LinearProbeTable(), entries, cycles):>10.3f}")
+    print(f"{'pooled':>8} {churn(LinearProbeTable(pool=pool), entries, cycles):>10.3f}")
+    print(pool.stats())
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200000,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 5)
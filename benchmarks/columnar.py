@@ -0,0 +1,57 @@
+""" Compares the tuple-per-slot and columnar slot layouts.
+
+Reports the memory each table holds per entry (keys and values are shared,
+so only the table's own structures count) and operations per second.
+
+`python -m benchmarks.columnar [entries]`
+"""
+from __future__ import annotations
+
+import sys
+import time
+import tracemalloc
+
+from data_structures.columnar_hash_table import ColumnarProbeTable
+from data_structures.hash_table import LinearProbeTable
+
+LAYOUTS = {
+    "tuple slots": lambda: LinearProbeTable(store_hashes=True),
+    "columnar": ColumnarProbeTable,
+}
+
+
+def per_second(func, items: list) -> float:
+    """ Calls of func per second over items. """
+    start = time.perf_counter()
+    for item in items:
+        func(item)
+    return len(items) / (time.perf_counter() - start)
+
+
+def main(entries: int) -> None:
+    keys = [f"host-{i:09d}.example.com" for i in range(entries)]
+    misses = [f"miss-{i:09d}.example.com" for i in range(min(entries, 100000))]
+    hits = keys[::max(1, entries // 100000)]
+    for key in keys + misses:
+        hash(key)
+
+    print(f"{'layout':>12} {'bytes/entry':>12} {'insert/s':>10} {'update/s':>10} {'hit/s':>10} {'miss/s':>10}")
+    for name, make in LAYOUTS.items():
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        table = make()
+        for key in keys:
+            table[key] = 0
+        size = (tracemalloc.get_traced_memory()[0] - before) / entries
+        tracemalloc.stop()
+
+        table = make()
+        insert = per_second(lambda key: table.__setitem__(key, 0), keys)
+        update = per_second(lambda key: table.__setitem__(key, 1), hits)
+        hit = per_second(table.__getitem__, hits)
+        miss = per_second(table.__contains__, misses)
+        print(f"{name:>12} {size:>12.1f} {insert:>10.0f} {update:>10.0f} {hit:>10.0f} {miss:>10.0f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000)
@@ -0,0 +1,75 @@
+""" Multi-threaded throughput of a shared hash table.
+
+Each thread runs a mix of 80% lookups and 20% inserts over its own keys,
+against either one LinearProbeTable behind a single lock, or a
+ConcurrentTable with striped locks. On a standard build the GIL lets only
+one thread run Python at a time, so striping mostly saves lock waits; on a
+free-threaded build (python3.13t and later) the shards also run in parallel.
+
+`python -m benchmarks.concurrent [operations per thread]`
+"""
+from __future__ import annotations
+
+import sys
+import threading
+from time import perf_counter
+
+from data_structures.concurrent_hash_table import ConcurrentTable
+from data_structures.hash_table import LinearProbeTable
+
+THREAD_COUNTS = [1, 2, 4, 8]
+
+
+class LockedTable:
+    """ One LinearProbeTable behind one lock, for comparison. """
+
+    def __init__(self) -> None:
+        self.table = LinearProbeTable()
+        self.lock = threading.Lock()
+
+    def __getitem__(self, key):
+        with self.lock:
+            return self.table[key]
+
+    def __setitem__(self, key, data) -> None:
+        with self.lock:
+            self.table[key] = data
+
+
+TABLES = {
+    "single lock": LockedTable,
+    "striped": lambda: ConcurrentTable(shard_count=64),
+}
+
+
+def work(table, thread: int, operations: int) -> None:
+    keys = [f"t{thread}-{i}" for i in range(operations // 5)]
+    for key in keys:
+        table[key] = 0
+        for _ in range(4):
+            table[key]
+
+
+def throughput(make, threads: int, operations: int) -> float:
+    """ Operations per second over all threads. """
+    table = make()
+    workers = [threading.Thread(target=work, args=(table, thread, operations)) for thread in range(threads)]
+    start = perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return threads * operations / (perf_counter() - start)
+
+
+def main(operations: int) -> None:
+    gil = getattr(sys, "_is_gil_enabled", lambda: True)()
+    print(f"Python {sys.version.split()[0]}, GIL {'enabled' if gil else 'disabled'}")
+    print(f"{'table':>12}" + "".join(f"{f'{threads} threads':>12}" for threads in THREAD_COUNTS) + "  (ops/s)")
+    for name, make in TABLES.items():
+        row = [throughput(make, threads, operations) for threads in THREAD_COUNTS]
+        print(f"{name:>12}" + "".join(f"{ops:>12.0f}" for ops in row))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
@@ -0,0 +1,51 @@
+""" Compares lookup latency of the cuckoo and linear probe tables.
+
+Each lookup is timed on its own, so the percentiles include the timer's
+overhead, which is the same for every table.
+
+`python -m benchmarks.cuckoo [entries]`
+"""
+from __future__ import annotations
+
+import random
+import sys
+from time import perf_counter_ns
+
+from data_structures.cuckoo_table import CuckooTable
+from data_structures.hash_table import LinearProbeTable
+
+TABLES = {
+    "linear": lambda: LinearProbeTable(store_hashes=True),
+    "cuckoo": CuckooTable,
+}
+
+
+def percentiles(func, items: list) -> tuple[float, float, float]:
+    """ p50, p99 and max nanoseconds per call of func over items. """
+    times = []
+    for item in items:
+        start = perf_counter_ns()
+        func(item)
+        times.append(perf_counter_ns() - start)
+    times.sort()
+    return times[len(times) // 2], times[len(times) * 99 // 100], times[-1]
+
+
+def main(entries: int) -> None:
+    rng = random.Random(1008)
+    keys = [f"host-{rng.getrandbits(48):012x}" for _ in range(entries)]
+    hits = rng.sample(keys, min(entries, 100000))
+    misses = [f"miss-{rng.getrandbits(48):012x}" for _ in range(len(hits))]
+
+    print(f"{'table':>8} {'hit p50':>8} {'hit p99':>8} {'hit max':>8} {'miss p50':>9} {'miss p99':>9} {'miss max':>9}  (ns)")
+    for name, make in TABLES.items():
+        table = make()
+        for key in keys:
+            table[key] = None
+        hit = percentiles(table.__getitem__, hits)
+        miss = percentiles(table.__contains__, misses)
+        print(f"{name:>8} {hit[0]:>8} {hit[1]:>8} {hit[2]:>8} {miss[0]:>9} {miss[1]:>9} {miss[2]:>9}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500000)
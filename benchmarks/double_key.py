@@ -0,0 +1,58 @@
+""" Compares the nested DoubleKeyTable with the flat CompositeKeyTable.
+
+Both are filled with the same (key1, key2) pairs, PAIRS_PER_KEY1 to a
+key1 on average, then looked up in a random order. Reports build time,
+memory held by the table (as traced by tracemalloc, which slows the
+build down) and point lookups per second.
+
+`python -m benchmarks.double_key [pairs]`
+"""
+from __future__ import annotations
+
+import random
+import sys
+import tracemalloc
+from time import perf_counter
+
+from composite_key_table import CompositeKeyTable
+from double_key_table import DoubleKeyTable
+
+PAIRS_PER_KEY1 = 2
+LOOKUPS = 100000
+
+
+def make_pairs(pairs: int) -> list[tuple[str, str]]:
+    key1s = pairs // PAIRS_PER_KEY1
+    rng = random.Random(1008)
+    return [(f"user{rng.randrange(key1s):08d}", f"item{i:08d}") for i in range(pairs)]
+
+
+def run(table, pairs: list[tuple[str, str]]) -> tuple[float, float, float]:
+    """ Build seconds, MiB held and lookups per second for one table. """
+    tracemalloc.start()
+    start = perf_counter()
+    for i, pair in enumerate(pairs):
+        table[pair] = i
+    build = perf_counter() - start
+    held = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    sample = random.Random(2).sample(pairs, min(LOOKUPS, len(pairs)))
+    start = perf_counter()
+    for pair in sample:
+        table[pair]
+    lookups = len(sample) / (perf_counter() - start)
+    return build, held / 2 ** 20, lookups
+
+
+def main(count: int) -> None:
+    pairs = make_pairs(count)
+    print(f"{len(pairs)} pairs, {len({key1 for key1, _ in pairs})} key1s")
+    print(f"{'table':>10} {'build s':>9} {'MiB':>8} {'lookups/s':>10}")
+    for label, table in (("nested", DoubleKeyTable()), ("composite", CompositeKeyTable())):
+        build, held, lookups = run(table, pairs)
+        print(f"{label:>10} {build:>9.2f} {held:>8.1f} {lookups:>10.0f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000)
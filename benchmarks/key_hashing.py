@@ -0,0 +1,43 @@
+""" Compares LinearProbeTable's hashes for each key type against
+hashing the same keys as strings.
+
+`python -m benchmarks.key_hashing`
+"""
+from __future__ import annotations
+
+import time
+
+from data_structures.hash_table import LinearProbeTable
+
+ENTRIES = 50000
+
+
+def per_op(func, items: list) -> float:
+    """ Microseconds per call of func over items. """
+    start = time.perf_counter()
+    for item in items:
+        func(item)
+    return (time.perf_counter() - start) / len(items) * 1e6
+
+
+def main() -> None:
+    ids = [i * 7919 for i in range(ENTRIES)]
+    key_sets = {
+        "int": ids,
+        "bytes": [b"host-%d.example.com" % i for i in ids],
+        "(int, str)": [(i, f"region-{i % 13}") for i in ids],
+    }
+
+    print(f"{'key type':>12} {'path':>8} {'hash us':>8} {'insert us':>10} {'lookup us':>10}")
+    for name, keys in key_sets.items():
+        for path, path_keys in [("native", keys), ("str()", [str(key) for key in keys])]:
+            sizer = LinearProbeTable(expected_size=ENTRIES)
+            hashing = per_op(sizer.hash, path_keys)
+            table = LinearProbeTable()
+            insert = per_op(lambda key: table.__setitem__(key, None), path_keys)
+            lookup = per_op(table.__getitem__, path_keys)
+            print(f"{name:>12} {path:>8} {hashing:>8.2f} {insert:>10.2f} {lookup:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+""" Compares probing strategies at fixed load factors.
+
+Every table gets a single size, so it never rehashes and the load factor
+can go past the usual 0.5 threshold.
+
+`python -m benchmarks.probing`
+"""
+from __future__ import annotations
+
+import random
+import time
+
+from data_structures.columnar_hash_table import ColumnarProbeTable
+from data_structures.hash_table import LinearProbeTable
+from data_structures.robin_hood_table import RobinHoodTable
+from data_structures.swiss_table import SwissTable
+
+TABLE_SIZE = 24593
+LOAD_FACTORS = [0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9]
+
+STRATEGIES = {
+    "linear": lambda: LinearProbeTable(sizes=[TABLE_SIZE]),
+    "linear+hashes": lambda: LinearProbeTable(sizes=[TABLE_SIZE], store_hashes=True),
+    "robin hood": lambda: RobinHoodTable(sizes=[TABLE_SIZE]),
+    "columnar": lambda: ColumnarProbeTable(sizes=[TABLE_SIZE]),
+    "swiss": lambda: SwissTable(sizes=[TABLE_SIZE]),
+}
+
+
+def per_op(func, items: list) -> float:
+    """ Microseconds per call of func over items. """
+    start = time.perf_counter()
+    for item in items:
+        func(item)
+    return (time.perf_counter() - start) / len(items) * 1e6
+
+
+def main() -> None:
+    rng = random.Random(1008)
+    keys = [f"host-{rng.getrandbits(48):012x}.example.com" for _ in range(TABLE_SIZE)]
+    misses = [f"miss-{rng.getrandbits(48):012x}.example.com" for _ in range(5000)]
+
+    print(f"{'load':>5} {'strategy':>14} {'insert us':>10} {'hit us':>8} {'miss us':>8}")
+    for load in LOAD_FACTORS:
+        batch = keys[:int(TABLE_SIZE * load)]
+        hits = rng.sample(batch, 5000)
+        for name, make in STRATEGIES.items():
+            table = make()
+            insert = per_op(lambda key: table.__setitem__(key, None), batch)
+            hit = per_op(table.__contains__, hits)
+            miss = per_op(table.__contains__, misses)
+            print(f"{load:>5} {name:>14} {insert:>10.2f} {hit:>8.2f} {miss:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+""" Compares workers building their own table with workers sharing one.
+
+Each worker process either builds its own LinearProbeTable of the same
+entries, or attaches to one SharedProbeTable the parent built. Reports
+each setup's mean worker startup time, peak resident memory per worker,
+and lookups per second once started.
+
+`python -m benchmarks.shared_memory [entries] [workers]`
+"""
+from __future__ import annotations
+
+import multiprocessing
+import resource
+import sys
+from time import perf_counter
+
+from data_structures.hash_table import LinearProbeTable
+from data_structures.shared_hash_table import SharedProbeTable
+
+LOOKUPS = 100000
+
+
+def make_keys(entries: int, step: int = 1) -> list[str]:
+    return [f"host-{i:09d}.example.com" for i in range(0, entries, step)]
+
+
+def worker(entries: int, name: str | None, results) -> None:
+    """ Start up one way or the other, then look up LOOKUPS keys. """
+    keys = make_keys(entries, max(1, entries // LOOKUPS))
+    start = perf_counter()
+    if name is None:
+        table = LinearProbeTable(expected_size=entries)
+        for i in range(entries):
+            table[f"host-{i:09d}.example.com"] = i
+    else:
+        table = SharedProbeTable(name)
+    startup = perf_counter() - start
+
+    start = perf_counter()
+    for key in keys:
+        table[key]
+    lookups = len(keys) / (perf_counter() - start)
+    results.put((startup, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, lookups))
+
+
+def run(context, entries: int, workers: int, name: str | None) -> tuple[float, float, float]:
+    """ Mean startup seconds, peak RSS in MiB and lookups per second over the workers. """
+    results = context.Queue()
+    processes = [context.Process(target=worker, args=(entries, name, results)) for _ in range(workers)]
+    for process in processes:
+        process.start()
+    measured = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+    return tuple(sum(values) / workers for values in zip(*measured))
+
+
+def main(entries: int, workers: int) -> None:
+    context = multiprocessing.get_context("spawn")
+    start = perf_counter()
+    shared = SharedProbeTable(expected_size=entries)
+    for i, key in enumerate(make_keys(entries)):
+        shared[key] = i
+    build = perf_counter() - start
+    print(f"parent built the shared table in {build:.2f}s, {shared.heap_end / 2 ** 20:.1f} MiB")
+
+    try:
+        print(f"{'workers':>8} {'startup s':>10} {'peak RSS MiB':>13} {'lookups/s':>10}")
+        for label, name in (("own", None), ("shared", shared.name)):
+            startup, rss, lookups = run(context, entries, workers, name)
+            print(f"{label:>8} {startup:>10.3f} {rss / 1024:>13.1f} {lookups:>10.0f}")
+    finally:
+        shared.unlink()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200000,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 4)
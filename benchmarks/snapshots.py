@@ -0,0 +1,70 @@
+""" Stress test for readers scanning a table while a writer inserts.
+
+The writer inserts "0", "1", "2", ... in order, so a consistent scan sees
+exactly the keys "0" up to str(n - 1) for some n. Readers either scan the
+live table (racing with every insert and rehash), or the latest snapshot
+the writer published. Inconsistent scans are counted, along with the
+writer's throughput and the number of scans each setup managed.
+
+`python -m benchmarks.snapshots [entries] [readers]`
+"""
+from __future__ import annotations
+
+import sys
+import threading
+from time import perf_counter
+
+from data_structures.hash_table import LinearProbeTable
+
+# The writer publishes a snapshot every this many inserts.
+PUBLISH_EVERY = 1000
+
+
+def consistent(keys: list[str]) -> bool:
+    """ Whether keys is exactly "0" up to str(len(keys) - 1). """
+    numbers = set(map(int, keys))
+    return len(numbers) == len(keys) and (not keys or max(numbers) == len(keys) - 1)
+
+
+def run(entries: int, readers: int, use_snapshots: bool) -> tuple[float, int, int]:
+    """ Writes per second, scans done and inconsistent scans, for one setup. """
+    table = LinearProbeTable(copy_on_write=use_snapshots)
+    latest = [table.snapshot() if use_snapshots else table]
+    done = threading.Event()
+    scans = [0] * readers
+    bad = [0] * readers
+
+    def read(reader: int) -> None:
+        while not done.is_set():
+            try:
+                ok = consistent(latest[0].keys())
+            except Exception:
+                ok = False
+            scans[reader] += 1
+            bad[reader] += not ok
+
+    threads = [threading.Thread(target=read, args=(reader,)) for reader in range(readers)]
+    for thread in threads:
+        thread.start()
+    start = perf_counter()
+    for i in range(entries):
+        table[str(i)] = i
+        if use_snapshots and i % PUBLISH_EVERY == 0:
+            latest[0] = table.snapshot()
+    seconds = perf_counter() - start
+    done.set()
+    for thread in threads:
+        thread.join()
+    return entries / seconds, sum(scans), sum(bad)
+
+
+def main(entries: int, readers: int) -> None:
+    print(f"{'readers scan':>14} {'writes/s':>10} {'scans':>7} {'inconsistent':>13}")
+    for name, use_snapshots in (("live table", False), ("snapshots", True)):
+        writes, scans, bad = run(entries, readers, use_snapshots)
+        print(f"{name:>14} {writes:>10.0f} {scans:>7} {bad:>13}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200000,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 4)
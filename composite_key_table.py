@@ -0,0 +1,226 @@
+from __future__ import annotations
+
+from typing import Generic, TypeVar, Iterator
+from data_structures.hash_table import LinearProbeTable
+from data_structures.table_stats import TableStats
+from data_structures.bloom_filter import CountingBloomFilter
+
+K1 = TypeVar('K1')
+K2 = TypeVar('K2')
+V = TypeVar('V')
+
+
+class CompositeKeyTable(Generic[K1, K2, V]):
+    """
+    Composite Key Table.
+
+    Same API as a DoubleKeyTable, but every (key1, key2) pair lives in one
+    flat LinearProbeTable keyed by the pair, instead of in a bottom-level
+    table per key1. A lookup is one builtin hash of the pair and one probe
+    sequence, and a key1 with one key2 costs one slot rather than a whole table.
+
+    A second LinearProbeTable maps each key1 to the list of its key2s, so
+    that keys(k) and values(k) stay proportional to the pairs of k.
+
+    Differences from a DoubleKeyTable:
+        - sizes are the sizes of the pairs table, and internal_sizes those
+          of the index; neither is a per-key1 table size.
+        - keys are placed by their builtin hash, so there are no hash1 and
+          hash2 hooks to override, and no class-level TABLE_SIZES.
+        - there is no _linear_probe returning (top, bottom) positions.
+        - len() counts key1s as a DoubleKeyTable's does, but table_size is
+          the size of the pairs table.
+        - stats_snapshot() puts the pairs table under "top" and the index
+          under "internal", and enable_bloom()'s capacity defaults to what
+          the pairs table holds at its current size.
+        - there is no pool or trace.
+
+    Type Arguments:
+        - K1:   1st Key Type. Anything hashable.
+        - K2:   2nd Key Type. Anything hashable.
+        - V:    Value Type.
+
+    Unless stated otherwise, all methods have O(1) complexity.
+    """
+
+    def __init__(self, sizes: list | None = None, internal_sizes: list | None = None, *,
+                 expected_size: int = 0) -> None:
+        """
+        Initialise the table, with sizes for the pairs table, internal_sizes
+        for the key1 index, and room for expected_size pairs before it rehashes.
+        """
+        self.pairs: LinearProbeTable[tuple[K1, K2], V] = LinearProbeTable(sizes, store_hashes=True,
+                                                                           expected_size=expected_size)
+        self.index: LinearProbeTable[K1, list[K2]] = LinearProbeTable(internal_sizes, store_hashes=True)
+
+    def iter_keys(self, key: K1 | None = None) -> Iterator[K1 | K2]:
+        """
+        key = None:
+            Returns an iterator of all top-level keys in hash table
+        key = k:
+            Returns an iterator of all keys paired with k.
+
+        :complexity: O(N) where N is the size of the index (or the number of pairs of k).
+        :raises KeyError: when k is not in the table.
+        """
+        if key is not None:
+            return iter(self.index[key])
+        return self.index.iter_keys()
+
+    def iter_values(self, key: K1 | None = None) -> Iterator[V]:
+        """
+        key = None:
+            Returns an iterator of all values in hash table
+        key = k:
+            Returns an iterator of all values paired with k.
+
+        :complexity: O(N) where N is the size of the pairs table,
+                    or the number of pairs of k times the cost of a lookup.
+        :raises KeyError: when k is not in the table.
+        """
+        if key is not None:
+            return (self.pairs[key, key2] for key2 in self.index[key])
+        return self.pairs.iter_values()
+
+    def keys(self, key: K1 | None = None) -> list[K1 | K2]:
+        """
+        key = None: returns all top-level keys in the table.
+        key = x: returns all keys paired with x.
+
+        :raises KeyError: when x is not in the table.
+        """
+        return list(self.iter_keys(key))
+
+    def values(self, key: K1 | None = None) -> list[V]:
+        """
+        key = None: returns all values in the table.
+        key = x: returns all values paired with x.
+
+        :raises KeyError: when x is not in the table.
+        """
+        return list(self.iter_values(key))
+
+    def __contains__(self, key: tuple[K1, K2]) -> bool:
+        """
+        Checks to see if the given key is in the Hash Table
+
+        :complexity: See linear probe.
+        """
+        return (key[0], key[1]) in self.pairs
+
+    def __getitem__(self, key: tuple[K1, K2]) -> V:
+        """
+        Get the value at a certain key
+
+        :complexity: See linear probe.
+        :raises KeyError: when the key doesn't exist.
+        """
+        return self.pairs[key[0], key[1]]
+
+    def __setitem__(self, key: tuple[K1, K2], data: V) -> None:
+        """
+        Set an (key, value) pair in our hash table.
+
+        :complexity: See linear probe, twice for a new pair.
+        :raises FullError: when the pairs table cannot be resized further.
+        """
+        key = (key[0], key[1])
+        pairs = len(self.pairs)
+        self.pairs[key] = data
+        if len(self.pairs) > pairs:
+            try:
+                self.index[key[0]].append(key[1])
+            except KeyError:
+                self.index[key[0]] = [key[1]]
+
+    def __delitem__(self, key: tuple[K1, K2]) -> None:
+        """
+        Deletes a (key, value) pair in our hash table.
+        Deleting the last pair of a key1 deletes it from the index too.
+
+        :complexity: See the pairs table's delete, plus O(P) where P is the number of pairs of key1.
+        :raises KeyError: when the key doesn't exist.
+        """
+        key1, key2 = key
+        del self.pairs[key1, key2]
+        key2s = self.index[key1]
+        key2s.remove(key2)
+        if not key2s:
+            del self.index[key1]
+
+    def enable_stats(self) -> None:
+        """
+        Start collecting stats for the pairs table and the index.
+        """
+        self.pairs.enable_stats()
+        self.index.enable_stats()
+
+    def disable_stats(self) -> None:
+        """
+        Stop collecting stats and drop the ones collected so far.
+        """
+        self.pairs.disable_stats()
+        self.index.disable_stats()
+
+    @property
+    def stats(self) -> TableStats | None:
+        """
+        The pairs table's stats, which every pair lookup goes through.
+        """
+        return self.pairs.stats
+
+    def stats_snapshot(self) -> dict:
+        """
+        The collected stats as a plain dict, with the pairs table under "top"
+        and the index under "internal".
+
+        :complexity: O(N) where N is the size of the pairs table.
+        :raises ValueError: when stats are not enabled.
+        """
+        return {"top": self.pairs.stats_snapshot(), "internal": self.index.stats_snapshot()}
+
+    def enable_bloom(self, error_rate: float = 0.01, capacity: int | None = None) -> None:
+        """
+        Keep a counting Bloom filter of the pairs, so that `__contains__`
+        turns most absent pairs away without a probe. The filter starts with
+        room for capacity pairs, and is rebuilt with double the room whenever it fills up.
+
+        :complexity: O(N) where N is the size of the pairs table.
+        """
+        self.pairs.enable_bloom(error_rate, capacity)
+
+    def disable_bloom(self) -> None:
+        """
+        Stop keeping a Bloom filter of the pairs.
+        """
+        self.pairs.disable_bloom()
+
+    @property
+    def bloom(self) -> CountingBloomFilter[tuple[K1, K2]] | None:
+        """
+        The pairs table's Bloom filter, or None.
+        """
+        return self.pairs.bloom
+
+    @property
+    def table_size(self) -> int:
+        """
+        Return the current size of the pairs table (different from the length)
+        """
+        return self.pairs.table_size
+
+    def __len__(self) -> int:
+        """
+        Returns number of top-level keys in the hash table, like a DoubleKeyTable.
+        """
+        return len(self.index)
+
+    def __str__(self) -> str:
+        """
+        String representation.
+        :complexity: O(N * (str(key1) + str(key2) + str(value))) where N is the size of the pairs table
+        """
+        result = ""
+        for (key1, key2), value in self.pairs.iter_items():
+            result += "(" + str(key1) + "," + str(key2) + "," + str(value) + ")\n"
+        return result
@@ -0,0 +1,120 @@
+""" Pool of ArrayRs for tables that resize often.
+
+A table that grows and shrinks over and over allocates a fresh ArrayR of
+one of a handful of TABLE_SIZES each time, and drops the one it had. Given
+an ArrayPool, it releases the dropped array to the pool instead, and the
+next table to need an array of that size gets it back already cleared.
+"""
+from __future__ import annotations
+
+import threading
+from typing import TypeVar, Generic
+from data_structures.referential_array import ArrayR
+
+T = TypeVar('T')
+
+
+class ArrayPool(Generic[T]):
+    """
+    Free lists of cleared ArrayRs, one per length.
+
+    Lengths are the table sizes, so there are only a few size classes, and
+    each keeps at most max_per_size arrays; releasing more discards them.
+
+    A released array must not be used by anything else afterwards,
+    so drop any iterators over a table's slots before it resizes.
+    The pool holds a lock of its own, so tables behind different locks,
+    like the shards of a ConcurrentTable, can share one.
+
+    Attributes:
+        free (dict[int, list[ArrayR]]): length -> cleared arrays of that length
+        allocations (int): arrays acquire had to allocate
+        reuses (int): arrays acquire took from the pool
+        releases (int): arrays release kept for reuse
+        discards (int): arrays release dropped because their size class was full
+        lock (threading.Lock): held while the free lists or counters change
+
+    Unless stated otherwise, all methods have O(1) complexity.
+    """
+
+    def __init__(self, max_per_size: int = 4) -> None:
+        """
+        Object initializer.
+
+        :raises ValueError: when max_per_size < 1.
+        """
+        if max_per_size < 1:
+            raise ValueError("max_per_size must be at least 1.")
+        self.max_per_size = max_per_size
+        self.lock = threading.Lock()
+        self.free: dict[int, list[ArrayR[T]]] = {}
+        self.allocations = 0
+        self.reuses = 0
+        self.releases = 0
+        self.discards = 0
+
+    def acquire(self, length: int) -> ArrayR[T]:
+        """
+        An array of the given length holding only None,
+        from the pool if it has one and newly allocated otherwise.
+
+        :complexity: O(1) from the pool, O(length) to allocate.
+        :raises ValueError: when length <= 0.
+        """
+        with self.lock:
+            arrays = self.free.get(length)
+            if arrays:
+                self.reuses += 1
+                return arrays.pop()
+            self.allocations += 1
+        return ArrayR(length)
+
+    def release(self, array: ArrayR[T]) -> None:
+        """
+        Give an array back to the pool, clearing it in bulk,
+        or discard it if its size class is full.
+
+        :complexity: O(len(array))
+        """
+        with self.lock:
+            arrays = self.free.setdefault(len(array), [])
+            if len(arrays) >= self.max_per_size:
+                self.discards += 1
+                return
+            array.fill(None)
+            arrays.append(array)
+            self.releases += 1
+
+    def clear(self) -> None:
+        """
+        Drop every pooled array, keeping the counters.
+        """
+        with self.lock:
+            self.free.clear()
+
+    def __len__(self) -> int:
+        """
+        Returns the number of pooled arrays.
+
+        :complexity: O(S) where S is the number of size classes.
+        """
+        with self.lock:
+            return sum(len(arrays) for arrays in self.free.values())
+
+    def stats(self) -> dict:
+        """
+        The counters, plus the number of pooled arrays and the reuse rate, as a plain dict.
+
+        :complexity: O(S) where S is the number of size classes.
+        """
+        pooled = len(self)
+        with self.lock:
+            acquired = self.allocations + self.reuses
+            return {
+                "allocations": self.allocations,
+                "reuses": self.reuses,
+                "releases": self.releases,
+                "discards": self.discards,
+                "pooled": pooled,
+                "reuse_rate": self.reuses / acquired if acquired else 0.0,
+            }
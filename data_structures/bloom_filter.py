@@ -0,0 +1,138 @@
+""" Counting Bloom filter kept in front of a hash table.
+
+A table with a filter enabled adds every new key to it and removes every
+deleted one, so a key the filter has never seen is definitely not in the
+table and `__contains__` can answer without hashing it for the table or
+probing. Keys the filter might contain are looked up as usual.
+"""
+from __future__ import annotations
+
+from math import ceil, log
+from typing import Generic, Iterable, TypeVar
+
+K = TypeVar('K')
+
+
+class CountingBloomFilter(Generic[K]):
+    """
+    Counting Bloom filter over the builtin hash of its keys.
+
+    Each key increments hash_count of the counters; removing it decrements
+    them again, so deletes are supported. A counter that reaches 255 stays
+    there, which can only add false positives.
+
+    Attributes:
+        capacity (int): number of keys the filter was sized for
+        error_rate (float): false positive rate the filter was sized for at capacity
+        count (int): number of keys added and not removed
+        rejections (int): lookups answered "definitely absent"
+        false_positives (int): lookups the filter let through for absent keys
+    """
+
+    FULL_HASH_MASK = (1 << 64) - 1
+
+    # 2**64 divided by the golden ratio, to spread small integer hashes.
+    MIX_MULTIPLIER = 0x9E3779B97F4A7C15
+
+    MAX_COUNTER = 255
+
+    def __init__(self, capacity: int, error_rate: float = 0.01) -> None:
+        """
+        Size the filter to hold capacity keys at the given false positive rate.
+
+        :complexity: O(M) where M is the number of counters.
+        :raises ValueError: unless capacity >= 0 and 0 < error_rate < 1.
+        """
+        if capacity < 0 or not 0 < error_rate < 1:
+            raise ValueError("Need capacity >= 0 and 0 < error_rate < 1.")
+        self.capacity = max(capacity, 1)
+        self.error_rate = error_rate
+        size = ceil(-self.capacity * log(error_rate) / log(2) ** 2)
+        self.counters = bytearray(size)
+        self.hash_count = max(1, round(size / self.capacity * log(2)))
+        self.count = 0
+        self.rejections = 0
+        self.false_positives = 0
+
+    @classmethod
+    def from_keys(cls, keys: Iterable[K], capacity: int, error_rate: float = 0.01) -> CountingBloomFilter[K]:
+        """
+        A filter of the given capacity holding every key in keys.
+
+        :complexity: O(M + N*k) where M is the number of counters,
+                    N is len(keys) and k is hash_count.
+        """
+        bloom = cls(capacity, error_rate)
+        for key in keys:
+            bloom.add(key)
+        return bloom
+
+    def _positions(self, key: K) -> list[int]:
+        """
+        The hash_count counters for key, by double hashing one 64-bit hash.
+
+        :complexity: O(k) where k is hash_count, after hashing the key.
+        """
+        mixed = (hash(key) * self.MIX_MULTIPLIER) & self.FULL_HASH_MASK
+        first, step = mixed >> 32, (mixed & 0xFFFFFFFF) | 1
+        size = len(self.counters)
+        return [(first + i * step) % size for i in range(self.hash_count)]
+
+    def add(self, key: K) -> None:
+        """
+        Add a key that is not already in the filter's table.
+
+        :complexity: O(k) where k is hash_count.
+        """
+        counters = self.counters
+        for position in self._positions(key):
+            if counters[position] < self.MAX_COUNTER:
+                counters[position] += 1
+        self.count += 1
+
+    def remove(self, key: K) -> None:
+        """
+        Remove a key that was added before.
+
+        :complexity: O(k) where k is hash_count.
+        """
+        counters = self.counters
+        for position in self._positions(key):
+            if 0 < counters[position] < self.MAX_COUNTER:
+                counters[position] -= 1
+        self.count -= 1
+
+    def __contains__(self, key: K) -> bool:
+        """
+        False if the key is definitely absent, True if it might be present.
+        Counts the rejections.
+
+        :complexity: O(k) where k is hash_count.
+        """
+        counters = self.counters
+        for position in self._positions(key):
+            if not counters[position]:
+                self.rejections += 1
+                return False
+        return True
+
+    def record_false_positive(self) -> None:
+        """ Count a key the filter let through that was not in the table. """
+        self.false_positives += 1
+
+    def false_positive_rate(self) -> float:
+        """
+        Estimated chance that an absent key gets through, from the fraction
+        of counters in use.
+
+        :complexity: O(M) where M is the number of counters.
+        """
+        used = len(self.counters) - self.counters.count(0)
+        return (used / len(self.counters)) ** self.hash_count
+
+    def observed_false_positive_rate(self) -> float:
+        """
+        Fraction of the lookups for absent keys that the filter let through.
+        """
+        absent = self.rejections + self.false_positives
+        return self.false_positives / absent if absent else 0.0
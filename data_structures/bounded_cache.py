@@ -0,0 +1,327 @@
+""" Bounded caches indexed by a LinearProbeTable.
+
+LRUCache evicts the least recently used entry, keeping entries on an
+intrusive doubly linked recency list. ClockCache approximates that with one
+reference bit per entry and a clock hand, so a hit only sets a bit.
+
+Both index their entries with a LinearProbeTable sized for the capacity up
+front, which never shrinks, so neither evictions nor deletes ever make it
+rehash.
+"""
+from __future__ import annotations
+
+import functools
+from time import monotonic
+from typing import Callable, Generic, TypeVar
+from data_structures.hash_table import LinearProbeTable
+
+K = TypeVar('K')
+V = TypeVar('V')
+
+# Marks a missing value, since None can be cached.
+_MISSING = object()
+
+
+class CacheNode(Generic[K, V]):
+    """ An entry of a cache.
+
+        Attributes:
+            key (K): the entry's key
+            value (V): the entry's value
+            expires (float | None): clock time after which the entry is stale, if any
+            prev (CacheNode): the next more recently used node (LRUCache)
+            next (CacheNode): the next less recently used node (LRUCache)
+            slot (int): the node's position on the clock (ClockCache)
+            referenced (bool): whether the node was used since the hand last passed (ClockCache)
+    """
+
+    def __init__(self, key: K = None, value: V = None, expires: float | None = None) -> None:
+        """ Object initializer. """
+        self.key = key
+        self.value = value
+        self.expires = expires
+        self.prev = self
+        self.next = self
+        self.slot = -1
+        self.referenced = True
+
+
+class LRUCache(Generic[K, V]):
+    """
+    Least Recently Used Cache.
+
+    Holds at most capacity entries. Putting a new key into a full cache
+    evicts the least recently used entry first; both get and put count as use.
+
+    With a ttl, entries go stale ttl seconds (of clock) after they were put,
+    and a stale entry is dropped when it is next looked up.
+
+    Type Arguments:
+        - K:    Key Type. Anything hashable, as the index stores builtin hashes.
+        - V:    Value Type.
+
+    Attributes:
+        hits (int): lookups that found a fresh entry
+        misses (int): lookups that did not
+        evictions (int): entries dropped to make room
+        expirations (int): stale entries dropped on lookup
+
+    Unless stated otherwise, all methods have O(1) complexity.
+    """
+
+    def __init__(self, capacity: int, ttl: float | None = None, clock: Callable[[], float] = monotonic) -> None:
+        """
+        Object initializer.
+
+        :complexity: O(capacity) to allocate the index.
+        :raises ValueError: when capacity < 1 or ttl <= 0.
+        """
+        if capacity < 1:
+            raise ValueError("Capacity must be at least 1.")
+        if ttl is not None and ttl <= 0:
+            raise ValueError("ttl must be positive.")
+        self.capacity = capacity
+        self.ttl = ttl
+        self.clock = clock
+        # Sized for the capacity, which it never shrinks below nor grows past.
+        self.index: LinearProbeTable[K, CacheNode[K, V]] = LinearProbeTable(store_hashes=True, expected_size=capacity)
+        # Sentinel of the recency list: head.next is the most recently used.
+        self.head: CacheNode[K, V] = CacheNode()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        """
+        Returns the number of entries, including stale ones not yet dropped.
+        """
+        return len(self.index)
+
+    def _lookup(self, key: K) -> CacheNode[K, V] | None:
+        """
+        The fresh node for key, marked as used, or None.
+        Counts the hit or miss, and drops the node if it is stale.
+
+        :complexity: See linear probe.
+        """
+        try:
+            node = self.index[key]
+        except KeyError:
+            self.misses += 1
+            return None
+        if node.expires is not None and self.clock() >= node.expires:
+            self._remove(node)
+            self.expirations += 1
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._touch(node)
+        return node
+
+    def get(self, key: K, default: V | None = None) -> V | None:
+        """
+        Get the value at a certain key, or default if it isn't cached.
+
+        :complexity: See linear probe.
+        """
+        node = self._lookup(key)
+        return default if node is None else node.value
+
+    def __getitem__(self, key: K) -> V:
+        """
+        Get the value at a certain key
+
+        :complexity: See linear probe.
+        :raises KeyError: when the key isn't cached.
+        """
+        node = self._lookup(key)
+        if node is None:
+            raise KeyError(key)
+        return node.value
+
+    def __contains__(self, key: K) -> bool:
+        """
+        Checks whether a fresh entry for key is cached,
+        without counting it as a use, a hit or a miss.
+
+        :complexity: See linear probe.
+        """
+        try:
+            node = self.index[key]
+        except KeyError:
+            return False
+        return node.expires is None or self.clock() < node.expires
+
+    def put(self, key: K, value: V) -> None:
+        """
+        Cache value at key, evicting an entry first if the cache is full.
+
+        :complexity: See linear probe.
+        """
+        expires = None if self.ttl is None else self.clock() + self.ttl
+        try:
+            node = self.index[key]
+        except KeyError:
+            if len(self.index) == self.capacity:
+                self._remove(self._victim())
+                self.evictions += 1
+            node = CacheNode(key, value, expires)
+            self._link(node)
+            self.index[key] = node
+        else:
+            node.value = value
+            node.expires = expires
+            self._touch(node)
+
+    def __setitem__(self, key: K, value: V) -> None:
+        """
+        Same as put.
+        """
+        self.put(key, value)
+
+    def __delitem__(self, key: K) -> None:
+        """
+        Drop the entry for key.
+
+        :complexity: See linear probe.
+        :raises KeyError: when the key isn't cached.
+        """
+        self._remove(self.index[key])
+
+    def _remove(self, node: CacheNode[K, V]) -> None:
+        """
+        Drop a node from the eviction order and the index.
+
+        :complexity: See linear probe.
+        """
+        self._unlink(node)
+        del self.index[node.key]
+
+    def stats(self) -> dict:
+        """
+        The counters, plus the hit rate, as a plain dict.
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def _link(self, node: CacheNode[K, V]) -> None:
+        """
+        Add a new node as the most recently used.
+        """
+        node.prev = self.head
+        node.next = self.head.next
+        self.head.next.prev = node
+        self.head.next = node
+
+    def _unlink(self, node: CacheNode[K, V]) -> None:
+        """
+        Take a node out of the recency list.
+        """
+        node.prev.next = node.next
+        node.next.prev = node.prev
+
+    def _touch(self, node: CacheNode[K, V]) -> None:
+        """
+        Mark a node as the most recently used.
+        """
+        self._unlink(node)
+        self._link(node)
+
+    def _victim(self) -> CacheNode[K, V]:
+        """
+        The node to evict: the least recently used.
+
+        :pre: the cache is not empty.
+        """
+        return self.head.prev
+
+
+class ClockCache(LRUCache[K, V]):
+    """
+    CLOCK Cache.
+
+    Same API as an LRUCache, but entries sit in a ring of capacity slots,
+    each with a reference bit set whenever it is used. To evict, the clock
+    hand sweeps the ring, clearing set bits, and evicts the first entry
+    whose bit is already clear. A hit only sets a bit instead of relinking
+    the entry.
+
+    Unless stated otherwise, all methods have O(1) complexity.
+    Evicting is O(1) amortised, as each sweep step clears a bit that took a use to set.
+    """
+
+    def __init__(self, capacity: int, ttl: float | None = None, clock: Callable[[], float] = monotonic) -> None:
+        """
+        Object initializer.
+
+        :complexity: O(capacity) to allocate the index and the ring.
+        :raises ValueError: when capacity < 1 or ttl <= 0.
+        """
+        LRUCache.__init__(self, capacity, ttl, clock)
+        self.slots: list[CacheNode[K, V] | None] = [None] * capacity
+        self.free_slots = list(range(capacity - 1, -1, -1))
+        self.hand = 0
+
+    def _link(self, node: CacheNode[K, V]) -> None:
+        """
+        Put a new node in a free slot, with its reference bit set.
+        """
+        node.slot = self.free_slots.pop()
+        node.referenced = True
+        self.slots[node.slot] = node
+
+    def _unlink(self, node: CacheNode[K, V]) -> None:
+        """
+        Free a node's slot.
+        """
+        self.slots[node.slot] = None
+        self.free_slots.append(node.slot)
+
+    def _touch(self, node: CacheNode[K, V]) -> None:
+        """
+        Set a node's reference bit.
+        """
+        node.referenced = True
+
+    def _victim(self) -> CacheNode[K, V]:
+        """
+        Sweep the hand to the first node whose reference bit is clear,
+        clearing the bits it passes.
+
+        :pre: the cache is full.
+        :complexity: O(capacity) worst case, O(1) amortised.
+        """
+        while True:
+            node = self.slots[self.hand]
+            self.hand = (self.hand + 1) % self.capacity
+            if node.referenced:
+                node.referenced = False
+            else:
+                return node
+
+
+def memoize(cache: LRUCache) -> Callable[[Callable[..., V]], Callable[..., V]]:
+    """
+    Decorator caching a function's results in cache, keyed by the tuple
+    of its positional arguments, which must be hashable.
+
+    :complexity: O(1) plus probing on a hit; the call's cost on a miss.
+    """
+    def decorator(func: Callable[..., V]) -> Callable[..., V]:
+        @functools.wraps(func)
+        def wrapper(*args):
+            result = cache.get(args, _MISSING)
+            if result is _MISSING:
+                result = func(*args)
+                cache.put(args, result)
+            return result
+        wrapper.cache = cache
+        return wrapper
+    return decorator
@@ -0,0 +1,360 @@
+""" Columnar Hash Table
+
+Defines a Hash Table using Linear Probing for conflict resolution,
+storing keys, values and hashes in parallel arrays rather than one
+tuple per slot.
+"""
+from __future__ import annotations
+
+from array import array
+from typing import TypeVar, Generic, Iterable
+from data_structures.hash_table import LinearProbeTable, FullError
+from data_structures.typed_array import TypedArray
+
+K = TypeVar('K')
+V = TypeVar('V')
+
+
+class ColumnarProbeTable(Generic[K, V]):
+    """
+    Columnar Linear Probe Table.
+
+    Same mapping API and growth as a LinearProbeTable with stored hashes,
+    but slot x is spread over key_array[x], value_array[x] and hash_array[x],
+    with used[x] set to a non-zero tag when the slot is taken. Updating a
+    value writes one column instead of allocating a new tuple, hashes are
+    unboxed 64-bit integers, and probes only read keys on a hash match.
+
+    The key and value columns are plain lists rather than ArrayRs: a ctypes
+    py_object array keeps an extra dict entry for every reference stored
+    in it, which would cost more than the tuples being saved.
+
+    With value_type set to one of the TypedArray element types ("int64",
+    "float64" or "uint8"), the value column is a TypedArray instead, holding
+    raw numbers rather than references to boxed ones.
+
+    Type Arguments:
+        - K:    Key Type. Anything hashable.
+        - V:    Value Type.
+
+    Unless stated otherwise, all methods have O(1) complexity.
+    """
+
+    TABLE_SIZES = LinearProbeTable.TABLE_SIZES
+
+    FULL_HASH_MASK = LinearProbeTable.FULL_HASH_MASK
+
+    FIBONACCI_MULTIPLIER = LinearProbeTable.FIBONACCI_MULTIPLIER
+
+    def __init__(self, sizes=None, value_type: str | None = None) -> None:
+        """
+        Initialise the Hash Table.
+        """
+        if sizes is not None:
+            self.TABLE_SIZES = sizes
+        self.value_type = value_type
+        self.size_index = 0
+        self._allocate(self.TABLE_SIZES[self.size_index])
+        self.count = 0
+
+    def _allocate(self, size: int) -> None:
+        """
+        Replace the columns with empty ones of the given size.
+
+        :complexity: O(size)
+        """
+        self.key_array: list[K | None] = [None] * size
+        if self.value_type is None:
+            self.value_array: list[V | None] | TypedArray = [None] * size
+        else:
+            self.value_array = TypedArray(size, self.value_type)
+        self.hash_array = array('Q', bytes(8 * size))
+        self.used = bytearray(size)
+
+    def full_hash(self, key: K) -> int:
+        """
+        Hash a key to 64 bits, independently of the table size.
+        Mixed like LinearProbeTable.full_hash, so that consecutive ints
+        don't fill one long run of slots.
+
+        :complexity: O(len(key)) the first time a string is hashed, O(1) after.
+        """
+        return (hash(key) * self.FIBONACCI_MULTIPLIER) & self.FULL_HASH_MASK
+
+    def _tag(self, full_hash: int) -> int:
+        """
+        The non-zero byte marking a slot taken by an entry with this hash.
+        """
+        return 1
+
+    @property
+    def table_size(self) -> int:
+        return len(self.used)
+
+    def __len__(self) -> int:
+        """
+        Returns number of elements in the hash table
+        """
+        return self.count
+
+    def _linear_probe(self, key: K, is_insert: bool) -> int:
+        """
+        Find the correct position for this key in the hash table using linear probing.
+
+        :complexity best: O(hash(key)) first position is empty
+        :complexity worst: O(hash(key) + N) when we've searched the entire table
+                        where N is the tablesize
+        :raises KeyError: When the key is not in the table, but is_insert is False.
+        :raises FullError: When a table is full and cannot be inserted.
+        """
+        return self._hashed_probe(key, self.full_hash(key), is_insert)
+
+    def _hashed_probe(self, key: K, full_hash: int, is_insert: bool) -> int:
+        """
+        Linear probe using the hash column, only reading a key on a hash match.
+
+        :complexity best: O(1) first position is empty
+        :complexity worst: O(N + comp(K)) when we've searched the entire table
+                        where N is the tablesize
+        :raises KeyError: When the key is not in the table, but is_insert is False.
+        :raises FullError: When a table is full and cannot be inserted.
+        """
+        used = self.used
+        hash_array = self.hash_array
+        size = len(used)
+        position = full_hash % size
+
+        for _ in range(size):
+            if not used[position]:
+                if is_insert:
+                    return position
+                else:
+                    raise KeyError(key)
+            elif hash_array[position] == full_hash and self.key_array[position] == key:
+                return position
+            else:
+                position = (position + 1) % size
+
+        if is_insert:
+            raise FullError("Table is full!")
+        else:
+            raise KeyError(key)
+
+    def keys(self) -> list[K]:
+        """
+        Returns all keys in the hash table.
+
+        :complexity: O(N) where N is self.table_size.
+        """
+        used = self.used
+        return [self.key_array[x] for x in range(len(used)) if used[x]]
+
+    def values(self) -> list[V]:
+        """
+        Returns all values in the hash table.
+
+        :complexity: O(N) where N is self.table_size.
+        """
+        used = self.used
+        return [self.value_array[x] for x in range(len(used)) if used[x]]
+
+    def __contains__(self, key: K) -> bool:
+        """
+        Checks to see if the given key is in the Hash Table
+
+        :complexity: See linear probe.
+        """
+        try:
+            self._linear_probe(key, False)
+        except KeyError:
+            return False
+        else:
+            return True
+
+    def __getitem__(self, key: K) -> V:
+        """
+        Get the value at a certain key
+
+        :complexity: See linear probe.
+        :raises KeyError: when the key doesn't exist.
+        """
+        return self.value_array[self._linear_probe(key, False)]
+
+    def __setitem__(self, key: K, data: V) -> None:
+        """
+        Set an (key, value) pair in our hash table.
+
+        :complexity: See linear probe.
+        :raises FullError: when the table cannot be resized further.
+        """
+        self._insert(key, data)
+
+        if len(self) > self.table_size / 2:
+            self._rehash()
+
+    def _insert(self, key: K, data: V) -> None:
+        """
+        Set an (key, value) pair without checking the load threshold.
+        An existing key only has its value column written.
+
+        :complexity: See linear probe.
+        :raises FullError: when the table is full.
+        :raises TypeError: when a typed value column rejects data.
+        """
+        full_hash = self.full_hash(key)
+        position = self._hashed_probe(key, full_hash, True)
+        # Write the value first, so a value a typed column rejects leaves the slot as it was.
+        self.value_array[position] = data
+        if not self.used[position]:
+            self.used[position] = self._tag(full_hash)
+            self.hash_array[position] = full_hash
+            self.key_array[position] = key
+            self.count += 1
+
+    def __delitem__(self, key: K) -> None:
+        """
+        Deletes a (key, value) pair in our hash table,
+        moving each later entry of the cluster back into the gap at most once.
+
+        :complexity best: O(hash(key)) deleting item is not probed and in correct spot.
+        :complexity worst: O(hash(key) + C) deleting item is at the start of a cluster of length C.
+        :raises KeyError: when the key doesn't exist.
+        """
+        used = self.used
+        hash_array = self.hash_array
+        size = len(used)
+        position = self._linear_probe(key, False)
+        self.count -= 1
+        # Clear the slot first, so that even a full table has a gap to stop at.
+        self._clear(position)
+
+        following = (position + 1) % size
+        while used[following]:
+            home = hash_array[following] % size
+            if position <= following:
+                stays = position < home <= following
+            else:
+                stays = home > position or home <= following
+            if not stays:
+                self._move(following, position)
+                self._clear(following)
+                position = following
+            following = (following + 1) % size
+
+    def _move(self, source: int, target: int) -> None:
+        """
+        Copy slot source into slot target, across every column.
+        """
+        self.used[target] = self.used[source]
+        self.hash_array[target] = self.hash_array[source]
+        self.key_array[target] = self.key_array[source]
+        self.value_array[target] = self.value_array[source]
+
+    def _clear(self, position: int) -> None:
+        """
+        Empty slot position, across every column but the hashes,
+        which are only read for used slots.
+        """
+        self.used[position] = 0
+        self.key_array[position] = None
+        self.value_array[position] = None if self.value_type is None else 0
+
+    def update(self, pairs: Iterable[tuple[K, V]]) -> None:
+        """
+        Set every (key, value) pair in pairs, resizing at most once.
+
+        :complexity: O(N*hash(K) + R) where N is len(pairs) and R is the cost
+                    of the single resize, plus probing.
+        :raises FullError: when the table cannot be resized further.
+        """
+        pairs = list(pairs)
+        size_index = self.size_index
+        while size_index < len(self.TABLE_SIZES) - 1 and len(self) + len(pairs) > self.TABLE_SIZES[size_index] / 2:
+            size_index += 1
+        if size_index > self.size_index:
+            self._resize(size_index)
+
+        insert = self._insert
+        for key, data in pairs:
+            insert(key, data)
+            if len(self) > self.table_size / 2:
+                # Only possible once we have run out of TABLE_SIZES.
+                self._rehash()
+
+    def get_many(self, keys: Iterable[K]) -> list[V]:
+        """
+        Get the values for every key in keys, in order.
+
+        :complexity: See linear probe, once per key.
+        :raises KeyError: when any of the keys doesn't exist.
+        """
+        probe = self._linear_probe
+        value_array = self.value_array
+        return [value_array[probe(key, False)] for key in keys]
+
+    def contains_many(self, keys: Iterable[K]) -> list[bool]:
+        """
+        Checks which of the given keys are in the Hash Table, in order.
+
+        :complexity: See linear probe, once per key.
+        """
+        return [key in self for key in keys]
+
+    def is_empty(self) -> bool:
+        return self.count == 0
+
+    def is_full(self) -> bool:
+        return self.count == self.table_size
+
+    def _rehash(self) -> None:
+        """
+        Need to resize table and reinsert all values
+
+        :complexity best: O(N) No probing.
+        :complexity worst: O(N^2) Lots of probing.
+        Where N is len(self)
+        """
+        self.size_index += 1
+        if self.size_index >= len(self.TABLE_SIZES):
+            # Cannot be resized further.
+            return
+        self._resize(self.size_index)
+
+    def _resize(self, size_index: int) -> None:
+        """
+        Move every entry into new columns of size TABLE_SIZES[size_index],
+        placing each by its stored hash.
+
+        :complexity best: O(N) No probing.
+        :complexity worst: O(N^2) Lots of probing.
+        Where N is len(self)
+        """
+        old_keys, old_values, old_hashes, old_used = self.key_array, self.value_array, self.hash_array, self.used
+        self.size_index = size_index
+        size = self.TABLE_SIZES[size_index]
+        self._allocate(size)
+        used = self.used
+        hash_array = self.hash_array
+
+        for x in range(len(old_used)):
+            if old_used[x]:
+                full_hash = old_hashes[x]
+                position = full_hash % size
+                while used[position]:
+                    position = (position + 1) % size
+                used[position] = old_used[x]
+                hash_array[position] = full_hash
+                self.key_array[position] = old_keys[x]
+                self.value_array[position] = old_values[x]
+
+    def __str__(self) -> str:
+        """
+        Returns all they key/value pairs in our hash table (no particular
+        order).
+        :complexity: O(N * (str(key) + str(value))) where N is the table size
+        """
+        result = ""
+        for x in range(self.table_size):
+            if self.used[x]:
+                result += "(" + str(self.key_array[x]) + "," + str(self.value_array[x]) + ")\n"
+        return result
@@ -0,0 +1,230 @@
+""" Concurrent Hash Table
+
+Defines a thread-safe Hash Table split into LinearProbeTable shards,
+each guarded by its own lock.
+"""
+from __future__ import annotations
+
+import threading
+from typing import TypeVar, Generic, Iterable, Iterator
+from data_structures.hash_table import LinearProbeTable
+
+K = TypeVar('K')
+V = TypeVar('V')
+
+
+class ConcurrentTable(Generic[K, V]):
+    """
+    Striped-Lock Concurrent Table.
+
+    Each key belongs to one of shard_count LinearProbeTables, picked by the
+    high bits of its hash, and every operation on a shard holds that shard's
+    lock. Threads working on different shards never wait for each other, and
+    a shard that grows only rehashes itself, blocking only its own keys.
+
+    Single-key operations are atomic. Operations over many keys (len, keys,
+    values, items, update) visit the shards one at a time, so they are
+    consistent within each shard but not across shards.
+
+    Type Arguments:
+        - K:    Key Type. Anything the shards can hash.
+        - V:    Value Type.
+
+    Unless stated otherwise, all methods have O(1) complexity.
+    """
+
+    FULL_HASH_MASK = LinearProbeTable.FULL_HASH_MASK
+
+    # Not the shards' Fibonacci multiplier: they place int keys by the top
+    # bits of that product, which would then be the same for a whole shard.
+    SHARD_MULTIPLIER = 0xBF58476D1CE4E5B9
+
+    def __init__(self, shard_count: int = 16, expected_size: int = 0, **options) -> None:
+        """
+        Initialise the table with shard_count shards, each a LinearProbeTable
+        created with options and sized for its share of expected_size.
+        A pool in options is shared by every shard.
+
+        :complexity: O(shard_count * S) where S is the starting shard size.
+        :raises ValueError: when shard_count is not a power of two.
+        """
+        if shard_count < 1 or shard_count & (shard_count - 1):
+            raise ValueError("shard_count must be a power of two.")
+        self.shard_bits = shard_count.bit_length() - 1
+        self.shards = [LinearProbeTable(expected_size=-(-expected_size // shard_count), **options)
+                       for _ in range(shard_count)]
+        self.locks = [threading.Lock() for _ in range(shard_count)]
+
+    def shard_index(self, key: K) -> int:
+        """
+        Index of the shard holding key, from the top bits of its mixed hash.
+
+        :complexity: O(1) once the key's hash is cached.
+        """
+        if self.shard_bits == 0:
+            return 0
+        return ((hash(key) * self.SHARD_MULTIPLIER) & self.FULL_HASH_MASK) >> (64 - self.shard_bits)
+
+    def __len__(self) -> int:
+        """
+        Returns number of elements in the hash table
+
+        :complexity: O(shard_count)
+        """
+        total = 0
+        for shard, lock in zip(self.shards, self.locks):
+            with lock:
+                total += len(shard)
+        return total
+
+    def __contains__(self, key: K) -> bool:
+        """
+        Checks to see if the given key is in the Hash Table
+
+        :complexity: See linear probe.
+        """
+        index = self.shard_index(key)
+        with self.locks[index]:
+            return key in self.shards[index]
+
+    def __getitem__(self, key: K) -> V:
+        """
+        Get the value at a certain key
+
+        :complexity: See linear probe.
+        :raises KeyError: when the key doesn't exist.
+        """
+        index = self.shard_index(key)
+        with self.locks[index]:
+            return self.shards[index][key]
+
+    def get(self, key: K, default: V | None = None) -> V | None:
+        """
+        Get the value at a certain key, or default if it doesn't exist.
+
+        :complexity: See linear probe.
+        """
+        index = self.shard_index(key)
+        with self.locks[index]:
+            try:
+                return self.shards[index][key]
+            except KeyError:
+                return default
+
+    def __setitem__(self, key: K, data: V) -> None:
+        """
+        Set an (key, value) pair in our hash table.
+
+        :complexity: See linear probe, plus a rehash of the one shard if it grows.
+        :raises FullError: when the shard cannot be resized further.
+        """
+        index = self.shard_index(key)
+        with self.locks[index]:
+            self.shards[index][key] = data
+
+    def setdefault(self, key: K, default: V) -> V:
+        """
+        Get the value at a certain key, setting it to default first if it
+        doesn't exist, as one atomic step.
+
+        :complexity: See linear probe.
+        :raises FullError: when the shard cannot be resized further.
+        """
+        index = self.shard_index(key)
+        with self.locks[index]:
+            shard = self.shards[index]
+            try:
+                return shard[key]
+            except KeyError:
+                shard[key] = default
+                return default
+
+    def __delitem__(self, key: K) -> None:
+        """
+        Deletes a (key, value) pair in our hash table.
+
+        :complexity: See the shard's delete.
+        :raises KeyError: when the key doesn't exist.
+        """
+        index = self.shard_index(key)
+        with self.locks[index]:
+            del self.shards[index][key]
+
+    def update(self, pairs: Iterable[tuple[K, V]]) -> None:
+        """
+        Set every (key, value) pair in pairs, taking each shard's lock once.
+
+        :complexity: O(N*hash(K) + R) where N is len(pairs) and R is the cost
+                    of the shards' resizes, plus probing.
+        :raises FullError: when a shard cannot be resized further.
+        """
+        groups = [[] for _ in self.shards]
+        for pair in pairs:
+            groups[self.shard_index(pair[0])].append(pair)
+        for shard, lock, group in zip(self.shards, self.locks, groups):
+            if group:
+                with lock:
+                    shard.update(group)
+
+    def get_many(self, keys: Iterable[K]) -> list[V]:
+        """
+        Get the values for every key in keys, in order.
+        Each key is read atomically, but not all of them together.
+
+        :complexity: See linear probe, once per key.
+        :raises KeyError: when any of the keys doesn't exist.
+        """
+        return [self[key] for key in keys]
+
+    def contains_many(self, keys: Iterable[K]) -> list[bool]:
+        """
+        Checks which of the given keys are in the Hash Table, in order.
+
+        :complexity: See linear probe, once per key.
+        """
+        return [key in self for key in keys]
+
+    def items(self) -> list[tuple[K, V]]:
+        """
+        Returns all (key, value) pairs in the hash table, one shard at a time.
+
+        :complexity: O(N) where N is the total size of the shards.
+        """
+        result = []
+        for shard, lock in zip(self.shards, self.locks):
+            with lock:
+                result.extend(shard.iter_items())
+        return result
+
+    def keys(self) -> list[K]:
+        """
+        Returns all keys in the hash table, one shard at a time.
+
+        :complexity: O(N) where N is the total size of the shards.
+        """
+        return [key for key, _ in self.items()]
+
+    def values(self) -> list[V]:
+        """
+        Returns all values in the hash table, one shard at a time.
+
+        :complexity: O(N) where N is the total size of the shards.
+        """
+        return [value for _, value in self.items()]
+
+    def __iter__(self) -> Iterator[K]:
+        """
+        Iterates over a list of the keys taken when iteration starts.
+        """
+        return iter(self.keys())
+
+    def __str__(self) -> str:
+        """
+        Returns all they key/value pairs in our hash table (no particular
+        order).
+        :complexity: O(N * (str(key) + str(value))) where N is the total size of the shards
+        """
+        result = ""
+        for key, value in self.items():
+            result += "(" + str(key) + "," + str(value) + ")\n"
+        return result
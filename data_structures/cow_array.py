@@ -0,0 +1,108 @@
+""" Copy-on-write array of references.
+
+Drop-in replacement for ArrayR whose slots live in fixed-size chunks, so
+that `freeze` can hand out a read-only view in O(1). The first write after
+a freeze copies the list of chunks, and the first write to each chunk
+copies that chunk; the view keeps seeing the slots as they were.
+"""
+from __future__ import annotations
+
+from typing import TypeVar, Generic, Iterator
+
+T = TypeVar('T')
+
+
+class CowArray(Generic[T]):
+    """
+    Array of references stored as chunks of CHUNK_SIZE slots.
+
+    Attributes:
+        chunks (list[list[T]]): the slots, CHUNK_SIZE to a chunk
+        owned (list[bool]): which chunks no view shares, and so can be written in place
+        shared (bool): whether the chunks list itself is shared with a view
+    """
+
+    CHUNK_BITS = 6
+    CHUNK_SIZE = 1 << CHUNK_BITS
+    CHUNK_MASK = CHUNK_SIZE - 1
+
+    def __init__(self, length: int) -> None:
+        """ Creates an array of references to objects of the given length
+        :complexity: O(length) for best/worst case to initialise to None
+        :pre: length > 0
+        """
+        if length <= 0:
+            raise ValueError("Array length should be larger than 0.")
+        self.length = length
+        self.chunks = [[None] * min(self.CHUNK_SIZE, length - start) for start in range(0, length, self.CHUNK_SIZE)]
+        self.owned = [True] * len(self.chunks)
+        self.shared = False
+
+    def __len__(self) -> int:
+        """ Returns the length of the array
+        :complexity: O(1)
+        """
+        return self.length
+
+    def __getitem__(self, index: int) -> T:
+        """ Returns the object in position index.
+        :complexity: O(1)
+        :pre: index in between 0 and length - the chunk lists check it
+        """
+        return self.chunks[index >> self.CHUNK_BITS][index & self.CHUNK_MASK]
+
+    def __setitem__(self, index: int, value: T) -> None:
+        """ Sets the object in position index to value, copying its chunk
+        first if a view shares it.
+        :complexity: O(1), or O(CHUNK_SIZE) to copy the chunk, plus
+                     O(length / CHUNK_SIZE) for the first write after a freeze.
+        :pre: index in between 0 and length - the chunk lists check it
+        """
+        if self.shared:
+            self.chunks = list(self.chunks)
+            self.owned = [False] * len(self.chunks)
+            self.shared = False
+        chunk = index >> self.CHUNK_BITS
+        if not self.owned[chunk]:
+            self.chunks[chunk] = list(self.chunks[chunk])
+            self.owned[chunk] = True
+        self.chunks[chunk][index & self.CHUNK_MASK] = value
+
+    def __iter__(self) -> Iterator[T]:
+        """ Iterates over the slots in order.
+        :complexity: O(length)
+        """
+        for chunk in self.chunks:
+            yield from chunk
+
+    def freeze(self) -> FrozenArray[T]:
+        """ A read-only view of the array as it is now, unaffected by later writes.
+        :complexity: O(1)
+        """
+        self.shared = True
+        return FrozenArray(self.length, self.chunks)
+
+
+class FrozenArray(CowArray[T]):
+    """
+    Read-only view of a CowArray, sharing its chunks.
+    """
+
+    def __init__(self, length: int, chunks: list[list[T]]) -> None:
+        """ Creates a view of the given chunks.
+        :complexity: O(1)
+        """
+        self.length = length
+        self.chunks = chunks
+
+    def __setitem__(self, index: int, value: T) -> None:
+        """
+        :raises TypeError: always, a view cannot be written to.
+        """
+        raise TypeError("A frozen array cannot be written to.")
+
+    def freeze(self) -> FrozenArray[T]:
+        """ The view itself, which never changes.
+        :complexity: O(1)
+        """
+        return self
@@ -0,0 +1,327 @@
+""" Cuckoo Hash Table
+
+Defines a Hash Table using bucketized cuckoo hashing for conflict
+resolution, so a lookup reads a bounded number of slots.
+"""
+from __future__ import annotations
+
+from random import Random
+from typing import TypeVar, Generic, Iterable, Iterator
+from data_structures.hash_table import LinearProbeTable, FullError
+
+K = TypeVar('K')
+V = TypeVar('V')
+
+
+class CuckooTable(Generic[K, V]):
+    """
+    Cuckoo Table.
+
+    The table has TABLE_SIZES[size_index] buckets of bucket_size slots each,
+    and every key may only live in one of hash_count buckets picked from its
+    hash. Lookups and deletes read at most hash_count * bucket_size slots.
+    An insert into full buckets evicts an entry to one of its other buckets,
+    and so on for up to MAX_KICKS evictions. If that fails the evictions are
+    undone and the table grows; at the last size it raises FullError instead.
+
+    Slots hold (key, value, full_hash) like a LinearProbeTable storing hashes.
+
+    Type Arguments:
+        - K:    Key Type. Anything hashable.
+        - V:    Value Type.
+
+    Unless stated otherwise, all methods have O(1) complexity.
+    """
+
+    TABLE_SIZES = LinearProbeTable.TABLE_SIZES
+
+    FULL_HASH_MASK = LinearProbeTable.FULL_HASH_MASK
+
+    # Odd multipliers giving each hash function its own permutation of the 64-bit hash.
+    HASH_MULTIPLIERS = [1, 0x9E3779B97F4A7C15, 0xC2B2AE3D27D4EB4F, 0x165667B19E3779F9]
+
+    MAX_KICKS = 500
+
+    MAX_LOAD = 0.9
+
+    def __init__(self, sizes=None, hash_count: int = 2, bucket_size: int = 4, seed: int | None = None) -> None:
+        """
+        Initialise the Hash Table.
+
+        :raises ValueError: when hash_count is not between 2 and len(HASH_MULTIPLIERS).
+        """
+        if not 2 <= hash_count <= len(self.HASH_MULTIPLIERS):
+            raise ValueError(f"hash_count should be between 2 and {len(self.HASH_MULTIPLIERS)}.")
+        if sizes is not None:
+            self.TABLE_SIZES = sizes
+        self.hash_count = hash_count
+        self.bucket_size = bucket_size
+        self.random = Random(seed)
+        self.size_index = 0
+        self.array: list[tuple[K, V, int] | None] = [None] * (self.TABLE_SIZES[0] * bucket_size)
+        self.count = 0
+
+    def full_hash(self, key: K) -> int:
+        """
+        Hash a key to 64 bits, independently of the table size.
+
+        :complexity: O(len(key)) the first time a string is hashed, O(1) after.
+        """
+        return hash(key) & self.FULL_HASH_MASK
+
+    def _buckets(self, full_hash: int) -> list[int]:
+        """
+        The buckets an entry with this hash may live in.
+
+        :complexity: O(hash_count)
+        """
+        bucket_count = len(self.array) // self.bucket_size
+        return [(full_hash * multiplier & self.FULL_HASH_MASK) % bucket_count
+                for multiplier in self.HASH_MULTIPLIERS[:self.hash_count]]
+
+    @property
+    def table_size(self) -> int:
+        """
+        The number of slots, over all buckets.
+        """
+        return len(self.array)
+
+    def __len__(self) -> int:
+        """
+        Returns number of elements in the hash table
+        """
+        return self.count
+
+    def _find(self, key: K, full_hash: int) -> int:
+        """
+        Find the slot holding this key.
+
+        :complexity: O(hash_count * bucket_size + comp(K))
+        :raises KeyError: When the key is not in the table.
+        """
+        array = self.array
+        for bucket in self._buckets(full_hash):
+            start = bucket * self.bucket_size
+            for slot in range(start, start + self.bucket_size):
+                item = array[slot]
+                if item is not None and item[2] == full_hash and item[0] == key:
+                    return slot
+        raise KeyError(key)
+
+    def _free_slot(self, full_hash: int) -> int | None:
+        """
+        An empty slot in one of the buckets for this hash, if there is one.
+
+        :complexity: O(hash_count * bucket_size)
+        """
+        for bucket in self._buckets(full_hash):
+            start = bucket * self.bucket_size
+            for slot in range(start, start + self.bucket_size):
+                if self.array[slot] is None:
+                    return slot
+        return None
+
+    def _place(self, item: tuple) -> bool:
+        """
+        Place an item whose key is not in the table, evicting entries along
+        the way if its buckets are full. When no place is found within
+        MAX_KICKS evictions, every eviction is undone.
+
+        :complexity: O(MAX_KICKS * hash_count * bucket_size)
+        :return: whether the item was placed.
+        """
+        path = []
+        for _ in range(self.MAX_KICKS):
+            slot = self._free_slot(item[2])
+            if slot is not None:
+                self.array[slot] = item
+                return True
+            bucket = self.random.choice(self._buckets(item[2]))
+            slot = bucket * self.bucket_size + self.random.randrange(self.bucket_size)
+            item, self.array[slot] = self.array[slot], item
+            path.append(slot)
+
+        for slot in reversed(path):
+            item, self.array[slot] = self.array[slot], item
+        return False
+
+    def iter_keys(self) -> Iterator[K]:
+        """
+        Returns an iterator of all keys in the hash table.
+
+        :complexity: O(N) in total where N is self.table_size.
+        """
+        for item in self.array:
+            if item is not None:
+                yield item[0]
+
+    def iter_values(self) -> Iterator[V]:
+        """
+        Returns an iterator of all values in the hash table.
+
+        :complexity: O(N) in total where N is self.table_size.
+        """
+        for item in self.array:
+            if item is not None:
+                yield item[1]
+
+    def iter_items(self) -> Iterator[tuple[K, V]]:
+        """
+        Returns an iterator of all (key, value) pairs in the hash table.
+
+        :complexity: O(N) in total where N is self.table_size.
+        """
+        for item in self.array:
+            if item is not None:
+                yield item[0], item[1]
+
+    def __iter__(self) -> Iterator[K]:
+        return self.iter_keys()
+
+    def keys(self) -> list[K]:
+        """
+        Returns all keys in the hash table.
+
+        :complexity: O(N) where N is self.table_size.
+        """
+        return list(self.iter_keys())
+
+    def values(self) -> list[V]:
+        """
+        Returns all values in the hash table.
+
+        :complexity: O(N) where N is self.table_size.
+        """
+        return list(self.iter_values())
+
+    def items(self) -> list[tuple[K, V]]:
+        """
+        Returns all (key, value) pairs in the hash table.
+
+        :complexity: O(N) where N is self.table_size.
+        """
+        return list(self.iter_items())
+
+    def __contains__(self, key: K) -> bool:
+        """
+        Checks to see if the given key is in the Hash Table
+
+        :complexity: O(hash_count * bucket_size + comp(K))
+        """
+        try:
+            self._find(key, self.full_hash(key))
+        except KeyError:
+            return False
+        else:
+            return True
+
+    def __getitem__(self, key: K) -> V:
+        """
+        Get the value at a certain key
+
+        :complexity: O(hash_count * bucket_size + comp(K))
+        :raises KeyError: when the key doesn't exist.
+        """
+        return self.array[self._find(key, self.full_hash(key))][1]
+
+    def __setitem__(self, key: K, data: V) -> None:
+        """
+        Set an (key, value) pair in our hash table.
+
+        :complexity best: O(hash_count * bucket_size) a bucket has room.
+        :complexity worst: O(N) the table has to grow.
+        :raises FullError: when the table cannot be resized further.
+        """
+        full_hash = self.full_hash(key)
+        try:
+            self.array[self._find(key, full_hash)] = (key, data, full_hash)
+            return
+        except KeyError:
+            pass
+
+        item = (key, data, full_hash)
+        while not self._place(item):
+            if not self._rehash():
+                raise FullError("Table is full!")
+        self.count += 1
+
+        if len(self) > self.table_size * self.MAX_LOAD:
+            self._rehash()
+
+    def __delitem__(self, key: K) -> None:
+        """
+        Deletes a (key, value) pair in our hash table.
+
+        :complexity: O(hash_count * bucket_size + comp(K))
+        :raises KeyError: when the key doesn't exist.
+        """
+        self.array[self._find(key, self.full_hash(key))] = None
+        self.count -= 1
+
+    def update(self, pairs: Iterable[tuple[K, V]]) -> None:
+        """
+        Set every (key, value) pair in pairs.
+
+        :complexity: See __setitem__, once per pair.
+        :raises FullError: when the table cannot be resized further.
+        """
+        for key, data in pairs:
+            self[key] = data
+
+    def get_many(self, keys: Iterable[K]) -> list[V]:
+        """
+        Get the values for every key in keys, in order.
+
+        :complexity: See __getitem__, once per key.
+        :raises KeyError: when any of the keys doesn't exist.
+        """
+        return [self[key] for key in keys]
+
+    def contains_many(self, keys: Iterable[K]) -> list[bool]:
+        """
+        Checks which of the given keys are in the Hash Table, in order.
+
+        :complexity: See __contains__, once per key.
+        """
+        return [key in self for key in keys]
+
+    def is_empty(self) -> bool:
+        return self.count == 0
+
+    def is_full(self) -> bool:
+        return self.count == self.table_size
+
+    def _rehash(self) -> bool:
+        """
+        Move up TABLE_SIZES to the next size that every entry can be placed in.
+        At the last size it gives up straight away, rather than gathering
+        every entry on each insert that fails or passes MAX_LOAD.
+
+        :complexity: O(N * MAX_KICKS) in the worst case, O(N) expected, O(1) at the last size.
+        Where N is len(self)
+        :return: False when the table cannot be resized further.
+        """
+        if self.size_index + 1 >= len(self.TABLE_SIZES):
+            return False
+        old_array, old_size_index = self.array, self.size_index
+        items = [item for item in old_array if item is not None]
+        while self.size_index + 1 < len(self.TABLE_SIZES):
+            self.size_index += 1
+            self.array = [None] * (self.TABLE_SIZES[self.size_index] * self.bucket_size)
+            if all(self._place(item) for item in items):
+                return True
+        # Cannot be resized further.
+        self.array, self.size_index = old_array, old_size_index
+        return False
+
+    def __str__(self) -> str:
+        """
+        Returns all they key/value pairs in our hash table (no particular
+        order).
+        :complexity: O(N * (str(key) + str(value))) where N is the table size
+        """
+        result = ""
+        for item in self.array:
+            if item is not None:
+                result += "(" + str(item[0]) + "," + str(item[1]) + ")\n"
+        return result
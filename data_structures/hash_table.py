@@ -7,8 +7,15 @@ __author__ = 'Jackson Goerner'
 __since__ = '07/02/2023'
 
 
-from typing import TypeVar, Generic
+import copy
+from time import perf_counter
+from typing import TypeVar, Generic, Iterable, Iterator
 from data_structures.referential_array import ArrayR
+from data_structures.cow_array import CowArray
+from data_structures.array_pool import ArrayPool
+from data_structures.table_stats import TableStats, largest_cluster
+from data_structures.load_tuner import LoadTuner
+from data_structures.bloom_filter import CountingBloomFilter
 
 K = TypeVar('K')
 V = TypeVar('V')
@@ -17,39 +24,136 @@ class FullError(Exception):
     pass
 
 
+# Marks a slot of the old array whose item has moved to the new array.
+_MIGRATED = object()
+
+
+def next_prime(n: int) -> int:
+    """
+    Returns the smallest prime no smaller than n.
+
+    :complexity: O(sqrt(n)) per candidate, with O(log(n)) candidates on average.
+    """
+    candidate = max(n, 2)
+    while True:
+        if candidate == 2 or (candidate % 2 == 1 and all(candidate % d for d in range(3, int(candidate ** 0.5) + 1, 2))):
+            return candidate
+        candidate += 1
+
+
 class LinearProbeTable(Generic[K, V]):
     """
     Linear Probe Table.
 
     Type Arguments:
-        - K:    Key Type. In most cases should be string.
-                Otherwise `hash` should be overwritten.
+        - K:    Key Type. In most cases should be string, int, bytes or a
+                tuple of those. Otherwise `hash` should be overwritten.
         - V:    Value Type.
 
+    With store_hashes=True every slot holds (key, value, full_hash).
+    Positions come from full_hash modulo the table size, so resizing never
+    hashes a key again, and probes compare hashes before keys.
+
+    With rehash_step=k > 0 the table grows incrementally (and stores hashes).
+    A rehash only allocates the new array; the old one is kept as old_array
+    and every later probe moves k of its slots across, plus the probed key.
+    Lookups consult both arrays until the old one is empty. k must be at
+    least 2: the table about doubles when it grows, so it takes about half
+    the old size in writes to grow again, and moving 2 slots per write
+    empties the old array by then. With k=1 half of it would be left to
+    move in one go at the next growth.
+
+    The table grows once its load passes max_load, which starts at MAX_LOAD.
+    Given a LoadTuner, the table asks it for a new max_load each time it
+    passes the current one, and for a starting size when it is created.
+
+    Deleting below LOW_WATER_RATIO * max_load moves the table down TABLE_SIZES
+    to the smallest size with a load of at most SHRINK_TO_RATIO * max_load.
+    Entries then have to double before it grows again, or halve before it
+    shrinks again. The table never shrinks below the size it was created
+    at for expected_size.
+
+    With copy_on_write=True the arrays are CowArrays, and `snapshot` returns
+    an immutable view of the table in O(1) that later writes leave alone.
+
+    Given an ArrayPool, the table takes its arrays from the pool and gives
+    back each array it outgrows (or shrinks out of), so a table that keeps
+    resizing reuses arrays instead of allocating and clearing new ones.
+
     Unless stated otherwise, all methods have O(1) complexity.
     """
 
-    # No test case should exceed 1 million entries.
+    # Tables that weren't given sizes carry on past the end of this list,
+    # with each new size the next prime after double the last one.
     TABLE_SIZES = [5, 13, 29, 53, 97, 193, 389, 769, 1543, 3079, 6151, 12289, 24593, 49157, 98317, 196613, 393241, 786433, 1572869]
 
     HASH_BASE = 31
 
-    def __init__(self, sizes=None) -> None:
+    FULL_HASH_MASK = (1 << 64) - 1
+
+    # 2**64 divided by the golden ratio, for Fibonacci hashing.
+    FIBONACCI_MULTIPLIER = 11400714819323198485
+
+    MAX_LOAD = 1 / 2
+
+    # Fractions of max_load.
+    LOW_WATER_RATIO = 1 / 4
+    SHRINK_TO_RATIO = 1 / 2
+
+    def __init__(self, sizes=None, store_hashes: bool = False, rehash_step: int = 0, expected_size: int = 0,
+                 tuner: LoadTuner | None = None, copy_on_write: bool = False, pool: ArrayPool | None = None) -> None:
         """
         Initialise the Hash Table.
+
+        expected_size picks the first size that holds that many entries,
+        so filling the table up to it never rehashes, and the table never
+        shrinks below that size. A tuner may pick a larger starting size,
+        and the starting max_load.
+
+        :raises ValueError: when given both copy_on_write and a pool,
+                    as snapshots keep sharing the arrays the table gives up.
+        :raises ValueError: when rehash_step is negative or 1.
         """
+        if copy_on_write and pool is not None:
+            raise ValueError("Pooled arrays cannot be used with copy_on_write.")
+        if rehash_step < 0 or rehash_step == 1:
+            raise ValueError("rehash_step must be 0 or at least 2.")
         if sizes is not None:
             self.TABLE_SIZES = sizes
+        self.extend_sizes = sizes is None
+        self.store_hashes = store_hashes or rehash_step > 0
+        self.rehash_step = rehash_step
+        self.array_class = CowArray if copy_on_write else ArrayR
+        self.pool = pool
+        self.max_load = self.MAX_LOAD
+        self.stats: TableStats | None = None
+        self.bloom: CountingBloomFilter[K] | None = None
+        self.tuner = tuner
+        if tuner is not None:
+            expected_size = max(expected_size, tuner.attach(self))
         self.size_index = 0
-        self.array:ArrayR[tuple[K, V]] = ArrayR(self.TABLE_SIZES[self.size_index])
+        self.size_index = self._size_index_for(expected_size)
+        self.min_size_index = self.size_index
+        self.array:ArrayR[tuple[K, V]] = self._new_array(self.TABLE_SIZES[self.size_index])
+        self.old_array: ArrayR[tuple[K, V]] | None = None
+        self.migrate_index = 0
         self.count = 0
 
     def hash(self, key: K) -> int:
         """
         Hash a key for insert/retrieve/update into the hashtable.
+        Ints, bytes and tuples are handed to their own hashes,
+        everything else is hashed as a string.
 
-        :complexity: O(len(key))
+        :complexity: O(len(key)), O(1) for ints.
         """
+        if type(key) is not str:
+            if isinstance(key, int):
+                return self._hash_int(key)
+            elif isinstance(key, (bytes, bytearray)):
+                return self._hash_bytes(key)
+            elif isinstance(key, tuple):
+                return self._hash_tuple(key)
 
         value = 0
         a = 31415
@@ -58,6 +162,49 @@ class LinearProbeTable(Generic[K, V]):
             a = a * self.HASH_BASE % (self.table_size - 1)
         return value
 
+    def _hash_int(self, key: int) -> int:
+        """
+        Fibonacci hashing: multiply by 2**64 / golden ratio, keep the low
+        64 bits and scale them down to the table size. Consecutive ints
+        land far apart instead of forming one long cluster.
+
+        :complexity: O(1)
+        """
+        return ((hash(key) * self.FIBONACCI_MULTIPLIER) & self.FULL_HASH_MASK) * self.table_size >> 64
+
+    def _hash_bytes(self, key: bytes) -> int:
+        """
+        Reads the whole key as one integer, so the loop over bytes runs in C.
+
+        :complexity: O(len(key))
+        """
+        return int.from_bytes(key, "little") % self.table_size
+
+    def _hash_tuple(self, key: tuple) -> int:
+        """
+        Polynomial over the hashes of the elements.
+
+        :complexity: O(sum of the hashes of the elements)
+        """
+        value = 0
+        for element in key:
+            value = (value * self.HASH_BASE + self.hash(element)) % self.table_size
+        return value
+
+    def full_hash(self, key: K) -> int:
+        """
+        Hash a key to 64 bits, independently of the table size.
+        Only used when the table stores hashes.
+
+        Stable for the lifetime of the process, which is all a table needs.
+        The builtin hash is multiplied by FIBONACCI_MULTIPLIER first, since
+        consecutive ints hash to themselves and would otherwise fill one
+        long run of slots.
+
+        :complexity: O(len(key)) the first time a string is hashed, O(1) after.
+        """
+        return (hash(key) * self.FIBONACCI_MULTIPLIER) & self.FULL_HASH_MASK
+
     @property
     def table_size(self) -> int:
         return len(self.array)
@@ -77,38 +224,204 @@ class LinearProbeTable(Generic[K, V]):
         :raises KeyError: When the key is not in the table, but is_insert is False.
         :raises FullError: When a table is full and cannot be inserted.
         """
+        if self.store_hashes:
+            return self._hashed_probe(key, self.full_hash(key), is_insert)
+
         # Initial position
         position = self.hash(key)
 
-        for _ in range(self.table_size):
+        for probes in range(1, self.table_size + 1):
             if self.array[position] is None:
+                if self.stats is not None:
+                    self.stats.record_probe(False, probes)
                 # Empty spot. Am I upserting or retrieving?
                 if is_insert:
                     return position
                 else:
                     raise KeyError(key)
             elif self.array[position][0] == key:
+                if self.stats is not None:
+                    self.stats.record_probe(True, probes)
                 return position
             else:
                 # Taken by something else. Time to linear probe.
                 position = (position + 1) % self.table_size
 
+        if self.stats is not None:
+            self.stats.record_probe(False, self.table_size)
         if is_insert:
             raise FullError("Table is full!")
         else:
             raise KeyError(key)
 
+    def _hashed_probe(self, key: K, full_hash: int, is_insert: bool) -> int:
+        """
+        Linear probe for a table that stores hashes.
+        Stored hashes are compared first, so keys are only compared on a hash match.
+
+        :complexity best: O(1) first position is empty
+        :complexity worst: O(N + comp(K)) when we've searched the entire table
+                        where N is the tablesize
+        :raises KeyError: When the key is not in the table, but is_insert is False.
+        :raises FullError: When a table is full and cannot be inserted.
+        """
+        if self.old_array is not None:
+            self._migrate(key, full_hash)
+
+        position = full_hash % self.table_size
+
+        for probes in range(1, self.table_size + 1):
+            item = self.array[position]
+            if item is None:
+                if self.stats is not None:
+                    self.stats.record_probe(False, probes)
+                if is_insert:
+                    return position
+                else:
+                    raise KeyError(key)
+            elif item[2] == full_hash and item[0] == key:
+                if self.stats is not None:
+                    self.stats.record_probe(True, probes)
+                return position
+            else:
+                position = (position + 1) % self.table_size
+
+        if self.stats is not None:
+            self.stats.record_probe(False, self.table_size)
+        if is_insert:
+            raise FullError("Table is full!")
+        else:
+            raise KeyError(key)
+
+    def _home(self, item: tuple) -> int:
+        """
+        The position an item hashes to in the current array.
+
+        :complexity: O(hash(K)), O(1) with stored hashes.
+        """
+        if self.store_hashes:
+            return item[2] % self.table_size
+        return self.hash(item[0])
+
+    def _reinsert(self, item: tuple) -> None:
+        """
+        Place an item whose key is known not to be in the table,
+        without comparing any keys.
+
+        :complexity best: O(hash(K)) first position is empty, O(1) with stored hashes.
+        :complexity worst: O(hash(K) + N) where N is the tablesize
+        """
+        position = self._home(item)
+        while self.array[position] is not None:
+            position = (position + 1) % self.table_size
+        self.array[position] = item
+
+    def _migrate(self, key: K, full_hash: int) -> None:
+        """
+        Move the next rehash_step slots of the old array into the new one,
+        then move key across too if it is still in the old array.
+
+        :complexity: O(rehash_step + M) where M is the probe length of key in the old array.
+        """
+        old_array = self.old_array
+        old_size = len(old_array)
+        self._migrate_slots(min(self.migrate_index + self.rehash_step, old_size))
+        if self.old_array is None:
+            return
+
+        position = full_hash % old_size
+        for _ in range(old_size):
+            item = old_array[position]
+            if item is None:
+                return
+            elif item is not _MIGRATED and item[2] == full_hash and item[0] == key:
+                old_array[position] = _MIGRATED
+                self._reinsert(item)
+                return
+            position = (position + 1) % old_size
+
+    def _migrate_slots(self, stop: int) -> None:
+        """
+        Move the old array's slots from migrate_index up to stop into the new one.
+        Drops the old array once every slot has been moved.
+
+        :complexity: O(stop - migrate_index)
+        """
+        old_array = self.old_array
+        for x in range(self.migrate_index, stop):
+            item = old_array[x]
+            if item is not None and item is not _MIGRATED:
+                old_array[x] = _MIGRATED
+                self._reinsert(item)
+        self.migrate_index = stop
+        if stop == len(old_array):
+            self.old_array = None
+            self._release_array(old_array)
+
+    def _finish_migration(self) -> None:
+        """
+        Move everything left in the old array into the new one.
+
+        :complexity: O(N) where N is the size of the old array.
+        """
+        if self.old_array is not None:
+            self._migrate_slots(len(self.old_array))
+
+    def _items(self) -> Iterator[tuple]:
+        """
+        Iterate over every item in the table, including any still in the old array.
+
+        :complexity: O(N) where N is self.table_size (plus the old array's size).
+        """
+        if self.old_array is not None:
+            for item in self.old_array:
+                if item is not None and item is not _MIGRATED:
+                    yield item
+        for item in self.array:
+            if item is not None:
+                yield item
+
+    def iter_keys(self) -> Iterator[K]:
+        """
+        Returns an iterator of all keys in the hash table.
+        Slots are only read as the iterator is advanced.
+
+        :complexity: O(1) per step, amortised; O(N) in total where N is self.table_size.
+        """
+        for item in self._items():
+            yield item[0]
+
+    def iter_values(self) -> Iterator[V]:
+        """
+        Returns an iterator of all values in the hash table.
+
+        :complexity: O(1) per step, amortised; O(N) in total where N is self.table_size.
+        """
+        for item in self._items():
+            yield item[1]
+
+    def iter_items(self) -> Iterator[tuple[K, V]]:
+        """
+        Returns an iterator of all (key, value) pairs in the hash table.
+
+        :complexity: O(1) per step, amortised; O(N) in total where N is self.table_size.
+        """
+        for item in self._items():
+            yield item[0], item[1]
+
+    def __iter__(self) -> Iterator[K]:
+        """
+        Iterates over the keys in the hash table.
+        """
+        return self.iter_keys()
+
     def keys(self) -> list[K]:
         """
         Returns all keys in the hash table.
 
         :complexity: O(N) where N is self.table_size.
         """
-        res = []
-        for x in range(self.table_size):
-            if self.array[x] is not None:
-                res.append(self.array[x][0])
-        return res
+        return [item[0] for item in self._items()]
 
     def values(self) -> list[V]:
         """
@@ -116,11 +429,15 @@ class LinearProbeTable(Generic[K, V]):
 
         :complexity: O(N) where N is self.table_size.
         """
-        res = []
-        for x in range(self.table_size):
-            if self.array[x] is not None:
-                res.append(self.array[x][1])
-        return res
+        return [item[1] for item in self._items()]
+
+    def items(self) -> list[tuple[K, V]]:
+        """
+        Returns all (key, value) pairs in the hash table.
+
+        :complexity: O(N) where N is self.table_size.
+        """
+        return list(self.iter_items())
 
     def __contains__(self, key: K) -> bool:
         """
@@ -128,9 +445,15 @@ class LinearProbeTable(Generic[K, V]):
 
         :complexity: See linear probe.
         """
+        if self.stats is not None:
+            self.stats.record_operation("contains")
+        if self.bloom is not None and key not in self.bloom:
+            return False
         try:
-            _ = self[key]
+            self._linear_probe(key, False)
         except KeyError:
+            if self.bloom is not None:
+                self.bloom.record_false_positive()
             return False
         else:
             return True
@@ -142,6 +465,8 @@ class LinearProbeTable(Generic[K, V]):
         :complexity: See linear probe.
         :raises KeyError: when the key doesn't exist.
         """
+        if self.stats is not None:
+            self.stats.record_operation("get")
         position = self._linear_probe(key, False)
         return self.array[position][1]
 
@@ -152,38 +477,140 @@ class LinearProbeTable(Generic[K, V]):
         :complexity: See linear probe.
         :raises FullError: when the table cannot be resized further.
         """
+        if self.stats is not None:
+            self.stats.record_operation("set")
+        self._insert(key, data)
 
-        position = self._linear_probe(key, True)
+        if len(self) > self.table_size * self.max_load:
+            if self.tuner is not None:
+                self.tuner.adjust(self)
+            if len(self) > self.table_size * self.max_load:
+                self._rehash()
 
-        if self.array[position] is None:
-            self.count += 1
+    def _insert(self, key: K, data: V) -> None:
+        """
+        Set an (key, value) pair without checking the load threshold.
 
-        self.array[position] = (key, data)
+        :complexity: See linear probe.
+        :raises FullError: when the table is full.
+        """
+        if self.store_hashes:
+            full_hash = self.full_hash(key)
+            position = self._hashed_probe(key, full_hash, True)
+            item = (key, data, full_hash)
+        else:
+            position = self._linear_probe(key, True)
+            item = (key, data)
 
-        if len(self) > self.table_size / 2:
-            self._rehash()
+        is_new = self.array[position] is None
+        self.array[position] = item
+        if is_new:
+            self.count += 1
+            if self.bloom is not None:
+                self._bloom_add(key)
 
     def __delitem__(self, key: K) -> None:
         """
         Deletes a (key, value) pair in our hash table.
 
+        The rest of the cluster is repaired in one pass: each entry whose
+        home is not between the gap and itself moves back into the gap,
+        leaving a new gap behind. No entry moves more than once.
+
         :complexity best: O(hash(key)) deleting item is not probed and in correct spot.
-        :complexity worst: O(N*hash(key)+N^2*comp(K)) deleting item is midway through large chain.
+        :complexity worst: O(hash(key) + C*hash(K)) deleting item is at the start of
+                        a cluster of length C, O(hash(key) + C) with stored hashes.
         :raises KeyError: when the key doesn't exist.
         """
+        if self.stats is not None:
+            self.stats.record_operation("delete")
         position = self._linear_probe(key, False)
-        # Remove the element
-        self.array[position] = None
         self.count -= 1
+        if self.bloom is not None:
+            self.bloom.remove(key)
+        # Remove the element first, so that even a full table has a gap to stop at.
+        self.array[position] = None
         # Start moving over the cluster
-        position = (position + 1) % self.table_size
-        while self.array[position] is not None:
-            key2, value = self.array[position]
-            self.array[position] = None
-            # Reinsert.
-            newpos = self._linear_probe(key2, True)
-            self.array[newpos] = (key2, value)
-            position = (position + 1) % self.table_size
+        following = (position + 1) % self.table_size
+        while self.array[following] is not None:
+            item = self.array[following]
+            home = self._home(item)
+            if position <= following:
+                stays = position < home <= following
+            else:
+                stays = home > position or home <= following
+            if not stays:
+                self.array[position] = item
+                self.array[following] = None
+                position = following
+            following = (following + 1) % self.table_size
+
+        if len(self) < self.table_size * self.max_load * self.LOW_WATER_RATIO:
+            self._shrink()
+
+    def update(self, pairs: Iterable[tuple[K, V]]) -> None:
+        """
+        Set every (key, value) pair in pairs.
+
+        The table is resized at most once, straight to the smallest size
+        that keeps the whole batch under the load threshold, instead of
+        stepping up TABLE_SIZES one rehash at a time.
+
+        :complexity: O(N*hash(K) + R) where N is len(pairs) and R is the cost
+                    of the single resize, plus probing.
+        :raises FullError: when the table cannot be resized further.
+        """
+        if self.stats is not None:
+            self.stats.record_operation("update")
+        pairs = list(pairs)
+        size_index = self._size_index_for(len(self) + len(pairs))
+        if size_index > self.size_index:
+            self._resize(size_index)
+
+        insert = self._insert
+        for key, data in pairs:
+            insert(key, data)
+            if len(self) > self.table_size * self.max_load:
+                # Only possible once we have run out of TABLE_SIZES.
+                self._rehash()
+
+    def get_many(self, keys: Iterable[K]) -> list[V]:
+        """
+        Get the values for every key in keys, in order.
+
+        :complexity: See linear probe, once per key.
+        :raises KeyError: when any of the keys doesn't exist.
+        """
+        if self.stats is not None:
+            self.stats.record_operation("get_many")
+        probe = self._linear_probe
+        array = self.array
+        return [array[probe(key, False)][1] for key in keys]
+
+    def contains_many(self, keys: Iterable[K]) -> list[bool]:
+        """
+        Checks which of the given keys are in the Hash Table, in order.
+
+        :complexity: See linear probe, once per key.
+        """
+        if self.stats is not None:
+            self.stats.record_operation("contains_many")
+        probe = self._linear_probe
+        bloom = self.bloom
+        res = []
+        for key in keys:
+            if bloom is not None and key not in bloom:
+                res.append(False)
+                continue
+            try:
+                probe(key, False)
+            except KeyError:
+                if bloom is not None:
+                    bloom.record_false_positive()
+                res.append(False)
+            else:
+                res.append(True)
+        return res
 
     def is_empty(self) -> bool:
         return self.count == 0
@@ -191,6 +618,98 @@ class LinearProbeTable(Generic[K, V]):
     def is_full(self) -> bool:
         return self.count == self.table_size
 
+    def enable_stats(self) -> None:
+        """
+        Start collecting probe lengths, operation counts and rehash times.
+        """
+        self.stats = TableStats()
+
+    def disable_stats(self) -> None:
+        """
+        Stop collecting stats and drop the ones collected so far.
+        """
+        self.stats = None
+
+    def stats_snapshot(self) -> dict:
+        """
+        The collected stats, plus the current shape of the table, as a plain dict.
+
+        :complexity: O(N) where N is self.table_size, to find the largest cluster.
+        :raises ValueError: when stats are not enabled.
+        """
+        if self.stats is None:
+            raise ValueError("Stats are not enabled.")
+        snapshot = self.stats.as_dict()
+        snapshot["count"] = len(self)
+        snapshot["table_size"] = self.table_size
+        snapshot["load_factor"] = len(self) / self.table_size
+        snapshot["largest_cluster"] = largest_cluster(item is not None for item in self.array)
+        if self.bloom is not None:
+            snapshot["bloom_false_positive_rate"] = self.bloom.false_positive_rate()
+            snapshot["bloom_observed_false_positive_rate"] = self.bloom.observed_false_positive_rate()
+        return snapshot
+
+    def snapshot(self) -> TableSnapshot[K, V]:
+        """
+        An immutable view of the table as it is now. Later writes copy the
+        chunks of slots they touch instead of changing the ones the view
+        shares, so readers can scan the view without locks while writes
+        carry on.
+
+        Take the snapshot on the writing thread (or under its lock); the
+        view can then be handed to any number of readers.
+
+        :complexity: O(1)
+        :raises ValueError: when the table was not created with copy_on_write.
+        """
+        if self.array_class is not CowArray:
+            raise ValueError("Snapshots need copy_on_write=True.")
+        frozen = copy.copy(self)
+        frozen.array = self.array.freeze()
+        frozen.old_array = None
+        frozen.stats = None
+        frozen.bloom = None
+        frozen.tuner = None
+        old_array = self.old_array.freeze() if self.old_array is not None else None
+        return TableSnapshot(frozen, old_array)
+
+    def enable_bloom(self, error_rate: float = 0.01, capacity: int | None = None) -> None:
+        """
+        Keep a counting Bloom filter of the keys, so that `__contains__`
+        and contains_many turn most absent keys away without a probe.
+        The filter starts with room for capacity keys (by default what the
+        table holds at its current size), and is rebuilt with double the
+        room whenever it fills up. Resizing the table leaves it alone.
+
+        :complexity: O(N) where N is self.table_size.
+        """
+        if capacity is None:
+            capacity = self._capacity()
+        self.bloom = CountingBloomFilter.from_keys(self.iter_keys(), max(capacity, len(self)), error_rate)
+
+    def _bloom_add(self, key: K) -> None:
+        """
+        Add a new key, already in the table, to the Bloom filter,
+        rebuilding the filter with double the room if that fills it up.
+
+        :complexity: O(1) amortised, O(N) to rebuild where N is self.table_size.
+        """
+        self.bloom.add(key)
+        if self.bloom.count > self.bloom.capacity:
+            self.enable_bloom(self.bloom.error_rate, 2 * self.bloom.capacity)
+
+    def disable_bloom(self) -> None:
+        """
+        Stop keeping a Bloom filter of the keys.
+        """
+        self.bloom = None
+
+    def _capacity(self) -> int:
+        """
+        Most entries the table holds at its current size before it grows.
+        """
+        return int(self.table_size * self.max_load) + 1
+
     def _rehash(self) -> None:
         """
         Need to resize table and reinsert all values
@@ -198,18 +717,124 @@ class LinearProbeTable(Generic[K, V]):
         :complexity best: O(N*hash(K)) No probing.
         :complexity worst: O(N*hash(K) + N^2*comp(K)) Lots of probing.
         Where N is len(self)
+        With rehash_step > 0: O(N) only to allocate the new array.
+        """
+        if self.stats is not None:
+            start = perf_counter()
+            self._grow()
+            self.stats.record_rehash(perf_counter() - start)
+        else:
+            self._grow()
+
+    def _grow(self) -> None:
+        """
+        Move up to the next size in TABLE_SIZES, if there is one.
         """
-        old_array = self.array
         self.size_index += 1
+        if self.size_index == len(self.TABLE_SIZES) and self.extend_sizes:
+            self._extend_sizes()
         if self.size_index >= len(self.TABLE_SIZES):
             # Cannot be resized further.
             return
-        self.array = ArrayR(self.TABLE_SIZES[self.size_index])
-        self.count = 0
+        if self.rehash_step > 0:
+            self._start_migration(self.size_index)
+        else:
+            self._resize(self.size_index)
+
+    def _shrink(self) -> None:
+        """
+        Move down to the smallest size in TABLE_SIZES that keeps the load
+        at or below SHRINK_TO_RATIO * max_load, if that is smaller than the current size.
+        Never goes below min_size_index.
+
+        :complexity: O(len(TABLE_SIZES)), plus a resize when it shrinks.
+        """
+        current = min(self.size_index, len(self.TABLE_SIZES) - 1)
+        size_index = min(self.min_size_index, current)
+        while size_index < current and len(self) > self.TABLE_SIZES[size_index] * self.max_load * self.SHRINK_TO_RATIO:
+            size_index += 1
+        if size_index == current:
+            return
+        if self.rehash_step > 0:
+            self._start_migration(size_index)
+        else:
+            self._resize(size_index)
+
+    def _start_migration(self, size_index: int) -> None:
+        """
+        Swap in an empty array of size TABLE_SIZES[size_index], keeping the
+        current one as old_array for probes to move entries out of.
+
+        :complexity: O(N) where N is the new size, plus finishing any earlier migration.
+        """
+        self._finish_migration()
+        self.old_array = self.array
+        self.migrate_index = 0
+        self.size_index = size_index
+        self.array = self._new_array(self.TABLE_SIZES[size_index])
+
+    def _new_array(self, size: int) -> ArrayR:
+        """
+        An empty array of the given size, from the pool if there is one.
+
+        :complexity: O(size), O(1) when the pool has one.
+        """
+        if self.pool is not None:
+            return self.pool.acquire(size)
+        return self.array_class(size)
+
+    def _release_array(self, array: ArrayR) -> None:
+        """
+        Give an array the table no longer uses back to the pool, if there is one.
+
+        :complexity: O(len(array)) with a pool.
+        """
+        if self.pool is not None:
+            self.pool.release(array)
+
+    def _size_index_for(self, n: int) -> int:
+        """
+        Smallest index into TABLE_SIZES, no lower than the current one,
+        whose table holds n entries without passing the load threshold.
+        Extends TABLE_SIZES if needed and allowed.
+
+        :complexity: O(len(TABLE_SIZES)), plus extending it.
+        """
+        size_index = self.size_index
+        while n > self.TABLE_SIZES[min(size_index, len(self.TABLE_SIZES) - 1)] * self.max_load:
+            if size_index >= len(self.TABLE_SIZES) - 1:
+                if not self.extend_sizes:
+                    break
+                self._extend_sizes()
+            size_index += 1
+        return size_index
+
+    def _extend_sizes(self) -> None:
+        """
+        Add the next prime after double the largest size to this table's TABLE_SIZES.
+        The class's list is left alone.
+
+        :complexity: O(len(TABLE_SIZES) + sqrt(S) log(S)) where S is the new size.
+        """
+        self.TABLE_SIZES = self.TABLE_SIZES + [next_prime(2 * self.TABLE_SIZES[-1] + 1)]
+
+    def _resize(self, size_index: int) -> None:
+        """
+        Move every entry into a new array of size TABLE_SIZES[size_index].
+        Keys are never compared, and never hashed again when hashes are stored.
+
+        :complexity best: O(N*hash(K)) No probing, O(N) with stored hashes.
+        :complexity worst: O(N*hash(K) + N^2) Lots of probing.
+        Where N is len(self)
+        """
+        self._finish_migration()
+        old_array = self.array
+        self.size_index = size_index
+        self.array = self._new_array(self.TABLE_SIZES[size_index])
         for item in old_array:
             if item is not None:
-                key, value = item
-                self[key] = value
+                self._reinsert(item)
+        self._release_array(old_array)
 
     def __str__(self) -> str:
         """
@@ -218,8 +843,145 @@ class LinearProbeTable(Generic[K, V]):
         :complexity: O(N * (str(key) + str(value))) where N is the table size
         """
         result = ""
-        for item in self.array:
-            if item is not None:
-                (key, value) = item
-                result += "(" + str(key) + "," + str(value) + ")\n"
+        for item in self._items():
+            key, value = item[0], item[1]
+            result += "(" + str(key) + "," + str(value) + ")\n"
         return result
+
+
+class TableSnapshot(Generic[K, V]):
+    """
+    Immutable view of a LinearProbeTable, returned by `snapshot`.
+
+    Lookups probe a frozen copy of the table. Entries that an incremental
+    rehash had not moved yet are found in the frozen old array, and are
+    never moved.
+
+    Unless stated otherwise, all methods have O(1) complexity.
+    """
+
+    def __init__(self, table: LinearProbeTable[K, V], old_array: CowArray | None) -> None:
+        """
+        Object initializer, for `snapshot` to call.
+        table is a copy of the original sharing frozen arrays, without its old array.
+        """
+        self.table = table
+        self.old_array = old_array
+
+    def __len__(self) -> int:
+        """
+        Returns number of elements in the snapshot
+        """
+        return len(self.table)
+
+    def _find(self, key: K) -> tuple:
+        """
+        The item for key, looking in the old array first.
+
+        :complexity: See linear probe, once in each array.
+        :raises KeyError: when the key doesn't exist.
+        """
+        old_array = self.old_array
+        if old_array is not None:
+            full_hash = self.table.full_hash(key)
+            size = len(old_array)
+            position = full_hash % size
+            for _ in range(size):
+                item = old_array[position]
+                if item is None:
+                    break
+                elif item is not _MIGRATED and item[2] == full_hash and item[0] == key:
+                    return item
+                position = (position + 1) % size
+        return self.table.array[self.table._linear_probe(key, False)]
+
+    def __getitem__(self, key: K) -> V:
+        """
+        Get the value at a certain key
+
+        :complexity: See linear probe.
+        :raises KeyError: when the key doesn't exist.
+        """
+        return self._find(key)[1]
+
+    def __contains__(self, key: K) -> bool:
+        """
+        Checks to see if the given key is in the snapshot
+
+        :complexity: See linear probe.
+        """
+        try:
+            self._find(key)
+        except KeyError:
+            return False
+        else:
+            return True
+
+    def _items(self) -> Iterator[tuple]:
+        """
+        Iterate over every item in the snapshot.
+
+        :complexity: O(N) where N is the table size (plus the old array's size).
+        """
+        if self.old_array is not None:
+            for item in self.old_array:
+                if item is not None and item is not _MIGRATED:
+                    yield item
+        yield from self.table._items()
+
+    def iter_keys(self) -> Iterator[K]:
+        """
+        Returns an iterator of all keys in the snapshot.
+
+        :complexity: O(1) per step, amortised; O(N) in total where N is the table size.
+        """
+        for item in self._items():
+            yield item[0]
+
+    def iter_values(self) -> Iterator[V]:
+        """
+        Returns an iterator of all values in the snapshot.
+
+        :complexity: O(1) per step, amortised; O(N) in total where N is the table size.
+        """
+        for item in self._items():
+            yield item[1]
+
+    def iter_items(self) -> Iterator[tuple[K, V]]:
+        """
+        Returns an iterator of all (key, value) pairs in the snapshot.
+
+        :complexity: O(1) per step, amortised; O(N) in total where N is the table size.
+        """
+        for item in self._items():
+            yield item[0], item[1]
+
+    def __iter__(self) -> Iterator[K]:
+        """
+        Iterates over the keys in the snapshot.
+        """
+        return self.iter_keys()
+
+    def keys(self) -> list[K]:
+        """
+        Returns all keys in the snapshot.
+
+        :complexity: O(N) where N is the table size.
+        """
+        return list(self.iter_keys())
+
+    def values(self) -> list[V]:
+        """
+        Returns all values in the snapshot.
+
+        :complexity: O(N) where N is the table size.
+        """
+        return list(self.iter_values())
+
+    def items(self) -> list[tuple[K, V]]:
+        """
+        Returns all (key, value) pairs in the snapshot.
+
+        :complexity: O(N) where N is the table size.
+        """
+        return list(self.iter_items())
@@ -0,0 +1,127 @@
+""" Load threshold tuning for hash tables.
+
+A LoadTuner given to a LinearProbeTable is consulted each time the table
+passes its load threshold. It decides whether the table should grow, or
+raise or lower its threshold instead, from the probe lengths the table's
+stats have seen since the last decision and an optional cap on the
+number of slots.
+"""
+from __future__ import annotations
+
+
+class LoadTuner:
+    """
+    Picks the load threshold (max_load) and starting size of the tables it tunes.
+
+    - A table whose probes average more than target_probes slots lowers
+      its threshold by step, so it grows sooner and probes get shorter.
+    - A table whose probes average under half of target_probes raises its
+      threshold by step, so it packs more entries into the same slots.
+    - A table whose next size would pass max_slots raises its threshold
+      straight to max_load, and only grows once past that.
+
+    The threshold always stays between min_load and max_load. Latency-bound
+    tables want a low target_probes, memory-bound ones a max_slots.
+
+    A tuner tunes one table at a time, but can be handed to each new table
+    of the same kind in turn: it remembers the threshold it settled on and
+    the most entries it has seen, and starts the next table from both.
+
+    Attributes:
+        load (float): the threshold the next table starts with
+        peak_count (int): the most entries seen in a tuned table
+        adjustments (int): number of decisions made so far
+    """
+
+    def __init__(self, min_load: float = 0.25, max_load: float = 0.9, target_probes: float = 2.0,
+                 max_slots: int | None = None, step: float = 0.05, load: float = 0.5) -> None:
+        """
+        Object initializer.
+
+        :raises ValueError: unless 0 < min_load <= load <= max_load < 1,
+                            target_probes >= 1 and step > 0.
+        """
+        if not 0 < min_load <= load <= max_load < 1:
+            raise ValueError("Need 0 < min_load <= load <= max_load < 1.")
+        if target_probes < 1 or step <= 0:
+            raise ValueError("Need target_probes >= 1 and step > 0.")
+        self.min_load = min_load
+        self.max_load = max_load
+        self.target_probes = target_probes
+        self.max_slots = max_slots
+        self.step = step
+        self.load = load
+        self.peak_count = 0
+        self.adjustments = 0
+        self.probes_seen = 0
+        self.lookups_seen = 0
+
+    def attach(self, table) -> int:
+        """
+        Start tuning table, enabling its stats if they are off.
+        The probe heuristics need those stats; with them disabled again
+        the tuner only keeps to max_slots.
+        Returns the number of entries the table should be sized for.
+
+        :complexity: O(P) where P is the number of distinct probe lengths seen.
+        """
+        if table.stats is None:
+            table.enable_stats()
+        table.max_load = self.load
+        self.probes_seen, self.lookups_seen = self._probe_totals(table)
+        return self.peak_count
+
+    def adjust(self, table) -> None:
+        """
+        Set table.max_load for a table that has just passed its threshold.
+        The table grows afterwards only if it is still over the new one.
+
+        If the table's stats have been disabled, only max_slots is applied;
+        if they have been re-enabled since, the window starts from them afresh.
+
+        :complexity: O(P) where P is the number of distinct probe lengths seen.
+        """
+        self.adjustments += 1
+        self.peak_count = max(self.peak_count, len(table))
+        window_probes = window_lookups = 0
+        if table.stats is not None:
+            probes, lookups = self._probe_totals(table)
+            if lookups < self.lookups_seen:
+                # The stats were dropped and started again.
+                self.probes_seen = self.lookups_seen = 0
+            window_probes = probes - self.probes_seen
+            window_lookups = lookups - self.lookups_seen
+            self.probes_seen, self.lookups_seen = probes, lookups
+
+        if self.max_slots is not None and self._next_size(table) > self.max_slots:
+            table.max_load = self.max_load
+        elif window_lookups == 0:
+            pass
+        elif window_probes / window_lookups > self.target_probes:
+            table.max_load = max(self.min_load, table.max_load - self.step)
+        elif window_probes / window_lookups < self.target_probes / 2:
+            table.max_load = min(self.max_load, table.max_load + self.step)
+        self.load = table.max_load
+
+    @staticmethod
+    def _probe_totals(table) -> tuple[int, int]:
+        """
+        Total slots looked at, and total probes, across both of the table's histograms.
+        """
+        probes = lookups = 0
+        for histogram in (table.stats.hit_probes, table.stats.miss_probes):
+            for length, times in histogram.items():
+                probes += length * times
+                lookups += times
+        return probes, lookups
+
+    @staticmethod
+    def _next_size(table) -> int:
+        """
+        The size the table would grow to, or its current size if it cannot grow.
+        """
+        if table.size_index + 1 < len(table.TABLE_SIZES):
+            return table.TABLE_SIZES[table.size_index + 1]
+        if table.extend_sizes:
+            return 2 * table.TABLE_SIZES[-1] + 1
+        return table.table_size
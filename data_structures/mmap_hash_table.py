@@ -0,0 +1,416 @@
+""" Memory-Mapped Hash Table
+
+Defines a persistent Hash Table using Linear Probing for conflict
+resolution, whose slots and records live in a memory-mapped file.
+
+File layout:
+    - header:   magic, size_index, table_size, count, slots_offset, heap_end
+    - slots:    table_size * (full_hash, record_offset), record_offset 0 is empty
+    - heap:     records of (key length, value length, key bytes, value bytes)
+
+Everything is appended: updates write a new record, and growing writes
+a new slot array after the heap, so space from old records and slot
+arrays is not reclaimed.
+"""
+from __future__ import annotations
+
+import hashlib
+import mmap
+import os
+import pickle
+import struct
+from typing import TypeVar, Generic, Iterator
+from data_structures.hash_table import LinearProbeTable, FullError, next_prime
+
+K = TypeVar('K')
+V = TypeVar('V')
+
+MAGIC = b"LPTMMAP1"
+HEADER = struct.Struct("<8sQQQQQ")
+HEADER_SIZE = 64
+SLOT = struct.Struct("<QQ")
+RECORD = struct.Struct("<II")
+
+
+class MmapProbeTable(Generic[K, V]):
+    """
+    Memory-Mapped Linear Probe Table.
+
+    Opening an existing file only reads its header, and a lookup only pages
+    in the slots it probes plus the records whose stored hash matches.
+    Opened with readonly=True, many processes share the same pages.
+
+    Keys are hashed from their encoded bytes with blake2b, so the hashes
+    stored in the file mean the same thing in every process.
+
+    Type Arguments:
+        - K:    Key Type. In most cases should be string.
+                Otherwise `encode_key` and `decode_key` should be overwritten.
+        - V:    Value Type. Anything that can be pickled.
+                Otherwise `encode_value` and `decode_value` should be overwritten.
+
+    Unless stated otherwise, all methods have O(1) complexity.
+    """
+
+    TABLE_SIZES = LinearProbeTable.TABLE_SIZES
+
+    def __init__(self, path: str, sizes=None, readonly: bool = False) -> None:
+        """
+        Open the table stored at path, creating it if it does not exist.
+
+        :complexity: O(1) to open, O(TABLE_SIZES[0]) to create.
+        :raises ValueError: when path is not a table file, including one shorter than the header.
+        """
+        if sizes is not None:
+            self.TABLE_SIZES = sizes
+        self.extend_sizes = sizes is None
+        self.path = path
+        self.readonly = readonly
+
+        if not os.path.exists(path):
+            if readonly:
+                raise FileNotFoundError(path)
+            self._create()
+
+        self.file = open(path, "rb" if readonly else "r+b")
+        try:
+            if os.fstat(self.file.fileno()).st_size < HEADER_SIZE:
+                raise ValueError(f"{path} is not a table file.")
+            self.mm = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ if readonly else mmap.ACCESS_WRITE)
+        except BaseException:
+            self.file.close()
+            raise
+        magic, self.size_index, size, self.count, self.slots_offset, self.heap_end = HEADER.unpack_from(self.mm, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a table file.")
+        self._table_size = size
+        while self.extend_sizes and self.size_index >= len(self.TABLE_SIZES):
+            self._extend_sizes()
+
+    def _create(self) -> None:
+        """
+        Write an empty table of size TABLE_SIZES[0] to self.path.
+        """
+        size = self.TABLE_SIZES[0]
+        heap_end = HEADER_SIZE + size * SLOT.size
+        with open(self.path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, 0, size, 0, HEADER_SIZE, heap_end).ljust(HEADER_SIZE, b"\0"))
+            f.write(bytes(size * SLOT.size))
+
+    def _write_header(self) -> None:
+        HEADER.pack_into(self.mm, 0, MAGIC, self.size_index, self._table_size, self.count, self.slots_offset, self.heap_end)
+
+    def encode_key(self, key: K) -> bytes:
+        return key.encode()
+
+    def decode_key(self, data: bytes) -> K:
+        return data.decode()
+
+    def encode_value(self, value: V) -> bytes:
+        return pickle.dumps(value)
+
+    def decode_value(self, data: bytes) -> V:
+        return pickle.loads(data)
+
+    def full_hash(self, key_bytes: bytes) -> int:
+        """
+        Hash an encoded key to 64 bits, the same way in every process.
+
+        :complexity: O(len(key))
+        """
+        return int.from_bytes(hashlib.blake2b(key_bytes, digest_size=8).digest(), "little")
+
+    @property
+    def table_size(self) -> int:
+        return self._table_size
+
+    def __len__(self) -> int:
+        """
+        Returns number of elements in the hash table
+        """
+        return self.count
+
+    def _slot(self, position: int) -> tuple[int, int]:
+        """
+        The (full_hash, record_offset) stored in a slot.
+        """
+        return SLOT.unpack_from(self.mm, self.slots_offset + position * SLOT.size)
+
+    def _set_slot(self, position: int, full_hash: int, offset: int) -> None:
+        SLOT.pack_into(self.mm, self.slots_offset + position * SLOT.size, full_hash, offset)
+
+    def _record(self, offset: int) -> tuple[bytes, bytes]:
+        """
+        The (key bytes, value bytes) of the record at offset.
+        """
+        key_length, value_length = RECORD.unpack_from(self.mm, offset)
+        start = offset + RECORD.size
+        return self.mm[start:start + key_length], self.mm[start + key_length:start + key_length + value_length]
+
+    def _record_key(self, offset: int) -> bytes:
+        key_length = RECORD.unpack_from(self.mm, offset)[0]
+        return self.mm[offset + RECORD.size:offset + RECORD.size + key_length]
+
+    def _linear_probe(self, key_bytes: bytes, full_hash: int, is_insert: bool) -> int:
+        """
+        Find the correct position for this key in the hash table using linear probing.
+        Records are only read when the stored hash matches.
+
+        :complexity best: O(1) first position is empty
+        :complexity worst: O(N + comp(K)) when we've searched the entire table
+                        where N is the tablesize
+        :raises KeyError: When the key is not in the table, but is_insert is False.
+        :raises FullError: When a table is full and cannot be inserted.
+        """
+        size = self._table_size
+        position = full_hash % size
+
+        for _ in range(size):
+            stored_hash, offset = self._slot(position)
+            if offset == 0:
+                if is_insert:
+                    return position
+                else:
+                    raise KeyError(self.decode_key(key_bytes))
+            elif stored_hash == full_hash and self._record_key(offset) == key_bytes:
+                return position
+            else:
+                position = (position + 1) % size
+
+        if is_insert:
+            raise FullError("Table is full!")
+        else:
+            raise KeyError(self.decode_key(key_bytes))
+
+    def __contains__(self, key: K) -> bool:
+        """
+        Checks to see if the given key is in the Hash Table
+
+        :complexity: See linear probe.
+        """
+        key_bytes = self.encode_key(key)
+        try:
+            self._linear_probe(key_bytes, self.full_hash(key_bytes), False)
+        except KeyError:
+            return False
+        else:
+            return True
+
+    def __getitem__(self, key: K) -> V:
+        """
+        Get the value at a certain key
+
+        :complexity: See linear probe.
+        :raises KeyError: when the key doesn't exist.
+        """
+        key_bytes = self.encode_key(key)
+        position = self._linear_probe(key_bytes, self.full_hash(key_bytes), False)
+        return self.decode_value(self._record(self._slot(position)[1])[1])
+
+    def __setitem__(self, key: K, data: V) -> None:
+        """
+        Set an (key, value) pair in our hash table, appending a new record.
+
+        :complexity: See linear probe.
+        :raises FullError: when the table cannot be resized further.
+        :raises ValueError: when the table is read only.
+        """
+        self._check_writable()
+        key_bytes = self.encode_key(key)
+        full_hash = self.full_hash(key_bytes)
+        position = self._linear_probe(key_bytes, full_hash, True)
+        if self._slot(position)[1] == 0:
+            self.count += 1
+        self._set_slot(position, full_hash, self._append(key_bytes, self.encode_value(data)))
+        self._write_header()
+
+        if len(self) > self.table_size / 2:
+            self._rehash()
+
+    def __delitem__(self, key: K) -> None:
+        """
+        Deletes a (key, value) pair in our hash table,
+        moving each later entry of the cluster back into the gap at most once.
+
+        :complexity best: O(hash(key)) deleting item is not probed and in correct spot.
+        :complexity worst: O(hash(key) + C) deleting item is at the start of a cluster of length C.
+        :raises KeyError: when the key doesn't exist.
+        :raises ValueError: when the table is read only.
+        """
+        self._check_writable()
+        key_bytes = self.encode_key(key)
+        position = self._linear_probe(key_bytes, self.full_hash(key_bytes), False)
+        self.count -= 1
+        # Clear the slot first, so that even a full table has a gap to stop at.
+        self._set_slot(position, 0, 0)
+
+        size = self._table_size
+        following = (position + 1) % size
+        while True:
+            full_hash, offset = self._slot(following)
+            if offset == 0:
+                break
+            home = full_hash % size
+            if position <= following:
+                stays = position < home <= following
+            else:
+                stays = home > position or home <= following
+            if not stays:
+                self._set_slot(position, full_hash, offset)
+                self._set_slot(following, 0, 0)
+                position = following
+            following = (following + 1) % size
+        self._write_header()
+
+    def _check_writable(self) -> None:
+        if self.readonly:
+            raise ValueError("Table is read only.")
+
+    def _append(self, key_bytes: bytes, value_bytes: bytes) -> int:
+        """
+        Write a record at the end of the heap and return its offset.
+
+        :complexity: O(len(key) + len(value)), amortised over file growth.
+        """
+        offset = self.heap_end
+        end = offset + RECORD.size + len(key_bytes) + len(value_bytes)
+        self._reserve(end)
+        RECORD.pack_into(self.mm, offset, len(key_bytes), len(value_bytes))
+        self.mm[offset + RECORD.size:end] = key_bytes + value_bytes
+        self.heap_end = end
+        return offset
+
+    def _reserve(self, length: int) -> None:
+        """
+        Make the file at least length bytes long, at least doubling it each time.
+
+        :complexity: O(1) amortised.
+        """
+        if length > len(self.mm):
+            length = max(length, 2 * len(self.mm))
+            self.mm.close()
+            self.file.truncate(length)
+            self.mm = mmap.mmap(self.file.fileno(), length)
+
+    def iter_keys(self) -> Iterator[K]:
+        """
+        Returns an iterator of all keys in the hash table.
+
+        :complexity: O(N) in total where N is self.table_size.
+        """
+        for position in range(self._table_size):
+            offset = self._slot(position)[1]
+            if offset != 0:
+                yield self.decode_key(self._record_key(offset))
+
+    def iter_values(self) -> Iterator[V]:
+        """
+        Returns an iterator of all values in the hash table.
+
+        :complexity: O(N) in total where N is self.table_size.
+        """
+        for position in range(self._table_size):
+            offset = self._slot(position)[1]
+            if offset != 0:
+                yield self.decode_value(self._record(offset)[1])
+
+    def keys(self) -> list[K]:
+        """
+        Returns all keys in the hash table.
+
+        :complexity: O(N) where N is self.table_size.
+        """
+        return list(self.iter_keys())
+
+    def values(self) -> list[V]:
+        """
+        Returns all values in the hash table.
+
+        :complexity: O(N) where N is self.table_size.
+        """
+        return list(self.iter_values())
+
+    def is_empty(self) -> bool:
+        return self.count == 0
+
+    def is_full(self) -> bool:
+        return self.count == self.table_size
+
+    def _rehash(self) -> None:
+        """
+        Need to resize table and reinsert all values.
+        The new slot array is written after the heap and placed by stored hashes,
+        so no record is read.
+
+        :complexity best: O(N) No probing.
+        :complexity worst: O(N^2) Lots of probing.
+        Where N is len(self)
+        """
+        self.size_index += 1
+        if self.size_index == len(self.TABLE_SIZES) and self.extend_sizes:
+            self._extend_sizes()
+        if self.size_index >= len(self.TABLE_SIZES):
+            # Cannot be resized further.
+            return
+
+        old_offset, old_size = self.slots_offset, self._table_size
+        size = self.TABLE_SIZES[self.size_index]
+        # Keep slots 8 byte aligned.
+        new_offset = (self.heap_end + 7) // 8 * 8
+        self._reserve(new_offset + size * SLOT.size)
+        self.mm[new_offset:new_offset + size * SLOT.size] = bytes(size * SLOT.size)
+        self.slots_offset, self._table_size = new_offset, size
+
+        for x in range(old_size):
+            full_hash, offset = SLOT.unpack_from(self.mm, old_offset + x * SLOT.size)
+            if offset != 0:
+                position = full_hash % size
+                while self._slot(position)[1] != 0:
+                    position = (position + 1) % size
+                self._set_slot(position, full_hash, offset)
+
+        self.heap_end = new_offset + size * SLOT.size
+        self._write_header()
+
+    def _extend_sizes(self) -> None:
+        """
+        Add the next prime after double the largest size to this table's TABLE_SIZES.
+        """
+        self.TABLE_SIZES = self.TABLE_SIZES + [next_prime(2 * self.TABLE_SIZES[-1] + 1)]
+
+    def flush(self) -> None:
+        """
+        Write any changes through to the file.
+        """
+        if not self.readonly:
+            self.mm.flush()
+
+    def close(self) -> None:
+        """
+        Flush and close the file. The table cannot be used afterwards.
+        """
+        if not self.mm.closed:
+            self.flush()
+            self.mm.close()
+        self.file.close()
+
+    def __enter__(self) -> MmapProbeTable[K, V]:
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def __str__(self) -> str:
+        """
+        Returns all they key/value pairs in our hash table (no particular
+        order).
+        :complexity: O(N * (str(key) + str(value))) where N is the table size
+        """
+        result = ""
+        for position in range(self._table_size):
+            offset = self._slot(position)[1]
+            if offset != 0:
+                key_bytes, value_bytes = self._record(offset)
+                result += "(" + str(self.decode_key(key_bytes)) + "," + str(self.decode_value(value_bytes)) + ")\n"
+        return result
@@ -0,0 +1,79 @@
+""" Trace of the probes made by a hash table with tracing enabled.
+
+Tables keep a `trace` attribute that is None until `enable_trace` is
+called, so a table without a trace only pays for an `is not None` check
+at the end of each probe. With one, each probe is recorded as a ProbeEvent
+in a ring buffer holding the most recent events.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass(frozen=True)
+class ProbeEvent:
+    """
+    One probe of a double key table.
+
+    Attributes:
+        key1: the top-level key
+        key2: the bottom-level key, or None for a top-level probe
+        top_index (int): where key1 was found or would go
+        sub_index (int | None): where key2 was found or would go, None if the probe stopped before it
+        probes (int): slots looked at, top-level and bottom-level together
+        found (bool): whether the keys were already in the table
+    """
+    key1: Any
+    key2: Any
+    top_index: int
+    sub_index: int | None
+    probes: int
+    found: bool
+
+
+class ProbeTrace:
+    """
+    Ring buffer of the last capacity ProbeEvents.
+
+    Attributes:
+        events (list[ProbeEvent | None]): the buffer, oldest event at `start` once it has wrapped
+        recorded (int): events recorded since the trace was created, including overwritten ones
+    """
+
+    def __init__(self, capacity: int = 1024) -> None:
+        """
+        Object initializer.
+
+        :complexity: O(capacity)
+        :raises ValueError: when capacity < 1.
+        """
+        if capacity < 1:
+            raise ValueError("Capacity must be at least 1.")
+        self.events: list[ProbeEvent | None] = [None] * capacity
+        self.recorded = 0
+
+    def record(self, key1: Any, key2: Any, top_index: int, sub_index: int | None, probes: int, found: bool) -> None:
+        """ Record a probe, overwriting the oldest event once the buffer is full. """
+        self.events[self.recorded % len(self.events)] = ProbeEvent(key1, key2, top_index, sub_index, probes, found)
+        self.recorded += 1
+
+    def __len__(self) -> int:
+        """ Number of events held. """
+        return min(self.recorded, len(self.events))
+
+    def recent(self) -> list[ProbeEvent]:
+        """
+        The events held, oldest first.
+
+        :complexity: O(capacity)
+        """
+        if self.recorded <= len(self.events):
+            return self.events[:self.recorded]
+        start = self.recorded % len(self.events)
+        return self.events[start:] + self.events[:start]
+
+    def clear(self) -> None:
+        """ Drop every event held. """
+        self.events = [None] * len(self.events)
+        self.recorded = 0
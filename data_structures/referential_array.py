@@ -12,17 +12,23 @@ space to hold the references.
 Note that while I do check the precondition in __init__ (noone else
 would), I do not check that of getitem or setitem, since that is already
 checked by self.array[index].
+
+The bulk operations (fill, copy_from, slices, resize) all go through
+ctypes slice assignment, which copies in C and keeps the reference
+counts right. A raw memmove of the pointers would not.
 """
+from __future__ import annotations
 __author__ = "Julian Garcia for the __init__ code, Maria Garcia de la Banda for the rest"
 __docformat__ = 'reStructuredText'
 
 from ctypes import py_object
-from typing import TypeVar, Generic
+from typing import TypeVar, Generic, Iterable, Iterator
 
 T = TypeVar('T')
 
 
 class ArrayR(Generic[T]):
+
     def __init__(self, length: int) -> None:
         """ Creates an array of references to objects of the given length
         :complexity: O(length) for best/worst case to initialise to None
@@ -31,7 +37,7 @@ class ArrayR(Generic[T]):
         if length <= 0:
             raise ValueError("Array length should be larger than 0.")
         self.array = (length * py_object)() # initialises the space
-        self.array[:] =  [None for _ in range(length)]
+        self.array[:] = [None] * length
 
     def __len__(self) -> int:
         """ Returns the length of the array
@@ -39,20 +45,76 @@ class ArrayR(Generic[T]):
         """
         return len(self.array)
 
-    def __getitem__(self, index: int) -> T:
-        """ Returns the object in position index.
-        :complexity: O(1)
-        :pre: index in between 0 and length - self.array[] checks it
+    @classmethod
+    def from_iterable(cls, items: Iterable[T]) -> ArrayR[T]:
+        """ Creates an array holding the given items, in order
+        :complexity: O(N) where N is the number of items
+        :pre: there is at least one item
         """
+        items = list(items)
+        if not items:
+            raise ValueError("Array length should be larger than 0.")
+        array = cls.__new__(cls)
+        array.array = (len(items) * py_object)(*items)
+        return array
 
-        # print("\n\n\t@@@ __getitem__ @@@")
-        # print("\tindex: ", index)
-        # print("\titem: ", self.array[index])
+    def __getitem__(self, index: int | slice) -> T | list[T]:
+        """ Returns the object in position index, or a list of the objects in a slice.
+        :complexity: O(1), O(K) for a slice of K positions
+        :pre: index in between 0 and length - self.array[] checks it
+        """
         return self.array[index]
 
-    def __setitem__(self, index: int, value: T) -> None:
-        """ Sets the object in position index to value
-        :complexity: O(1)
+    def __setitem__(self, index: int | slice, value: T | Iterable[T]) -> None:
+        """ Sets the object in position index to value,
+        or the objects in a slice to the items of value.
+        :complexity: O(1), O(K) for a slice of K positions
         :pre: index in between 0 and length - self.array[] checks it
+        :raises ValueError: when value has a different length than the slice.
         """
+        if isinstance(index, slice) and not isinstance(value, list):
+            value = list(value)
         self.array[index] = value
+
+    def __iter__(self) -> Iterator[T]:
+        """ Iterates over the objects in order, reading each position as it
+        is reached, so writes made during iteration are seen.
+        :complexity: O(1) per step, O(length) in total
+        """
+        array = self.array
+        for index in range(len(array)):
+            yield array[index]
+
+    def fill(self, value: T, start: int = 0, stop: int | None = None) -> None:
+        """ Sets every position from start up to stop to value
+        :complexity: O(stop - start)
+        """
+        start, stop, _ = slice(start, stop).indices(len(self.array))
+        if start < stop:
+            self.array[start:stop] = [value] * (stop - start)
+
+    def copy_from(self, src: ArrayR[T], start: int = 0, stop: int | None = None, dest: int = 0) -> None:
+        """ Copies the objects of src from start up to stop into this array, from position dest on
+        :complexity: O(stop - start)
+        :pre: they fit, dest + (stop - start) <= len(self)
+        :raises ValueError: when they do not fit.
+        """
+        start, stop, _ = slice(start, stop).indices(len(src.array))
+        if start < stop:
+            if dest < 0 or dest + stop - start > len(self.array):
+                raise ValueError("Source does not fit in the array.")
+            self.array[dest:dest + stop - start] = src.array[start:stop]
+
+    def resize(self, length: int) -> None:
+        """ Changes the length of the array, keeping the objects that still fit
+        and filling any new positions with None
+        :complexity: O(length)
+        :pre: length > 0
+        """
+        if length <= 0:
+            raise ValueError("Array length should be larger than 0.")
+        old = self.array
+        self.array = (length * py_object)()
+        kept = min(length, len(old))
+        self.array[:kept] = old[:kept]
+        self.array[kept:] = [None] * (length - kept)
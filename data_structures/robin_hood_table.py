@@ -0,0 +1,150 @@
+""" Robin Hood Hash Table
+
+Defines a Hash Table using Robin Hood linear probing for conflict resolution.
+"""
+from __future__ import annotations
+
+from typing import TypeVar
+from data_structures.hash_table import LinearProbeTable, FullError
+from data_structures.load_tuner import LoadTuner
+from data_structures.array_pool import ArrayPool
+
+K = TypeVar('K')
+V = TypeVar('V')
+
+
+class RobinHoodTable(LinearProbeTable[K, V]):
+    """
+    Robin Hood Table.
+
+    A Linear Probe Table where an insert takes the slot of any entry that
+    is closer to its home position than the inserted entry is, and carries
+    on inserting that entry instead. Clusters stay sorted by distance from
+    home, so a lookup can stop as soon as it passes where its key would be,
+    and deletes shift the rest of the cluster back one slot.
+
+    Always stores hashes, to know each entry's home without hashing it again.
+
+    Unless stated otherwise, all methods have O(1) complexity.
+    """
+
+    def __init__(self, sizes=None, expected_size: int = 0, tuner: LoadTuner | None = None,
+                 copy_on_write: bool = False, pool: ArrayPool | None = None) -> None:
+        """
+        Initialise the Hash Table.
+        """
+        LinearProbeTable.__init__(self, sizes, store_hashes=True, expected_size=expected_size, tuner=tuner,
+                                  copy_on_write=copy_on_write, pool=pool)
+
+    def _hashed_probe(self, key: K, full_hash: int, is_insert: bool) -> int:
+        """
+        Find the position of key, stopping at the first entry closer to its home than key would be.
+        When inserting, that is where key would go, after displacing the rest of the cluster.
+
+        :complexity best: O(1) first position is empty
+        :complexity worst: O(N + comp(K)) when we've searched the entire table
+                        where N is the tablesize
+        :raises KeyError: When the key is not in the table, but is_insert is False.
+        :raises FullError: When a table is full and cannot be inserted.
+        """
+        size = self.table_size
+        position = full_hash % size
+
+        for distance in range(size):
+            item = self.array[position]
+            if item is None or (position - item[2]) % size < distance:
+                if self.stats is not None:
+                    self.stats.record_probe(False, distance + 1)
+                if is_insert:
+                    return position
+                else:
+                    raise KeyError(key)
+            elif item[2] == full_hash and item[0] == key:
+                if self.stats is not None:
+                    self.stats.record_probe(True, distance + 1)
+                return position
+            else:
+                position = (position + 1) % size
+
+        if self.stats is not None:
+            self.stats.record_probe(False, size)
+        if is_insert:
+            raise FullError("Table is full!")
+        else:
+            raise KeyError(key)
+
+    def _insert(self, key: K, data: V) -> None:
+        """
+        Set an (key, value) pair without checking the load threshold.
+
+        :complexity: See linear probe, plus O(C) to displace a cluster of length C.
+        :raises FullError: when the table is full.
+        """
+        full_hash = self.full_hash(key)
+        position = self._hashed_probe(key, full_hash, True)
+        current = self.array[position]
+        if current is not None and current[2] == full_hash and current[0] == key:
+            self.array[position] = (key, data, full_hash)
+            return
+        if self.is_full():
+            raise FullError("Table is full!")
+        self._place((key, data, full_hash), position)
+        self.count += 1
+        if self.bloom is not None:
+            self._bloom_add(key)
+
+    def _reinsert(self, item: tuple) -> None:
+        """
+        Place an item whose key is known not to be in the table,
+        without comparing any keys.
+
+        :complexity best: O(1) first position is empty.
+        :complexity worst: O(N) where N is the tablesize
+        """
+        size = self.table_size
+        position = item[2] % size
+        distance = 0
+        while self.array[position] is not None and (position - self.array[position][2]) % size >= distance:
+            position = (position + 1) % size
+            distance += 1
+        self._place(item, position)
+
+    def _place(self, item: tuple, position: int) -> None:
+        """
+        Put item at position, shifting the entries from there up to the
+        next empty slot one step further from home.
+
+        :pre: the table has at least one empty slot.
+        :complexity: O(C) where C is the length of the cluster after position.
+        """
+        while item is not None:
+            item, self.array[position] = self.array[position], item
+            position = (position + 1) % self.table_size
+
+    def __delitem__(self, key: K) -> None:
+        """
+        Deletes a (key, value) pair in our hash table,
+        shifting the rest of the cluster back towards home.
+
+        :complexity best: O(1) the next slot is empty or home to its entry.
+        :complexity worst: O(N) deleting item is at the start of a large cluster.
+        :raises KeyError: when the key doesn't exist.
+        """
+        size = self.table_size
+        position = self._linear_probe(key, False)
+        # Remove the element first, so that even a full table has a gap to stop at.
+        self.array[position] = None
+        following = (position + 1) % size
+        item = self.array[following]
+        while item is not None and (following - item[2]) % size != 0:
+            self.array[position] = item
+            self.array[following] = None
+            position = following
+            following = (following + 1) % size
+            item = self.array[following]
+        self.count -= 1
+        if self.bloom is not None:
+            self.bloom.remove(key)
+
+        if len(self) < self.table_size * self.max_load * self.LOW_WATER_RATIO:
+            self._shrink()
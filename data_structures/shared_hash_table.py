@@ -0,0 +1,172 @@
+""" Shared-Memory Hash Table
+
+Defines a Hash Table using Linear Probing for conflict resolution, laid
+out like a MmapProbeTable but held in a `multiprocessing.shared_memory`
+block instead of a file. One process builds the table, and any number of
+processes attach to the block by name and read it without copying it.
+"""
+from __future__ import annotations
+
+from multiprocessing import resource_tracker, shared_memory
+from typing import TypeVar
+
+from data_structures.mmap_hash_table import MmapProbeTable, MAGIC, HEADER, HEADER_SIZE, SLOT, RECORD
+
+K = TypeVar('K')
+V = TypeVar('V')
+
+
+class SharedProbeTable(MmapProbeTable[K, V]):
+    """
+    Shared-Memory Linear Probe Table.
+
+    Created without a name, the table lives in a new block that this process
+    owns and writes to. A shared memory block cannot grow, so when the table
+    outgrows it the contents move to a block twice the size, under a new
+    name: read `name` once building is done, and hand that to the readers.
+
+    Created with a name, the table attaches read-only to the block another
+    process built. Lookups read straight from the shared pages, so workers
+    share one copy of the table instead of building their own.
+
+    The builder should call `unlink` once no process needs the table.
+
+    Type Arguments:
+        - K:    Key Type. In most cases should be string.
+                Otherwise `encode_key` and `decode_key` should be overwritten.
+        - V:    Value Type. Anything that can be pickled.
+                Otherwise `encode_value` and `decode_value` should be overwritten.
+
+    Unless stated otherwise, all methods have O(1) complexity.
+    """
+
+    def __init__(self, name: str | None = None, sizes=None, expected_size: int = 0) -> None:
+        """
+        Attach read-only to the table in the block called name,
+        or create an empty writable table in a new block if name is None.
+
+        expected_size picks the first size that holds that many entries,
+        so building the table up to it never rehashes (a rehash leaves the
+        old slot array behind in the block).
+
+        :complexity: O(1) to attach, O(S) to create where S is the starting size.
+        :raises FileNotFoundError: when there is no block called name.
+        :raises ValueError: when the block does not hold a table.
+        """
+        if sizes is not None:
+            self.TABLE_SIZES = sizes
+        self.extend_sizes = sizes is None
+        self.readonly = name is not None
+        self.owner = name is None
+
+        if name is None:
+            self._create(expected_size)
+        else:
+            self.shm = self._attach(name)
+            self.mm = self.shm.buf
+
+        magic, self.size_index, size, self.count, self.slots_offset, self.heap_end = HEADER.unpack_from(self.mm, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"{name} does not hold a table.")
+        self._table_size = size
+        while self.extend_sizes and self.size_index >= len(self.TABLE_SIZES):
+            self._extend_sizes()
+
+    @staticmethod
+    def _attach(name: str) -> shared_memory.SharedMemory:
+        """
+        Open the existing block called name, without this process taking
+        charge of removing it.
+        """
+        try:
+            return shared_memory.SharedMemory(name, track=False)
+        except TypeError:
+            # Before Python 3.13 attaching registers the block with the
+            # process's resource tracker, which unlinks it when the process exits.
+            register = resource_tracker.register
+            resource_tracker.register = lambda name, rtype: None
+            try:
+                return shared_memory.SharedMemory(name)
+            finally:
+                resource_tracker.register = register
+
+    def _create(self, expected_size: int = 0) -> None:
+        """
+        Write an empty table into a new block, at the first size that holds expected_size entries.
+        """
+        size_index = 0
+        while expected_size > self.TABLE_SIZES[size_index] / 2:
+            if size_index == len(self.TABLE_SIZES) - 1:
+                if not self.extend_sizes:
+                    break
+                self._extend_sizes()
+            size_index += 1
+        size = self.TABLE_SIZES[size_index]
+        heap_end = HEADER_SIZE + size * SLOT.size
+        self.shm = shared_memory.SharedMemory(create=True, size=heap_end)
+        self.mm = self.shm.buf
+        self.mm[:heap_end] = bytes(heap_end)
+        HEADER.pack_into(self.mm, 0, MAGIC, size_index, size, 0, HEADER_SIZE, heap_end)
+
+    @property
+    def name(self) -> str:
+        """
+        The name other processes attach to the table with.
+        """
+        return self.shm.name
+
+    def _record(self, offset: int) -> tuple[bytes, bytes]:
+        """
+        The (key bytes, value bytes) of the record at offset.
+        """
+        key_length, value_length = RECORD.unpack_from(self.mm, offset)
+        start = offset + RECORD.size
+        return bytes(self.mm[start:start + key_length]), bytes(self.mm[start + key_length:start + key_length + value_length])
+
+    def _record_key(self, offset: int) -> bytes:
+        key_length = RECORD.unpack_from(self.mm, offset)[0]
+        return bytes(self.mm[offset + RECORD.size:offset + RECORD.size + key_length])
+
+    def _reserve(self, length: int) -> None:
+        """
+        Make the block at least length bytes long, at least doubling it each
+        time by moving the table to a new block and unlinking the old one.
+
+        :complexity: O(1) amortised.
+        """
+        if length > len(self.mm):
+            length = max(length, 2 * len(self.mm))
+            shm = shared_memory.SharedMemory(create=True, size=length)
+            shm.buf[:self.heap_end] = self.mm[:self.heap_end]
+            self.mm = None
+            self.shm.close()
+            self.shm.unlink()
+            self.shm = shm
+            self.mm = shm.buf
+
+    def flush(self) -> None:
+        """
+        Writes are visible to other processes straight away, so there is nothing to do.
+        """
+
+    def close(self) -> None:
+        """
+        Detach from the block. The table cannot be used afterwards,
+        but the block stays until the builder unlinks it.
+        """
+        if self.mm is not None:
+            self.mm = None
+            self.shm.close()
+
+    def unlink(self) -> None:
+        """
+        Detach from the block and free it. Processes still attached keep
+        their mapping, but no new ones can attach.
+
+        :raises ValueError: when this process did not create the block.
+        """
+        if not self.owner:
+            raise ValueError("Only the process that built the table can unlink it.")
+        self.close()
+        self.shm.unlink()
@@ -0,0 +1,75 @@
+""" Swiss Table
+
+Defines a Hash Table using Linear Probing for conflict resolution, where
+probes scan a bytearray of hash fingerprints instead of the slots.
+"""
+from __future__ import annotations
+
+from typing import TypeVar
+from data_structures.columnar_hash_table import ColumnarProbeTable
+from data_structures.hash_table import FullError
+
+K = TypeVar('K')
+V = TypeVar('V')
+
+
+class SwissTable(ColumnarProbeTable[K, V]):
+    """
+    Swiss Table.
+
+    A Columnar Probe Table whose used bytes double as control bytes:
+    0 for an empty slot, or 0x80 plus a 7-bit fingerprint of the entry's hash.
+    A probe finds the end of its cluster with one bytearray.find for an
+    empty byte, then jumps between slots holding its own control byte with
+    bytearray.find. Only those slots are compared, so most misses never
+    read a hash or a key.
+
+    Unless stated otherwise, all methods have O(1) complexity.
+    """
+
+    # Spreads the hash over the fingerprint bits, so small ints get different fingerprints.
+    FINGERPRINT_MULTIPLIER = 0x9E3779B97F4A7C15
+
+    def _tag(self, full_hash: int) -> int:
+        """
+        0x80 plus the top 7 bits of the mixed hash.
+        """
+        return 0x80 | ((full_hash * self.FINGERPRINT_MULTIPLIER & self.FULL_HASH_MASK) >> 57)
+
+    def _hashed_probe(self, key: K, full_hash: int, is_insert: bool) -> int:
+        """
+        Find the correct position for this key by scanning control bytes.
+
+        :complexity best: O(1) first position is empty
+        :complexity worst: O(N + M*comp(K)) where N is the tablesize, scanned
+                        in C, and M is the number of slots with a matching control byte.
+        :raises KeyError: When the key is not in the table, but is_insert is False.
+        :raises FullError: When a table is full and cannot be inserted.
+        """
+        control = self.used
+        hash_array = self.hash_array
+        key_array = self.key_array
+        size = len(control)
+        home = full_hash % size
+        tag = self._tag(full_hash)
+
+        end = control.find(0, home)
+        if end != -1:
+            ranges = ((home, end),)
+        else:
+            # The cluster wraps around the end of the table.
+            end = control.find(0, 0, home)
+            ranges = ((home, size), (0, home if end == -1 else end))
+
+        for start, stop in ranges:
+            position = control.find(tag, start, stop)
+            while position != -1:
+                if hash_array[position] == full_hash and key_array[position] == key:
+                    return position
+                position = control.find(tag, position + 1, stop)
+
+        if not is_insert:
+            raise KeyError(key)
+        elif end == -1:
+            raise FullError("Table is full!")
+        return end
@@ -0,0 +1,78 @@
+""" Statistics collected by hash tables with stats enabled.
+
+Tables keep a `stats` attribute that is None until `enable_stats` is
+called, so a table without stats only pays for an `is not None` check
+at the end of each probe and operation.
+"""
+from __future__ import annotations
+
+from typing import Iterable
+
+
+class TableStats:
+    """
+    Counters for one hash table.
+
+    Attributes:
+        hit_probes (dict[int, int]): probe length -> number of probes that found their key
+        miss_probes (dict[int, int]): probe length -> number of probes that did not
+        operations (dict[str, int]): operation name -> number of calls
+        rehashes (int): number of calls to _rehash
+        rehash_seconds (float): total time spent in _rehash
+    """
+
+    def __init__(self) -> None:
+        """ Object initializer. """
+        self.hit_probes: dict[int, int] = {}
+        self.miss_probes: dict[int, int] = {}
+        self.operations: dict[str, int] = {}
+        self.rehashes = 0
+        self.rehash_seconds = 0.0
+
+    def record_probe(self, hit: bool, probes: int) -> None:
+        """ Count a probe that looked at `probes` slots. """
+        histogram = self.hit_probes if hit else self.miss_probes
+        histogram[probes] = histogram.get(probes, 0) + 1
+
+    def record_operation(self, name: str) -> None:
+        """ Count a call of the operation `name`. """
+        self.operations[name] = self.operations.get(name, 0) + 1
+
+    def record_rehash(self, seconds: float) -> None:
+        """ Count a rehash that took `seconds`. """
+        self.rehashes += 1
+        self.rehash_seconds += seconds
+
+    def as_dict(self) -> dict:
+        """
+        A plain copy of the counters, ready for json.dumps
+        (which turns the histogram keys into strings).
+        """
+        return {
+            "hit_probes": dict(sorted(self.hit_probes.items())),
+            "miss_probes": dict(sorted(self.miss_probes.items())),
+            "operations": dict(self.operations),
+            "rehashes": self.rehashes,
+            "rehash_seconds": self.rehash_seconds,
+        }
+
+
+def largest_cluster(occupied: Iterable[bool]) -> int:
+    """
+    Length of the longest run of occupied slots, wrapping around the end of the table.
+
+    :complexity: O(N) where N is the number of slots.
+    """
+    occupied = list(occupied)
+    if all(occupied):
+        return len(occupied)
+    # Start just after an empty slot so that no run wraps around.
+    start = occupied.index(False) + 1
+    largest = run = 0
+    for x in range(start, start + len(occupied)):
+        if occupied[x % len(occupied)]:
+            run += 1
+            largest = max(largest, run)
+        else:
+            run = 0
+    return largest
@@ -0,0 +1,88 @@
+""" Typed array of primitive values.
+
+Sibling of ArrayR for numeric payloads. Where ArrayR holds a reference
+to a boxed Python object in every slot, a TypedArray stores the raw values
+in an `array.array`, so an int64 or float64 takes 8 bytes and a uint8 one.
+
+The values are exposed through the buffer protocol, so `memoryview`,
+`numpy.frombuffer`, `struct.unpack_from` and friends can read and write
+them in place without copying.
+"""
+from __future__ import annotations
+
+from array import array
+from typing import Iterator
+
+# Element type -> array typecode.
+ELEMENT_TYPES = {
+    "int64": "q",
+    "float64": "d",
+    "uint8": "B",
+}
+
+
+class TypedArray:
+    """ Array of primitive values of one element type, initialised to zero.
+
+        Attributes:
+            element_type (str): one of the keys of ELEMENT_TYPES
+            array (array.array): the values
+    """
+
+    def __init__(self, length: int, element_type: str = "int64") -> None:
+        """ Creates an array of the given length and element type, filled with zeros
+        :complexity: O(length), done in bulk rather than one slot at a time
+        :pre: length > 0
+        :raises ValueError: when length <= 0 or the element type is unknown.
+        """
+        if length <= 0:
+            raise ValueError("Array length should be larger than 0.")
+        if element_type not in ELEMENT_TYPES:
+            raise ValueError(f"Element type should be one of {', '.join(ELEMENT_TYPES)}.")
+        self.element_type = element_type
+        self.array = array(ELEMENT_TYPES[element_type], bytes(length * array(ELEMENT_TYPES[element_type]).itemsize))
+
+    def __len__(self) -> int:
+        """ Returns the length of the array
+        :complexity: O(1)
+        """
+        return len(self.array)
+
+    def __getitem__(self, index: int) -> int | float:
+        """ Returns the value in position index.
+        :complexity: O(1)
+        :pre: index in between 0 and length - self.array[] checks it
+        """
+        return self.array[index]
+
+    def __setitem__(self, index: int, value: int | float) -> None:
+        """ Sets the value in position index
+        :complexity: O(1)
+        :pre: index in between 0 and length - self.array[] checks it
+        :raises OverflowError: when value does not fit the element type.
+        :raises TypeError: when value is not a number of the element type.
+        """
+        self.array[index] = value
+
+    def __iter__(self) -> Iterator[int | float]:
+        """ Iterates over the values in order.
+        :complexity: O(length)
+        """
+        return iter(self.array)
+
+    @property
+    def itemsize(self) -> int:
+        """ Bytes per element. """
+        return self.array.itemsize
+
+    def memoryview(self) -> memoryview:
+        """ A writable view of the values, sharing their memory.
+        :complexity: O(1)
+        """
+        return memoryview(self.array)
+
+    def __buffer__(self, flags: int) -> memoryview:
+        """ Buffer protocol (Python 3.12+), so that memoryview(typed_array) works directly.
+        :complexity: O(1)
+        """
+        return memoryview(self.array)
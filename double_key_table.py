@@ -1,8 +1,13 @@
 from __future__ import annotations
 
+from time import perf_counter
 from typing import Generic, TypeVar, Iterator
 from data_structures.hash_table import LinearProbeTable, FullError
 from data_structures.referential_array import ArrayR
+from data_structures.table_stats import TableStats, largest_cluster
+from data_structures.bloom_filter import CountingBloomFilter
+from data_structures.array_pool import ArrayPool
+from data_structures.probe_trace import ProbeTrace
 
 K1 = TypeVar('K1')
 K2 = TypeVar('K2')
@@ -20,6 +25,10 @@ class DoubleKeyTable(Generic[K1, K2, V]):
                 Otherwise `hash2` should be overwritten.
         - V:    Value Type.
 
+    Given an ArrayPool, the top-level array and every bottom-level table
+    take their arrays from it, and bottom-level tables give back the arrays
+    they resize out of.
+
     Unless stated otherwise, all methods have O(1) complexity.
     """
 
@@ -28,7 +37,8 @@ class DoubleKeyTable(Generic[K1, K2, V]):
 
     HASH_BASE = 31
 
-    def __init__(self, sizes: list | None = None, internal_sizes: list | None = None) -> None:
+    def __init__(self, sizes: list | None = None, internal_sizes: list | None = None,
+                 pool: ArrayPool | None = None) -> None:
         if sizes is not None:
             self.TABLE_SIZES = sizes
 
@@ -37,9 +47,15 @@ class DoubleKeyTable(Generic[K1, K2, V]):
         else:
             self.internal_sizes = self.TABLE_SIZES
 
+        self.pool = pool
         self.size_index = 0
-        self.array: ArrayR[tuple[K1, V] | None] | None = ArrayR(self.TABLE_SIZES[self.size_index])
+        size = self.TABLE_SIZES[self.size_index]
+        self.array: ArrayR[tuple[K1, V] | None] | None = pool.acquire(size) if pool is not None else ArrayR(size)
         self.count = 0
+        self.stats: TableStats | None = None
+        self.internal_stats: TableStats | None = None
+        self.bloom: CountingBloomFilter[tuple[K1, K2]] | None = None
+        self.trace: ProbeTrace | None = None
 
     def hash1(self, key: K1) -> int:
         """
@@ -72,134 +88,77 @@ class DoubleKeyTable(Generic[K1, K2, V]):
     def _linear_probe(self, key1: K1, key2: K2 | None, is_insert: bool) -> tuple[int, int] | int:
         """
         Find the correct position for this key in the hash table using linear probing.
+        Returns the top-level position of key1, and the position of key2 in
+        key1's bottom-level table unless key2 is None. Inserting a new key1
+        places an empty bottom-level table for it.
 
+        :complexity best: O(hash1(key1) + hash2(key2)) first positions are empty
+        :complexity worst: O(hash1(key1) + hash2(key2) + (N + M)*comp(K)) when both tables are searched entirely
+                        where N is the tablesize and M the size of the bottom-level table
         :raises KeyError: When the key pair is not in the table, but is_insert is False.
         :raises FullError: When a table is full and cannot be inserted.
         """
+        position1, probes, found = self._probe_array(self.array, self.hash1(key1), key1)
+        if self.stats is not None:
+            self.stats.record_probe(bool(found), probes)
+        if not found and (not is_insert or found is None):
+            if self.trace is not None:
+                self.trace.record(key1, key2, position1, None, probes, False)
+            if not is_insert:
+                raise KeyError(key1)
+            raise FullError("Table is full!")
+        if not found:
+            self.array[position1] = (key1, self._new_sub_table())
+
+        if key2 is None:
+            if self.trace is not None:
+                self.trace.record(key1, None, position1, None, probes, bool(found))
+            return position1
 
-        print('= = '*20)
-        print("\n\t@@@ LINEAR PROBE @@@\n")
-        print("key1: ", key1)
-        print("key2: ", key2)
-
-        i1 = self.hash1(key1)
-        print("index1: ", i1)
-
-
-        # self.array[position1][1]key2] = data
-
-        for i in range(len(self.array)):
-            if self.array[i1] is None:
-                break
-            elif self.array[i1][0] == key1:
-                break
-            else:
-                # print(self.array[i1][0])
-                # print(key1)
-                i1 = (i1 + 1) #% len(self.array)
-                # print("new_index: ", i1)
-
-        print("index1 (final): ", i1)
-
-
-        if is_insert:
-            sub_table = LinearProbeTable(self.internal_sizes)
-            # sub
-
-            self.array.__setitem__(i1, [key1, sub_table])
-        else:
-            sub_table = self.array[i1][1]
-            # self.
-
-
-            # self.array[position1][1][key2]
-        if key2 is not None:
-            try:
-
-                # self.array[k2][1]
-                # sub_table = self.array[i1][1]
-                i2 = self.hash2(key2, sub_table)
-                print("index2: ", i2)
-
-
-
-                probe_order = [i2, 4, 0, 1]
-                start_i2 = i2
-                # while True:
-                #     if probe_order[0] != i2:
-                #         probe_order.remove(probe_order[0])
-                #     else:
-                #         break
-
-                    # i +=1
-                # probe_order[i2] = probe_order
-                # for i in probe_order:
-                # self.array[position1][1].array[position2][1]
-
-                    # break
-                # sub_table.array[i1][1] =
-                for i in probe_order: #range(len(sub_table.__len__())):
-                    print("i: ", i2)
-                    print("sub_table: ", sub_table.array[i2])
-                    # if sub_table.array.__getitem__(i2) is None:
-                        # sub_table.array.__setitem__(i2, [key2, None])
-
-                    if sub_table.array[i2] is None:
-                        if is_insert:
-                            return (i1, i2)
-                        raise KeyError(f"Key2 '{key2}' not found")
-                    # if sub_table.array[i2] is None:
-                        # print("j")
-                        print(sub_table.array[i2])
-                        print("empty")
-                        break
-
-                    elif sub_table.array[i2][0] == key2:
-                        return (i1, i2)
-                    # elif sub_table.array[i2] == key2:
-                    #     print("keys match")
-                    #     break
-                    else:
-                        print("increase")
-                        i2 = i
-                        print(i2)
-                    if i2 == start_i2:
-                        if is_insert:
-                            raise FullError("Sub-table is full")  # Full table and no empty slot found
-                        raise KeyError(f"Key2 '{key2}' not found")
-
-            except KeyError:
-                input()
-            print("index2 (final): ", i2)
-
-
-                # if is_insert:
-                #     sub_table.__setitem__(key2, position2)
-                # else:
-                #     sub_table.__getitem__(key2)
-
-        #
-        #         print("/nPOS2: ", sub_table.array[position2])
-        #         # position2 = sub_table._linear_probe(key2, is_insert)
-        #         # sub_table[]
-        #         print("\th2: ", position2)
-        #     except KeyError:
-        #         raise KeyError("Sub-key not found")
-        #     return (position1, position2)
-        # return position1
-
-
-        # self.array[i1][i2]
-        # sub_table.setitem(key2, )
-        # self.array[i1] = (key1, sub_table)
-
-
-
-
-        print(f"keys: ({i1}, {i2})")
-        return i1, i2
-
-        # raise NotImplementedError()
+        sub_table = self.array[position1][1]
+        position2, sub_probes, found = self._probe_array(sub_table.array, self.hash2(key2, sub_table), key2)
+        if self.internal_stats is not None:
+            self.internal_stats.record_probe(bool(found), sub_probes)
+        if self.trace is not None:
+            self.trace.record(key1, key2, position1, None if found is None else position2,
+                              probes + sub_probes, bool(found))
+        if not found:
+            if not is_insert:
+                raise KeyError(key2)
+            if found is None:
+                raise FullError("Sub-table is full!")
+        return position1, position2
+
+    @staticmethod
+    def _probe_array(array: ArrayR, position: int, key: K1 | K2) -> tuple[int, int, bool | None]:
+        """
+        Linear probe array for key, starting at position.
+        Returns where the probe stopped, the number of slots looked at, and
+        whether key was found there: True, False at an empty slot, or None
+        when every slot holds another key.
+
+        :complexity best: O(1) first position is empty
+        :complexity worst: O(N*comp(K)) when we've searched the entire array
+                        where N is len(array)
+        """
+        size = len(array)
+        for probes in range(1, size + 1):
+            item = array[position]
+            if item is None:
+                return position, probes, False
+            elif item[0] == key:
+                return position, probes, True
+            position = (position + 1) % size
+        return position, size, None
+
+    def _new_sub_table(self) -> LinearProbeTable[K2, V]:
+        """
+        An empty bottom-level table, placing keys with hash2.
+        """
+        sub_table = LinearProbeTable(self.internal_sizes, pool=self.pool)
+        sub_table.hash = lambda key: self.hash2(key, sub_table)
+        sub_table.stats = self.internal_stats
+        return sub_table
 
     def iter_keys(self, key: K1 | None = None) -> Iterator[K1 | K2]:
         """
@@ -207,8 +166,13 @@ class DoubleKeyTable(Generic[K1, K2, V]):
             Returns an iterator of all top-level keys in hash table
         key = k:
             Returns an iterator of all keys in the bottom-hash-table for k.
+
+        :complexity: O(N) where N is self.table_size (or the size of k's bottom-level table).
+        :raises KeyError: when k is not in the table.
         """
-        raise NotImplementedError()
+        if key is not None:
+            return self._sub_table(key).iter_keys()
+        return (item[0] for item in self.array if item is not None)
 
     def iter_values(self, key: K1 | None = None) -> Iterator[V]:
         """
@@ -216,22 +180,40 @@ class DoubleKeyTable(Generic[K1, K2, V]):
             Returns an iterator of all values in hash table
         key = k:
             Returns an iterator of all values in the bottom-hash-table for k.
+
+        :complexity: O(N) where N is the total size of the tables visited.
+        :raises KeyError: when k is not in the table.
+        """
+        if key is not None:
+            return self._sub_table(key).iter_values()
+        return (value for item in self.array if item is not None for value in item[1].iter_values())
+
+    def _sub_table(self, key: K1) -> LinearProbeTable[K2, V]:
+        """
+        The bottom-level table for key.
+
+        :complexity: See linear probe.
+        :raises KeyError: when key is not in the table.
         """
-        raise NotImplementedError()
+        return self.array[self._linear_probe(key, None, False)][1]
 
     def keys(self, key: K1 | None = None) -> list[K1 | K2]:
         """
         key = None: returns all top-level keys in the table.
         key = x: returns all bottom-level keys for top-level key x.
+
+        :raises KeyError: when x is not in the table.
         """
-        raise NotImplementedError()
+        return list(self.iter_keys(key))
 
     def values(self, key: K1 | None = None) -> list[V]:
         """
         key = None: returns all values in the table.
         key = x: returns all values for top-level key x.
+
+        :raises KeyError: when x is not in the table.
         """
-        raise NotImplementedError()
+        return list(self.iter_values(key))
 
     def __contains__(self, key: tuple[K1, K2]) -> bool:
         """
@@ -239,9 +221,15 @@ class DoubleKeyTable(Generic[K1, K2, V]):
 
         :complexity: See linear probe.
         """
+        if self.stats is not None:
+            self.stats.record_operation("contains")
+        if self.bloom is not None and (key[0], key[1]) not in self.bloom:
+            return False
         try:
-            _ = self[key]
+            self._linear_probe(key[0], key[1], False)
         except KeyError:
+            if self.bloom is not None:
+                self.bloom.record_false_positive()
             return False
         else:
             return True
@@ -252,6 +240,8 @@ class DoubleKeyTable(Generic[K1, K2, V]):
 
         :raises KeyError: when the key doesn't exist.
         """
+        if self.stats is not None:
+            self.stats.record_operation("get")
 
         position1, position2 = self._linear_probe(key[0], key[1], False)
         return self.array[position1][1].array[position2][1]
@@ -260,6 +250,8 @@ class DoubleKeyTable(Generic[K1, K2, V]):
         """
         Set an (key, value) pair in our hash table.
         """
+        if self.stats is not None:
+            self.stats.record_operation("set")
 
         key1, key2 = key
         position1, position2 = self._linear_probe(key1, key2, True)
@@ -268,8 +260,12 @@ class DoubleKeyTable(Generic[K1, K2, V]):
         if sub_table.is_empty():
             self.count += 1
 
-
+        pairs = len(sub_table)
         sub_table[key2] = data
+        if self.bloom is not None and len(sub_table) > pairs:
+            self.bloom.add((key1, key2))
+            if self.bloom.count > self.bloom.capacity:
+                self.enable_bloom(self.bloom.error_rate, 2 * self.bloom.capacity)
 
         # resize if necessary
         if len(self) > self.table_size / 2:
@@ -280,10 +276,37 @@ class DoubleKeyTable(Generic[K1, K2, V]):
     def __delitem__(self, key: tuple[K1, K2]) -> None:
         """
         Deletes a (key, value) pair in our hash table.
+        Deleting the last pair of a top-level key deletes that key too,
+        and reinserts the rest of its cluster.
 
+        :complexity best: O(hash1(key1) + hash2(key2)) no probing, and key1 keeps other pairs.
+        :complexity worst: O(hash1(key1) + hash2(key2) + C*hash1(K1)) deleting key1 at the
+                        start of a top-level cluster of length C, plus the bottom-level delete.
         :raises KeyError: when the key doesn't exist.
         """
-        raise NotImplementedError()
+        if self.stats is not None:
+            self.stats.record_operation("delete")
+
+        key1, key2 = key
+        position1, _ = self._linear_probe(key1, key2, False)
+        sub_table = self.array[position1][1]
+        del sub_table[key2]
+        if self.bloom is not None:
+            self.bloom.remove((key1, key2))
+        if not sub_table.is_empty():
+            return
+
+        self.count -= 1
+        self.array[position1] = None
+        if self.pool is not None:
+            self.pool.release(sub_table.array)
+        # Reinsert the rest of the cluster.
+        position1 = (position1 + 1) % self.table_size
+        while self.array[position1] is not None:
+            item = self.array[position1]
+            self.array[position1] = None
+            self.array[self._probe_array(self.array, self.hash1(item[0]), item[0])[0]] = item
+            position1 = (position1 + 1) % self.table_size
 
     def _rehash(self) -> None:
         """
@@ -293,7 +316,104 @@ class DoubleKeyTable(Generic[K1, K2, V]):
         :complexity worst: O(N*hash(K) + N^2*comp(K)) Lots of probing.
         Where N is len(self)
         """
-        raise NotImplementedError()
+        if self.stats is not None:
+            start = perf_counter()
+            self._grow()
+            self.stats.record_rehash(perf_counter() - start)
+        else:
+            self._grow()
+
+    def _grow(self) -> None:
+        """
+        Move up to the next size in TABLE_SIZES, if there is one, reinserting every key1.
+        """
+        self.size_index += 1
+        if self.size_index >= len(self.TABLE_SIZES):
+            # Cannot be resized further.
+            return
+        old_array = self.array
+        size = self.TABLE_SIZES[self.size_index]
+        self.array = self.pool.acquire(size) if self.pool is not None else ArrayR(size)
+        for item in old_array:
+            if item is not None:
+                self.array[self._probe_array(self.array, self.hash1(item[0]), item[0])[0]] = item
+        if self.pool is not None:
+            self.pool.release(old_array)
+
+    def enable_stats(self) -> None:
+        """
+        Start collecting stats for the top-level table, and one shared
+        set of stats for all the bottom-level tables, which also counts
+        the bottom-level probes of gets and `in` checks.
+        """
+        self.stats = TableStats()
+        self.internal_stats = TableStats()
+        for item in self.array:
+            if item is not None:
+                item[1].stats = self.internal_stats
+
+    def disable_stats(self) -> None:
+        """
+        Stop collecting stats and drop the ones collected so far.
+        """
+        self.stats = None
+        self.internal_stats = None
+        for item in self.array:
+            if item is not None:
+                item[1].stats = None
+
+    def enable_trace(self, capacity: int = 1024) -> None:
+        """
+        Start recording every probe as a ProbeEvent, keeping the last capacity of them.
+
+        :complexity: O(capacity)
+        """
+        self.trace = ProbeTrace(capacity)
+
+    def disable_trace(self) -> None:
+        """
+        Stop recording probes and drop the ones recorded so far.
+        """
+        self.trace = None
+
+    def enable_bloom(self, error_rate: float = 0.01, capacity: int | None = None) -> None:
+        """
+        Keep a counting Bloom filter of the (key1, key2) pairs, so that
+        `__contains__` turns most absent pairs away without hashing either key.
+        The filter starts with room for capacity pairs (by default what the
+        current top-level size holds with half full bottom-level tables of
+        the first internal size), and is rebuilt with double the room
+        whenever it fills up.
+
+        :complexity: O(N) where N is the number of pairs plus self.table_size.
+        """
+        pairs = [(item[0], key2) for item in self.array if item is not None for key2 in item[1].iter_keys()]
+        if capacity is None:
+            capacity = max(len(pairs), self.table_size // 2 * self.internal_sizes[0] // 2)
+        self.bloom = CountingBloomFilter.from_keys(pairs, capacity, error_rate)
+
+    def disable_bloom(self) -> None:
+        """
+        Stop keeping a Bloom filter of the pairs.
+        """
+        self.bloom = None
+
+    def stats_snapshot(self) -> dict:
+        """
+        The collected stats as a plain dict, with the shape of the top-level table
+        under "top" and the combined bottom-level stats under "internal".
+
+        :complexity: O(N) where N is self.table_size, to find the largest cluster.
+        :raises ValueError: when stats are not enabled.
+        """
+        if self.stats is None:
+            raise ValueError("Stats are not enabled.")
+        top = self.stats.as_dict()
+        top["count"] = len(self)
+        top["table_size"] = self.table_size
+        top["load_factor"] = len(self) / self.table_size
+        top["largest_cluster"] = largest_cluster(item is not None for item in self.array)
+        return {"top": top, "internal": self.internal_stats.as_dict()}
 
     @property
     def table_size(self) -> int:
@@ -313,8 +433,14 @@ class DoubleKeyTable(Generic[K1, K2, V]):
         String representation.
 
         Not required but may be a good testing tool.
+        :complexity: O(N * (str(key1) + str(key2) + str(value))) where N is the total size of the tables
         """
-        raise NotImplementedError()
+        result = ""
+        for item in self.array:
+            if item is not None:
+                for key2, value in item[1].iter_items():
+                    result += "(" + str(item[0]) + "," + str(key2) + "," + str(value) + ")\n"
+        return result
 
 
 if __name__=="__main__":
@@ -3,6 +3,7 @@ from typing import Generic, TypeVar
 from algorithms import mergesort
 
 from data_structures.referential_array import ArrayR
+from data_structures.bloom_filter import CountingBloomFilter
 
 K = TypeVar("K")
 V = TypeVar("V")
@@ -26,6 +27,7 @@ class InfiniteHashTable(Generic[K, V]):
         self.array: ArrayR[tuple[K, V] | None] = ArrayR(self.TABLE_SIZE)
         self.count = 0
         self.level = level
+        self.bloom: CountingBloomFilter[K] | None = None
     
     def hash(self, key: K) -> int:
         if self.level < len(key):
@@ -55,6 +57,7 @@ class InfiniteHashTable(Generic[K, V]):
         """
         Set an (key, value) pair in our hash table.
         """
+        count = self.count
         index = self.hash(key)
 
         if self.array[index] is None:
@@ -74,8 +77,16 @@ class InfiniteHashTable(Generic[K, V]):
                 self.count += 1
                 
         else:
-            self.array[index][key] = value
-            self.count += 1
+            sub_table = self.array[index]
+            # The sub-table's count only goes up for a new key, so compare it rather than its length.
+            pairs = sub_table.count
+            sub_table[key] = value
+            self.count += sub_table.count - pairs
+
+        if self.bloom is not None and self.count > count:
+            self.bloom.add(key)
+            if self.bloom.count > self.bloom.capacity:
+                self.enable_bloom(self.bloom.error_rate, 2 * self.bloom.capacity)
 
 
     def __delitem__(self, key: K) -> None:
@@ -118,6 +129,9 @@ class InfiniteHashTable(Generic[K, V]):
                 self.array[index] = active[0]
                 self.count -= 1
 
+        if self.bloom is not None:
+            self.bloom.remove(key)
+
     def __len__(self) -> int:
         counter = 0
 
@@ -173,13 +187,45 @@ class InfiniteHashTable(Generic[K, V]):
 
         :complexity: See linear probe.
         """
+        if self.bloom is not None and key not in self.bloom:
+            return False
         try:
             _ = self[key]
         except KeyError:
+            if self.bloom is not None:
+                self.bloom.record_false_positive()
             return False
         else:
             return True
 
+    def enable_bloom(self, error_rate: float = 0.01, capacity: int | None = None) -> None:
+        """
+        Keep a counting Bloom filter of the keys, so that `__contains__`
+        turns most absent keys away without walking the levels.
+        The filter starts with room for capacity keys (by default twice
+        the current number, and at least TABLE_SIZE), and is rebuilt
+        with double the room whenever it fills up.
+
+        :complexity: O(N) where N is the number of keys.
+        """
+        keys = []
+        def traverse(current):
+            for item in current.array:
+                if isinstance(item, tuple):
+                    keys.append(item[0])
+                elif isinstance(item, InfiniteHashTable):
+                    traverse(item)
+        traverse(self)
+        if capacity is None:
+            capacity = max(2 * len(keys), self.TABLE_SIZE)
+        self.bloom = CountingBloomFilter.from_keys(keys, capacity, error_rate)
+
+    def disable_bloom(self) -> None:
+        """
+        Stop keeping a Bloom filter of the keys.
+        """
+        self.bloom = None
+
     def sort_keys(self, current=None) -> list[str]:
         """
         Returns all keys currently in the table in lexicographically sorted order.
@@ -0,0 +1,80 @@
+import threading
+import unittest
+from ed_utils.decorators import number
+
+from data_structures.array_pool import ArrayPool
+from data_structures.concurrent_hash_table import ConcurrentTable
+from data_structures.hash_table import LinearProbeTable
+from data_structures.robin_hood_table import RobinHoodTable
+
+
+class TestArrayPool(unittest.TestCase):
+
+    @number("21.1")
+    def test_pool(self):
+        pool = ArrayPool(max_per_size=2)
+        first = pool.acquire(13)
+        first[3] = "x"
+        pool.release(first)
+        self.assertEqual(len(pool), 1)
+
+        again = pool.acquire(13)
+        self.assertIs(again, first)
+        self.assertEqual(list(again), [None] * 13)
+        self.assertIsNot(pool.acquire(29), first)
+
+        arrays = [pool.acquire(5) for _ in range(3)]
+        for array in arrays:
+            pool.release(array)
+        self.assertEqual(len(pool.free[5]), 2)
+        self.assertEqual(pool.discards, 1)
+        self.assertRaises(ValueError, lambda: ArrayPool(0))
+
+        stats = pool.stats()
+        self.assertEqual((stats["allocations"], stats["reuses"], stats["releases"]), (5, 1, 3))
+        self.assertEqual(stats["pooled"], 2)
+        pool.clear()
+        self.assertEqual(len(pool), 0)
+
+    @number("21.2")
+    def test_table_churn(self):
+        pool = ArrayPool()
+        for table in (LinearProbeTable(pool=pool), LinearProbeTable(rehash_step=4, pool=pool),
+                      RobinHoodTable(pool=pool)):
+            for _ in range(3):
+                for i in range(200):
+                    table[str(i)] = i
+                self.assertEqual(sorted(table.values()), list(range(200)))
+                for i in range(200):
+                    del table[str(i)]
+                self.assertEqual(len(table), 0)
+        # After the first grow/shrink cycle, every size comes from the pool.
+        self.assertGreater(pool.reuses, 2 * pool.allocations)
+        self.assertRaises(ValueError, lambda: LinearProbeTable(copy_on_write=True, pool=pool))
+
+    @number("21.3")
+    def test_shared_between_shards(self):
+        pool = ArrayPool()
+        table = ConcurrentTable(shard_count=4, pool=pool)
+
+        def work(thread):
+            for _ in range(3):
+                for i in range(300):
+                    table[thread, i] = i
+                for i in range(300):
+                    del table[thread, i]
+
+        threads = [threading.Thread(target=work, args=(thread,)) for thread in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(table), 0)
+        # No array was handed to two tables at once.
+        arrays = [shard.array for shard in table.shards] + [array for arrays in pool.free.values() for array in arrays]
+        self.assertEqual(len({id(array) for array in arrays}), len(arrays))
+        self.assertGreater(pool.reuses, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
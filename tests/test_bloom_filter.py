@@ -0,0 +1,122 @@
+import unittest
+from ed_utils.decorators import number
+
+from data_structures.bloom_filter import CountingBloomFilter
+from data_structures.hash_table import LinearProbeTable
+from data_structures.robin_hood_table import RobinHoodTable
+from double_key_table import DoubleKeyTable
+from infinite_hash_table import InfiniteHashTable
+
+
+class TestBloomFilter(unittest.TestCase):
+
+    @number("14.1")
+    def test_filter(self):
+        bloom = CountingBloomFilter(1000, 0.01)
+        self.assertEqual(bloom.hash_count, 7)
+        for i in range(1000):
+            bloom.add(str(i))
+        for i in range(1000):
+            self.assertIn(str(i), bloom)
+        self.assertLess(bloom.false_positive_rate(), 0.02)
+        passed = sum(str(i) in bloom for i in range(1000, 11000))
+        self.assertLess(passed, 200)
+
+        for i in range(500):
+            bloom.remove(str(i))
+        self.assertEqual(bloom.count, 500)
+        for i in range(500, 1000):
+            self.assertIn(str(i), bloom)
+        self.assertLess(sum(str(i) in bloom for i in range(500)), 20)
+
+        self.assertRaises(ValueError, lambda: CountingBloomFilter(10, 1.5))
+
+    @number("14.2")
+    def test_linear_probe_table(self):
+        lpt = LinearProbeTable()
+        for i in range(50):
+            lpt[str(i)] = i
+        lpt.enable_bloom()
+        # Grows several times with the filter on.
+        for i in range(50, 2000):
+            lpt[str(i)] = i
+        # The filter doubles its own room as it fills, rather than following the table.
+        self.assertEqual(lpt.bloom.capacity, (193 // 2 + 1) * 2 ** 5)
+        self.assertEqual(lpt.bloom.count, 2000)
+        self.assertTrue(all(lpt.contains_many(str(i) for i in range(2000))))
+        for i in range(0, 2000, 2):
+            del lpt[str(i)]
+        for i in range(2000):
+            self.assertEqual(str(i) in lpt, i % 2 == 1)
+        for i in range(2000, 4000):
+            self.assertNotIn(str(i), lpt)
+        self.assertGreater(lpt.bloom.rejections, 2000)
+        self.assertLess(lpt.bloom.observed_false_positive_rate(), 0.05)
+
+        # Resizing the table, incrementally or not, leaves a filter with room alone.
+        for table in [LinearProbeTable(), LinearProbeTable(rehash_step=4)]:
+            table.enable_bloom(capacity=5000)
+            bloom = table.bloom
+            for i in range(4000):
+                table[str(i)] = i
+            for i in range(4000):
+                del table[str(i)]
+            self.assertLess(table.table_size, 769)
+            self.assertIs(table.bloom, bloom)
+            self.assertEqual(bloom.count, 0)
+
+        lpt.enable_stats()
+        self.assertIn("bloom_false_positive_rate", lpt.stats_snapshot())
+        lpt.disable_bloom()
+        self.assertNotIn("bloom_false_positive_rate", lpt.stats_snapshot())
+        self.assertIn("1", lpt)
+
+    @number("14.3")
+    def test_robin_hood_table(self):
+        rh = RobinHoodTable()
+        rh.enable_bloom()
+        for i in range(300):
+            rh[str(i)] = i
+        for i in range(100):
+            del rh[str(i)]
+        self.assertEqual(rh.bloom.count, 200)
+        for i in range(300):
+            self.assertEqual(str(i) in rh, i >= 100)
+
+    @number("14.4")
+    def test_infinite_hash_table(self):
+        iht = InfiniteHashTable()
+        iht["lin"] = 1
+        iht.enable_bloom()
+        self.assertEqual(iht.bloom.capacity, InfiniteHashTable.TABLE_SIZE)
+        words = ["lin", "leg", "linked", "limp", "mine", "ms", "mine" + "s"] + ["w" + str(i) for i in range(100)]
+        for i, word in enumerate(words):
+            iht[word] = i
+        self.assertGreaterEqual(iht.bloom.capacity, len(words))
+        self.assertEqual(iht.bloom.count, len(words))
+        self.assertEqual(len(iht), len(words))
+        # Inserts, including updates of nested keys, don't count as lookups.
+        iht["linked"] = -1
+        self.assertEqual(len(iht), len(words))
+        self.assertEqual((iht.bloom.rejections, iht.bloom.false_positives), (0, 0))
+        for word in words:
+            self.assertIn(word, iht)
+        del iht["limp"]
+        self.assertNotIn("limp", iht)
+        self.assertNotIn("lonely", iht)
+        self.assertEqual(iht.bloom.count, len(words) - 1)
+
+    @number("14.5")
+    def test_double_key_table(self):
+        dt = DoubleKeyTable()
+        dt.enable_bloom()
+        dt["Tim", "Jen"] = 1
+        self.assertEqual(dt.bloom.count, 1)
+        self.assertIn(("Tim", "Jen"), dt.bloom)
+        # Turned away by the filter, before any probing.
+        self.assertNotIn(("Amy", "Ben"), dt)
+        self.assertEqual(dt.bloom.rejections, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+import unittest
+from ed_utils.decorators import number
+
+from data_structures.bounded_cache import LRUCache, ClockCache, memoize
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestBoundedCache(unittest.TestCase):
+
+    @number("18.1")
+    def test_lru(self):
+        cache = LRUCache(3)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.put("c", 3)
+        self.assertEqual(cache.get("a"), 1)
+        cache.put("d", 4)       # b is the least recently used
+        self.assertNotIn("b", cache)
+        self.assertEqual(cache["a"], 1)
+        cache["c"] = 30         # c is now the most recent
+        cache.put("e", 5)       # evicts d
+        self.assertEqual(sorted(cache.index.keys()), ["a", "c", "e"])
+        self.assertRaises(KeyError, lambda: cache["d"])
+        self.assertIsNone(cache.get("b"))
+        del cache["a"]
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.stats(), {"hits": 2, "misses": 2, "evictions": 2, "expirations": 0, "hit_rate": 0.5})
+        self.assertRaises(ValueError, lambda: LRUCache(0))
+
+    @number("18.2")
+    def test_clock(self):
+        cache = ClockCache(3)
+        for key in "abc":
+            cache.put(key, key)
+        # The hand clears every bit, then evicts a.
+        cache.put("d", "d")
+        self.assertNotIn("a", cache)
+        cache.get("b")
+        # b was used since, so the hand passes it and evicts c.
+        cache.put("e", "e")
+        self.assertEqual(sorted(cache.index.keys()), ["b", "d", "e"])
+        del cache["d"]
+        cache.put("f", "f")
+        self.assertEqual(cache.evictions, 2)
+        self.assertEqual(sorted(cache.index.keys()), ["b", "e", "f"])
+
+    @number("18.3")
+    def test_ttl(self):
+        clock = FakeClock()
+        for cache in (LRUCache(10, ttl=5, clock=clock), ClockCache(10, ttl=5, clock=clock)):
+            clock.now = 0
+            cache.put("a", 1)
+            clock.now = 3
+            cache.put("b", 2)
+            self.assertEqual(cache["a"], 1)
+            clock.now = 5
+            self.assertNotIn("a", cache)
+            self.assertIsNone(cache.get("a"))
+            self.assertEqual(cache.get("b"), 2)
+            self.assertEqual(cache.expirations, 1)
+            self.assertEqual(len(cache), 1)
+
+    @number("18.4")
+    def test_no_rehash(self):
+        for cache in (LRUCache(1000), ClockCache(1000)):
+            cache.index.enable_stats()
+            size = cache.index.table_size
+            for i in range(20000):
+                cache.put(i % 3000, i)
+                cache.get((i * 7) % 3000)
+            for i in range(1000):
+                cache.put(-i, i)
+                del cache[-i]
+            self.assertEqual(cache.index.stats.rehashes, 0)
+            self.assertEqual(cache.index.table_size, size)
+            self.assertEqual(len(cache), 999)
+            # Emptying the cache doesn't shrink the index either.
+            for key in cache.index.keys():
+                del cache[key]
+            self.assertEqual(cache.index.table_size, size)
+
+    @number("18.5")
+    def test_memoize(self):
+        calls = []
+
+        @memoize(LRUCache(2))
+        def route_cost(start, end):
+            calls.append((start, end))
+            return end - start
+
+        self.assertEqual(route_cost(1, 4.5), 3.5)
+        self.assertEqual(route_cost(1, 4.5), 3.5)
+        route_cost(2, 3)
+        route_cost(3, 4)
+        route_cost(1, 4.5)
+        self.assertEqual(calls, [(1, 4.5), (2, 3), (3, 4), (1, 4.5)])
+        self.assertEqual(route_cost.cache.hits, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+import random
+import unittest
+from ed_utils.decorators import number
+
+from data_structures.columnar_hash_table import ColumnarProbeTable
+from data_structures.table_stats import largest_cluster
+
+
+class TestColumnarProbeTable(unittest.TestCase):
+
+    @number("9.1")
+    def test_example(self):
+        class TestingCPT(ColumnarProbeTable):
+            def full_hash(self, k):
+                return ord(k[0])
+
+        # Disable resizing / rehashing.
+        cpt = TestingCPT(sizes=[10])
+        cpt["h1"] = 1   # h -> 4
+        cpt["h2"] = 2   # h -> 4, probed to 5
+        cpt["i1"] = 3   # i -> 5, probed to 6
+        cpt["k1"] = 4   # k -> 7
+        self.assertEqual(cpt._linear_probe("i1", False), 6)
+        cpt["h2"] = 20
+        self.assertEqual(cpt["h2"], 20)
+        self.assertEqual(len(cpt), 4)
+
+        del cpt["h1"]
+        self.assertEqual(cpt._linear_probe("h2", False), 4)
+        self.assertEqual(cpt._linear_probe("i1", False), 5)
+        self.assertEqual(cpt._linear_probe("k1", False), 7)
+        self.assertEqual(cpt.used, bytearray([0, 0, 0, 0, 1, 1, 0, 1, 0, 0]))
+        self.assertIsNone(cpt.key_array[6])
+        self.assertRaises(KeyError, lambda: cpt["h1"])
+        self.assertEqual(str(cpt), "(h2,20)\n(i1,3)\n(k1,4)\n")
+
+    @number("9.2")
+    def test_random(self):
+        rng = random.Random(1008)
+        cpt = ColumnarProbeTable()
+        expected = {}
+        for _ in range(5000):
+            key = str(rng.randrange(2000))
+            if key in expected and rng.random() < 0.4:
+                del cpt[key]
+                del expected[key]
+            else:
+                cpt[key] = expected[key] = rng.random()
+        self.assertEqual(len(cpt), len(expected))
+        self.assertEqual(sorted(cpt.keys()), sorted(expected))
+        self.assertEqual(sorted(cpt.values()), sorted(expected.values()))
+        for key in map(str, range(2000)):
+            self.assertEqual(key in cpt, key in expected)
+
+        cpt.update((str(i), i) for i in range(2000, 5000))
+        self.assertEqual(cpt.get_many(["2000", "4999"]), [2000, 4999])
+        self.assertEqual(cpt.contains_many(["1999x", "3000"]), [False, True])
+
+    @number("9.3")
+    def test_typed_values(self):
+        cpt = ColumnarProbeTable(value_type="float64")
+        for i in range(1000):
+            cpt[str(i)] = i / 4
+        for i in range(0, 1000, 2):
+            del cpt[str(i)]
+        self.assertEqual(sorted(cpt.values()), [i / 4 for i in range(1, 1000, 2)])
+        self.assertEqual(cpt["999"], 249.75)
+        self.assertEqual(cpt.value_array.itemsize, 8)
+        self.assertRaises(TypeError, lambda: cpt.__setitem__("x", "not a number"))
+
+    @number("9.4")
+    def test_consecutive_ints(self):
+        cpt = ColumnarProbeTable()
+        for i in range(5000):
+            cpt[i] = i
+        # Unmixed, the keys would hash to themselves and fill one run of 5000 slots.
+        self.assertLess(largest_cluster(map(bool, cpt.used)), 100)
+        for i in range(5000):
+            del cpt[i]
+        self.assertEqual(len(cpt), 0)
+        self.assertNotIn(0, cpt)
+
+    @number("9.5")
+    def test_typed_value_rejected(self):
+        cpt = ColumnarProbeTable(value_type="int64")
+        self.assertRaises(TypeError, lambda: cpt.__setitem__("a", 1.5))
+        self.assertEqual(len(cpt), 0)
+        self.assertNotIn("a", cpt)
+        self.assertRaises(KeyError, lambda: cpt["a"])
+        cpt["a"] = 1
+        self.assertRaises(OverflowError, lambda: cpt.__setitem__("a", 2 ** 64))
+        self.assertEqual(cpt["a"], 1)
+        self.assertEqual(len(cpt), 1)
+
+    @number("9.6")
+    def test_delete_from_full(self):
+        keys = [str(i) for i in range(5)]
+        for value_type in (None, "int64"):
+            for deleted in keys:
+                table = ColumnarProbeTable(sizes=[5], value_type=value_type)
+                for i, key in enumerate(keys):
+                    table[key] = i
+                self.assertEqual(len(table), table.table_size)
+                del table[deleted]
+                self.assertNotIn(deleted, table)
+                for i, key in enumerate(keys):
+                    if key != deleted:
+                        self.assertEqual(table[key], i)
+                for key in keys:
+                    if key != deleted:
+                        del table[key]
+                self.assertEqual(len(table), 0)
@@ -0,0 +1,88 @@
+import unittest
+from ed_utils.decorators import number
+
+from composite_key_table import CompositeKeyTable
+from double_key_table import DoubleKeyTable
+
+
+class TestCompositeKeyTable(unittest.TestCase):
+
+    PAIRS = [("Tim", "Jen"), ("Amy", "Ben"), ("May", "Ben"), ("Ivy", "Jen"),
+             ("May", "Tom"), ("Tim", "Bob"), ("May", "Jim"), ("Het", "Liz")]
+
+    @number("23.1")
+    def test_same_as_nested(self):
+        ct = CompositeKeyTable()
+        dt = DoubleKeyTable()
+        for value, pair in enumerate(self.PAIRS, 1):
+            ct[pair] = value
+            dt[pair] = value
+
+        self.assertEqual(len(ct), len(dt))
+        self.assertEqual(set(ct.keys()), set(dt.keys()))
+        self.assertEqual(set(ct.values()), set(dt.values()))
+        for key1 in dt.keys():
+            self.assertEqual(sorted(ct.keys(key1)), sorted(dt.keys(key1)))
+            self.assertEqual(sorted(ct.values(key1)), sorted(dt.values(key1)))
+        self.assertEqual(sorted(str(ct).splitlines()), sorted(str(dt).splitlines()))
+
+        self.assertEqual(ct["May", "Tom"], 5)
+        ct["May", "Tom"] = 9
+        self.assertEqual(ct["May", "Tom"], 9)
+        self.assertEqual(ct.keys("May"), ["Ben", "Tom", "Jim"])
+        self.assertIn(("Het", "Liz"), ct)
+        self.assertNotIn(("Het", "Ben"), ct)
+        self.assertRaises(KeyError, lambda: ct["Het", "Ben"])
+        self.assertRaises(KeyError, lambda: ct.keys("Bob"))
+
+    @number("23.2")
+    def test_delete(self):
+        ct = CompositeKeyTable()
+        for value, pair in enumerate(self.PAIRS, 1):
+            ct[pair] = value
+        del ct["May", "Ben"]
+        self.assertEqual(ct.keys("May"), ["Tom", "Jim"])
+        self.assertEqual(len(ct), 5)
+
+        del ct["Het", "Liz"]
+        self.assertEqual(len(ct), 4)
+        self.assertNotIn("Het", ct.keys())
+        self.assertRaises(KeyError, lambda: ct.values("Het"))
+        self.assertRaises(KeyError, lambda: ct.__delitem__(("Het", "Liz")))
+
+        ct["Het", "Liz"] = 10
+        self.assertEqual(ct.values("Het"), [10])
+
+    @number("23.3")
+    def test_stats_bloom(self):
+        ct = CompositeKeyTable()
+        ct.enable_stats()
+        ct.enable_bloom()
+        for i in range(1000):
+            ct[str(i % 100), str(i)] = i
+        self.assertEqual(len(ct), 100)
+        self.assertEqual(len(ct.pairs), 1000)
+        self.assertEqual(ct.values("7"), list(range(7, 1000, 100)))
+        self.assertNotIn(("7", "8"), ct)
+        snapshot = ct.stats_snapshot()
+        self.assertEqual(snapshot["top"]["count"], 1000)
+        self.assertEqual(snapshot["internal"]["count"], 100)
+        self.assertEqual(ct.bloom.count, 1000)
+
+
+    @number("23.4")
+    def test_constructor(self):
+        # Same positional arguments as a DoubleKeyTable.
+        ct = CompositeKeyTable([5, 13], [5, 13])
+        dt = DoubleKeyTable([5, 13], [5, 13])
+        for table in (ct, dt):
+            table["a", "b"] = 1
+            table["c", "d"] = 2
+        self.assertEqual(ct.index.TABLE_SIZES, [5, 13])
+        self.assertEqual(sorted(ct.values()), sorted(dt.values()))
+        self.assertEqual(CompositeKeyTable(internal_sizes=[29]).index.table_size, 29)
+        self.assertEqual(CompositeKeyTable(expected_size=1000).table_size, 3079)
+        self.assertRaises(TypeError, lambda: CompositeKeyTable(None, None, 1000))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import threading
+import unittest
+from ed_utils.decorators import number
+
+from data_structures.concurrent_hash_table import ConcurrentTable
+
+
+class TestConcurrentTable(unittest.TestCase):
+
+    @number("17.1")
+    def test_mapping(self):
+        table = ConcurrentTable(shard_count=4)
+        table.update((str(i), i) for i in range(200))
+        table["7"] = "seven"
+        del table["8"]
+        self.assertEqual(len(table), 199)
+        self.assertEqual(table["7"], "seven")
+        self.assertNotIn("8", table)
+        self.assertIsNone(table.get("8"))
+        self.assertEqual(table.setdefault("8", 8), 8)
+        self.assertEqual(table.setdefault("8", 9), 8)
+        self.assertRaises(KeyError, lambda: table["200"])
+        self.assertEqual(sorted(table.keys(), key=int), [str(i) for i in range(200)])
+        self.assertEqual(table.contains_many(["1", "200"]), [True, False])
+        self.assertRaises(ValueError, lambda: ConcurrentTable(shard_count=6))
+
+    @number("17.2")
+    def test_shards(self):
+        table = ConcurrentTable(shard_count=8, expected_size=8000)
+        self.assertEqual(table.shards[0].table_size, 3079)
+        # Consecutive ints spread over every shard, and each shard grows alone.
+        for i in range(8000):
+            table[i] = i
+        sizes = [len(shard) for shard in table.shards]
+        self.assertEqual(sum(sizes), 8000)
+        self.assertGreater(min(sizes), 800)
+        self.assertEqual(set(table.values()), set(range(8000)))
+        # Keys of one shard still spread over the whole shard.
+        shard = table.shards[0]
+        shard.enable_stats()
+        self.assertTrue(all(shard.contains_many(shard.keys())))
+        self.assertLess(max(shard.stats.hit_probes), 10)
+        # Emptying the table keeps every shard at its expected size.
+        for i in range(8000):
+            del table[i]
+        self.assertEqual({shard.table_size for shard in table.shards}, {3079})
+
+    @number("17.3")
+    def test_threads(self):
+        table = ConcurrentTable(shard_count=4)
+
+        def work(thread):
+            for i in range(1000):
+                table[thread, i] = i
+                table.setdefault("shared", thread)
+            for i in range(0, 1000, 2):
+                del table[thread, i]
+
+        threads = [threading.Thread(target=work, args=(thread,)) for thread in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(table), 8 * 500 + 1)
+        for thread in range(8):
+            for i in range(1000):
+                self.assertEqual((thread, i) in table, i % 2 == 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
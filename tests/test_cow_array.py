@@ -0,0 +1,46 @@
+import unittest
+from ed_utils.decorators import number
+
+from data_structures.cow_array import CowArray
+
+
+class TestCowArray(unittest.TestCase):
+
+    @number("15.1")
+    def test_array(self):
+        array = CowArray(150)
+        self.assertEqual(len(array), 150)
+        self.assertEqual([len(chunk) for chunk in array.chunks], [64, 64, 22])
+        for i in range(150):
+            array[i] = i
+        self.assertEqual(list(array), list(range(150)))
+        self.assertRaises(IndexError, lambda: array[150])
+        self.assertRaises(ValueError, lambda: CowArray(0))
+
+    @number("15.2")
+    def test_freeze(self):
+        array = CowArray(150)
+        for i in range(150):
+            array[i] = i
+        view = array.freeze()
+        self.assertIs(view.chunks, array.chunks)
+
+        array[70] = "x"
+        # Only the written chunk is copied.
+        self.assertIsNot(view.chunks, array.chunks)
+        self.assertIs(view.chunks[0], array.chunks[0])
+        self.assertIsNot(view.chunks[1], array.chunks[1])
+        self.assertEqual(view[70], 70)
+        self.assertEqual(array[70], "x")
+
+        second = array.freeze()
+        array[0] = "y"
+        self.assertEqual(list(view), list(range(150)))
+        self.assertEqual(second[0], 0)
+        self.assertEqual(second[70], "x")
+        self.assertRaises(TypeError, lambda: view.__setitem__(0, None))
+        self.assertIs(view.freeze(), view)
+
+
+if __name__ == '__main__':
+    unittest.main()
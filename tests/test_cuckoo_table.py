@@ -0,0 +1,90 @@
+import random
+import unittest
+from ed_utils.decorators import number
+
+from data_structures.cuckoo_table import CuckooTable
+from data_structures.hash_table import FullError
+
+
+class TestCuckooTable(unittest.TestCase):
+
+    @number("12.1")
+    def test_example(self):
+        class TestingCT(CuckooTable):
+            def _buckets(self, full_hash):
+                # Every key may go in bucket 0 or 1.
+                return [0, 1]
+
+        # Disable resizing / rehashing.
+        ct = TestingCT(sizes=[3], bucket_size=2, seed=1008)
+        for key in "abcd":
+            ct[key] = key.upper()
+        self.assertEqual(len(ct), 4)
+        self.assertEqual(ct.get_many("abcd"), list("ABCD"))
+        self.assertIsNone(ct.array[4])
+
+        # No room left in either bucket, and nowhere to grow.
+        self.assertRaises(FullError, lambda: ct.__setitem__("e", "E"))
+        self.assertEqual(sorted(ct.items()), [("a", "A"), ("b", "B"), ("c", "C"), ("d", "D")])
+        self.assertNotIn("e", ct)
+
+        del ct["b"]
+        ct["e"] = "E"
+        ct["a"] = "AA"
+        self.assertEqual(ct["a"], "AA")
+        self.assertEqual(set(ct.keys()), set("acde"))
+        self.assertRaises(KeyError, lambda: ct["b"])
+
+    @number("12.2")
+    def test_random(self):
+        rng = random.Random(1008)
+        ct = CuckooTable(seed=1008)
+        expected = {}
+        for _ in range(5000):
+            key = str(rng.randrange(2000))
+            if key in expected and rng.random() < 0.4:
+                del ct[key]
+                del expected[key]
+            else:
+                ct[key] = expected[key] = rng.random()
+        self.assertEqual(len(ct), len(expected))
+        self.assertLessEqual(len(ct), ct.table_size * ct.MAX_LOAD)
+        self.assertEqual(sorted(ct.keys()), sorted(expected))
+        for key in map(str, range(2000)):
+            self.assertEqual(key in ct, key in expected)
+
+        self.assertRaises(ValueError, lambda: CuckooTable(hash_count=1))
+        ct = CuckooTable(hash_count=4, bucket_size=1)
+        ct.update((i, i) for i in range(1000))
+        self.assertEqual(ct.get_many(range(1000)), list(range(1000)))
+
+    @number("12.3")
+    def test_last_size(self):
+        class CountingList(list):
+            scans = 0
+            def __iter__(self):
+                self.scans += 1
+                return super().__iter__()
+
+        class TestingCT(CuckooTable):
+            def _buckets(self, full_hash):
+                # Every key may go in bucket 0 or 1, whatever the size.
+                return [0, 1]
+
+        ct = TestingCT(sizes=[3, 5, 7], bucket_size=2, seed=1008)
+        for key in "abcd":
+            ct[key] = key.upper()
+        # Each size is tried in turn, and the last one raises.
+        self.assertRaises(FullError, lambda: ct.__setitem__("e", "E"))
+        self.assertEqual(ct.table_size, 14)
+        self.assertEqual(sorted(ct.keys()), list("abcd"))
+
+        # Out of sizes, a failing insert no longer gathers every entry to try again.
+        ct = TestingCT(sizes=[5], bucket_size=2, seed=1008)
+        ct.array = CountingList(ct.array)
+        for key in "abcd":
+            ct[key] = key.upper()
+        self.assertRaises(FullError, lambda: ct.__setitem__("e", "E"))
+        self.assertRaises(FullError, lambda: ct.__setitem__("f", "F"))
+        self.assertEqual(ct.array.scans, 0)
+        self.assertEqual(ct.get_many("abcd"), list("ABCD"))
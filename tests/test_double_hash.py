@@ -136,3 +136,32 @@ class TestDoubleHash(unittest.TestCase):
         # with an iterator.
         self.assertRaises(BaseException, lambda: next(key_iterator))
         self.assertRaises(BaseException, lambda: next(value_iterator))
+
+    @number("3.6")
+    def test_stats(self):
+        dt = DoubleKeyTable()
+        dt.enable_stats()
+        for i in range(300):
+            dt[str(i), "x"] = i
+        snapshot = dt.stats_snapshot()
+        self.assertEqual(snapshot["top"]["table_size"], 769)
+        # 5 -> 13 -> ... -> 769
+        self.assertEqual(snapshot["top"]["rehashes"], 7)
+        self.assertGreater(snapshot["top"]["rehash_seconds"], 0)
+        self.assertEqual(dt["150", "x"], 150)
+
+    @number("3.7")
+    def test_internal_stats(self):
+        dt = DoubleKeyTable()
+        dt.enable_stats()
+        for i in range(50):
+            dt["key", str(i)] = i
+        before = sum(dt.internal_stats.hit_probes.values())
+        misses = sum(dt.internal_stats.miss_probes.values())
+        for i in range(50):
+            self.assertEqual(dt["key", str(i)], i)
+            self.assertIn(("key", str(i)), dt)
+        self.assertNotIn(("key", "absent"), dt)
+        # Each get and `in` check probes the bottom-level table once.
+        self.assertEqual(sum(dt.internal_stats.hit_probes.values()) - before, 100)
+        self.assertEqual(sum(dt.internal_stats.miss_probes.values()) - misses, 1)
@@ -0,0 +1,372 @@
+import json
+import unittest
+from ed_utils.decorators import number
+
+from data_structures.hash_table import LinearProbeTable
+
+
+class TestLinearProbeTable(unittest.TestCase):
+
+    @number("7.1")
+    def test_bulk(self):
+        class CountingLPT(LinearProbeTable):
+            rehashes = 0
+            def _rehash(self):
+                self.rehashes += 1
+                super()._rehash()
+
+        lpt = CountingLPT()
+        lpt["zero"] = 0
+        lpt.update((str(i), i) for i in range(1000))
+        # Sized once for the whole batch, no rehash cascade.
+        self.assertEqual(lpt.rehashes, 0)
+        self.assertEqual(lpt.table_size, 3079)
+        self.assertEqual(len(lpt), 1001)
+
+        self.assertEqual(lpt.get_many(["zero", "10", "999"]), [0, 10, 999])
+        self.assertRaises(KeyError, lambda: lpt.get_many(["1", "missing"]))
+        self.assertEqual(lpt.contains_many(["zero", "missing", "500"]), [True, False, True])
+
+        # Updating existing keys does not change the count.
+        lpt.update([("1", "one"), ("new", 1)])
+        self.assertEqual(len(lpt), 1002)
+        self.assertEqual(lpt["1"], "one")
+
+    @number("7.2")
+    def test_store_hashes(self):
+        class CountingLPT(LinearProbeTable):
+            hashed = 0
+            def full_hash(self, key):
+                self.hashed += 1
+                return super().full_hash(key)
+
+        lpt = CountingLPT(store_hashes=True)
+        for i in range(200):
+            lpt[str(i)] = i
+        # Every rehash reused the stored hashes.
+        self.assertEqual(lpt.hashed, 200)
+        self.assertEqual(lpt.table_size, 769)
+
+        for i in range(0, 200, 2):
+            del lpt[str(i)]
+        self.assertEqual(len(lpt), 100)
+        self.assertNotIn("0", lpt)
+        self.assertEqual(lpt["51"], 51)
+        self.assertEqual(set(lpt.keys()), {str(i) for i in range(1, 200, 2)})
+        self.assertEqual(sorted(lpt.values()), list(range(1, 200, 2)))
+        self.assertIn("(1,1)\n", str(lpt))
+
+    @number("7.3")
+    def test_incremental_rehash(self):
+        class CountingLPT(LinearProbeTable):
+            moved = 0
+            def _reinsert(self, item):
+                self.moved += 1
+                super()._reinsert(item)
+
+        lpt = CountingLPT(rehash_step=4)
+        most_moved = 0
+        for i in range(2000):
+            lpt.moved = 0
+            lpt[str(i)] = i
+            most_moved = max(most_moved, lpt.moved)
+            if i % 7 == 0:
+                self.assertEqual(lpt[str(i // 2)], i // 2)
+        # Each write moved at most rehash_step slots plus its own key.
+        self.assertLessEqual(most_moved, 5)
+        self.assertIsNotNone(lpt.old_array)
+        self.assertEqual(len(lpt), 2000)
+        self.assertEqual(sorted(lpt.values()), list(range(2000)))
+
+        for i in range(0, 2000, 3):
+            del lpt[str(i)]
+        self.assertNotIn("3", lpt)
+        self.assertTrue(all(lpt.contains_many(str(i) for i in range(1, 2000, 3))))
+        self.assertIsNone(lpt.old_array)
+        self.assertEqual(len(lpt.keys()), len(lpt))
+
+        # A step of 2 empties the old array by the next growth, near enough
+        # that no write moves more than a handful of slots.
+        lpt = CountingLPT(rehash_step=2)
+        most_moved = 0
+        for i in range(20000):
+            lpt.moved = 0
+            lpt[str(i)] = i
+            most_moved = max(most_moved, lpt.moved)
+        self.assertLess(most_moved, 20)
+        self.assertRaises(ValueError, lambda: LinearProbeTable(rehash_step=1))
+        self.assertRaises(ValueError, lambda: LinearProbeTable(rehash_step=-1))
+
+    @number("7.4")
+    def test_delete(self):
+        class TestingLPT(LinearProbeTable):
+            def hash(self, k):
+                return ord(k[0]) % self.table_size
+
+        # Disable resizing / rehashing.
+        lpt = TestingLPT(sizes=[10])
+        lpt["h1"] = 1   # h -> 4
+        lpt["h2"] = 2   # h -> 4, probed to 5
+        lpt["i1"] = 3   # i -> 5, probed to 6
+        lpt["f1"] = 4   # f -> 2
+        lpt["g1"] = 5   # g -> 3
+        lpt["k1"] = 6   # k -> 7
+        lpt["c1"] = 7   # c -> 9
+        lpt["c2"] = 8   # c -> 9, wraps to 0
+        lpt["d1"] = 9   # d -> 0, probed to 1
+
+        del lpt["h1"]
+        # h2 and i1 move back, k1 is already home.
+        self.assertEqual(lpt._linear_probe("h2", False), 4)
+        self.assertEqual(lpt._linear_probe("i1", False), 5)
+        self.assertIsNone(lpt.array[6])
+        self.assertEqual(lpt._linear_probe("k1", False), 7)
+
+        del lpt["c1"]
+        # Repairs across the wrap around.
+        self.assertEqual(lpt._linear_probe("c2", False), 9)
+        self.assertEqual(lpt._linear_probe("d1", False), 0)
+        self.assertIsNone(lpt.array[1])
+        self.assertEqual(lpt._linear_probe("f1", False), 2)
+        self.assertEqual(len(lpt), 7)
+        self.assertRaises(KeyError, lambda: lpt.__delitem__("c1"))
+
+    @number("7.5")
+    def test_delete_stored_hashes(self):
+        class CountingLPT(LinearProbeTable):
+            hashed = 0
+            def full_hash(self, key):
+                self.hashed += 1
+                return super().full_hash(key)
+
+        lpt = CountingLPT(sizes=[101], store_hashes=True)
+        for i in range(90):
+            lpt[str(i)] = i
+        lpt.hashed = 0
+        for i in range(0, 90, 2):
+            del lpt[str(i)]
+        # Only the deleted keys are hashed, the clusters use stored hashes.
+        self.assertEqual(lpt.hashed, 45)
+        self.assertEqual(sorted(lpt.values()), list(range(1, 90, 2)))
+        for i in range(1, 90, 2):
+            self.assertEqual(lpt[str(i)], i)
+
+    @number("7.6")
+    def test_stats(self):
+        class TestingLPT(LinearProbeTable):
+            def hash(self, k):
+                return ord(k[0]) % self.table_size
+
+        lpt = TestingLPT(sizes=[10, 20])
+        lpt["a1"] = 1       # a -> 7, 1 probe
+        self.assertIsNone(lpt.stats)
+        self.assertRaises(ValueError, lpt.stats_snapshot)
+
+        lpt.enable_stats()
+        lpt["a2"] = 2       # 2 probes
+        lpt["a3"] = 3       # 3 probes
+        self.assertEqual(lpt["a3"], 3)
+        self.assertNotIn("a4", lpt)
+        snapshot = lpt.stats_snapshot()
+        self.assertEqual(snapshot["miss_probes"], {2: 1, 3: 1, 4: 1})
+        self.assertEqual(snapshot["hit_probes"], {3: 1})
+        self.assertEqual(snapshot["operations"], {"set": 2, "get": 1, "contains": 1})
+        self.assertEqual(snapshot["largest_cluster"], 3)
+        self.assertEqual(snapshot["load_factor"], 0.3)
+        self.assertEqual(snapshot["rehashes"], 0)
+
+        for key in ["b", "c", "d"]:
+            lpt[key] = 0
+        snapshot = lpt.stats_snapshot()
+        self.assertEqual(snapshot["rehashes"], 1)
+        self.assertGreater(snapshot["rehash_seconds"], 0)
+        self.assertEqual(snapshot["table_size"], 20)
+        self.assertEqual(json.loads(json.dumps(snapshot))["operations"]["set"], 5)
+
+        lpt.disable_stats()
+        self.assertIsNone(lpt.stats)
+
+    @number("7.7")
+    def test_shrink(self):
+        for lpt in [LinearProbeTable(), LinearProbeTable(rehash_step=8)]:
+            lpt.update((str(i), i) for i in range(1000))
+            self.assertEqual(lpt.table_size, 3079)
+
+            for i in range(615):
+                del lpt[str(i)]
+            # 385 entries is still above the low-water mark.
+            self.assertEqual(lpt.table_size, 3079)
+            del lpt["615"]
+            # Smallest size with a load of at most a quarter.
+            self.assertEqual(lpt.table_size, 1543)
+            self.assertEqual(len(lpt), 384)
+            self.assertEqual(lpt["999"], 999)
+
+            # Hysteresis: re-adding a few or removing a few more does not resize.
+            for i in range(600, 616):
+                lpt[str(i)] = i
+            for i in range(600, 700):
+                del lpt[str(i)]
+            self.assertEqual(lpt.table_size, 1543)
+
+            for i in range(700, 1000):
+                del lpt[str(i)]
+            self.assertEqual(len(lpt), 0)
+            self.assertEqual(lpt.table_size, 5)
+            self.assertEqual(lpt.keys(), [])
+
+    @number("7.8")
+    def test_iters(self):
+        lpt = LinearProbeTable()
+        lpt.update((str(i), i) for i in range(100))
+
+        self.assertEqual(set(lpt), set(lpt.keys()))
+        self.assertEqual(dict(lpt.iter_items()), {str(i): i for i in range(100)})
+        self.assertEqual(sorted(lpt.items()), sorted(zip(lpt.keys(), lpt.values())))
+        self.assertEqual(next(key for key in lpt.iter_keys() if lpt[key] == 42), "42")
+
+        # These are iterators over the table, not copies of it.
+        key_iterator = lpt.iter_keys()
+        value_iterator = lpt.iter_values()
+        self.assertIn(next(key_iterator), lpt)
+        next(value_iterator)
+        for i in range(100):
+            lpt[str(i)] = -1
+        self.assertEqual(next(value_iterator), -1)
+
+    @number("7.9")
+    def test_sizing(self):
+        class CountingLPT(LinearProbeTable):
+            rehashes = 0
+            def _rehash(self):
+                self.rehashes += 1
+                super()._rehash()
+
+        lpt = CountingLPT(expected_size=1000)
+        self.assertEqual(lpt.table_size, 3079)
+        for i in range(1000):
+            lpt[str(i)] = i
+        self.assertEqual(lpt.rehashes, 0)
+
+        # Deleting never shrinks below the expected size, so refilling doesn't rehash.
+        lpt = CountingLPT(expected_size=1000)
+        lpt["a"] = lpt["b"] = 0
+        del lpt["a"]
+        self.assertEqual(lpt.table_size, 3079)
+        for i in range(1000):
+            lpt[str(i)] = i
+        self.assertEqual(lpt.rehashes, 0)
+        for i in range(1000):
+            del lpt[str(i)]
+        self.assertEqual(lpt.table_size, 3079)
+
+        # But growing past it shrinks back down to it.
+        for i in range(5000):
+            lpt[str(i)] = i
+        for i in range(5000):
+            del lpt[str(i)]
+        self.assertEqual(lpt.table_size, 3079)
+
+        # Pre-sizing with update sets no floor, so the table still shrinks.
+        lpt = CountingLPT()
+        lpt.update((str(i), i) for i in range(1000))
+        self.assertEqual(lpt.table_size, 3079)
+        for i in range(1000):
+            del lpt[str(i)]
+        self.assertLess(lpt.table_size, 3079)
+
+        class SmallLPT(LinearProbeTable):
+            TABLE_SIZES = [5, 13]
+
+        # Default sizes carry on with primes past double the last size.
+        lpt = SmallLPT()
+        lpt.update((str(i), i) for i in range(20))
+        self.assertEqual(lpt.TABLE_SIZES, [5, 13, 29, 59])
+        for i in range(20, 40):
+            lpt[str(i)] = i
+        self.assertEqual(lpt.TABLE_SIZES, [5, 13, 29, 59, 127])
+        self.assertEqual(SmallLPT.TABLE_SIZES, [5, 13])
+        self.assertEqual(SmallLPT(expected_size=100).table_size, 257)
+
+        # Given sizes are never extended.
+        lpt = LinearProbeTable(sizes=[5, 13], expected_size=100)
+        self.assertEqual(lpt.table_size, 13)
+        for i in range(10):
+            lpt[str(i)] = i
+        self.assertEqual(lpt.table_size, 13)
+
+    @number("7.10")
+    def test_key_types(self):
+        lpt = LinearProbeTable(sizes=[1543])
+        keys = list(range(500)) + [b"host-%d" % i for i in range(100)] + [(i, str(i)) for i in range(100)]
+        for key in keys:
+            self.assertTrue(0 <= lpt.hash(key) < 1543)
+            lpt[key] = key
+        self.assertEqual(lpt.get_many(keys), keys)
+        self.assertEqual(lpt.hash("abc"), LinearProbeTable(sizes=[1543]).hash("abc"))
+        self.assertNotIn((1, "2"), lpt)
+
+        # Consecutive ints are spread out rather than clustered.
+        lpt = LinearProbeTable()
+        lpt.update((i, i) for i in range(1000))
+        lpt.enable_stats()
+        self.assertTrue(all(lpt.contains_many(range(1000))))
+        self.assertLess(max(lpt.stats.hit_probes), 10)
+
+    @number("7.11")
+    def test_snapshot(self):
+        self.assertRaises(ValueError, lambda: LinearProbeTable().snapshot())
+
+        lpt = LinearProbeTable(copy_on_write=True)
+        for i in range(100):
+            lpt[str(i)] = i
+        snapshot = lpt.snapshot()
+        # Writes, deletes and rehashes after the snapshot leave it alone.
+        for i in range(100, 1000):
+            lpt[str(i)] = i
+        for i in range(50):
+            lpt[str(i)] = -i
+            del lpt[str(i + 50)]
+        self.assertEqual(len(snapshot), 100)
+        self.assertEqual(sorted(snapshot.values()), list(range(100)))
+        self.assertEqual(snapshot["0"], 0)
+        self.assertIn("99", snapshot)
+        self.assertNotIn("100", snapshot)
+        self.assertRaises(KeyError, lambda: snapshot["100"])
+        self.assertRaises(TypeError, lambda: snapshot.table.array.__setitem__(0, None))
+        self.assertEqual(lpt["0"], 0)
+        self.assertNotIn("50", lpt)
+        self.assertEqual(len(lpt), 950)
+
+        # Snapshots part way through an incremental rehash see both arrays.
+        lpt = LinearProbeTable(rehash_step=2, copy_on_write=True)
+        for i in range(200):
+            lpt[str(i)] = i
+        self.assertIsNotNone(lpt.old_array)
+        snapshot = lpt.snapshot()
+        for i in range(200):
+            lpt[str(i)] = i + 1
+        self.assertEqual(sorted(snapshot.items(), key=lambda item: item[1]), [(str(i), i) for i in range(200)])
+        for i in range(200):
+            self.assertEqual(snapshot[str(i)], i)
+            self.assertEqual(lpt[str(i)], i + 1)
+
+    @number("7.12")
+    def test_delete_from_full(self):
+        for store_hashes in (False, True):
+            keys = [str(i) for i in range(5)]
+            for deleted in keys:
+                lpt = LinearProbeTable(sizes=[5], store_hashes=store_hashes)
+                for i, key in enumerate(keys):
+                    lpt[key] = i
+                self.assertEqual(len(lpt), lpt.table_size)
+                del lpt[deleted]
+                self.assertNotIn(deleted, lpt)
+                self.assertEqual(sorted(lpt.keys()), [key for key in keys if key != deleted])
+                for i, key in enumerate(keys):
+                    if key != deleted:
+                        self.assertEqual(lpt[key], i)
+                for key in keys:
+                    if key != deleted:
+                        del lpt[key]
+                self.assertEqual(len(lpt), 0)
@@ -92,3 +92,15 @@ class TestInfiniteHash(unittest.TestCase):
             "mining"
         ]
         self.assertListEqual(res, expected)
+
+    @number("4.4")
+    def test_count(self):
+        ih = InfiniteHashTable()
+        for i in range(2000):
+            ih[str(i)] = i
+        for i in range(0, 2000, 3):
+            ih[str(i)] = -i
+        # Overwrites deep in nested tables are not counted as new keys.
+        self.assertEqual(ih.count, 2000)
+        self.assertEqual(len(ih), 2000)
+        self.assertEqual(ih["3"], -3)
@@ -0,0 +1,120 @@
+import unittest
+from ed_utils.decorators import number
+
+from data_structures.hash_table import LinearProbeTable
+from data_structures.load_tuner import LoadTuner
+from data_structures.robin_hood_table import RobinHoodTable
+
+
+class TestLoadTuner(unittest.TestCase):
+
+    @number("13.1")
+    def test_default_threshold(self):
+        # Without a tuner the table still grows past half full.
+        lpt = LinearProbeTable()
+        for i in range(3):
+            lpt[str(i)] = i
+        self.assertEqual(lpt.table_size, 13)
+        self.assertEqual(lpt.max_load, 0.5)
+        self.assertIsNone(lpt.stats)
+
+    @number("13.2")
+    def test_bounds(self):
+        self.assertRaises(ValueError, lambda: LoadTuner(min_load=0.6, max_load=0.5))
+        self.assertRaises(ValueError, lambda: LoadTuner(max_load=1))
+        self.assertRaises(ValueError, lambda: LoadTuner(target_probes=0.5))
+
+        class Colliding(LinearProbeTable):
+            def hash(self, key):
+                return 0
+
+        # Every probe is long, so the threshold falls to min_load and stays there.
+        tuner = LoadTuner(min_load=0.3, target_probes=1.5)
+        lpt = Colliding(tuner=tuner)
+        for i in range(200):
+            lpt[str(i)] = i
+        self.assertEqual(lpt.max_load, 0.3)
+        self.assertLessEqual(len(lpt), lpt.table_size * 0.3)
+        for i in range(200):
+            self.assertEqual(lpt[str(i)], i)
+
+    @number("13.3")
+    def test_latency_bound(self):
+        latency = LinearProbeTable(tuner=LoadTuner(target_probes=1.2))
+        memory = LinearProbeTable(tuner=LoadTuner(target_probes=8))
+        for i in range(5000):
+            for lpt in (latency, memory):
+                lpt[str(i)] = i
+                str(i) in lpt
+        self.assertLess(latency.max_load, memory.max_load)
+        self.assertGreater(latency.table_size, memory.table_size)
+
+    @number("13.4")
+    def test_memory_budget(self):
+        tuner = LoadTuner(max_load=0.8, max_slots=1000)
+        rh = RobinHoodTable(tuner=tuner)
+        # 769 slots is the last size under the budget, so it packs entries to 0.8 there.
+        for i in range(600):
+            rh[str(i)] = i
+        self.assertEqual(rh.table_size, 769)
+        self.assertEqual(rh.max_load, 0.8)
+        for i in range(600):
+            self.assertEqual(rh[str(i)], i)
+
+    @number("13.5")
+    def test_starting_size(self):
+        tuner = LoadTuner(target_probes=8)
+        first = LinearProbeTable(tuner=tuner)
+        for i in range(1000):
+            first[str(i)] = i
+        second = LinearProbeTable(tuner=tuner)
+        self.assertEqual(second.max_load, first.max_load)
+        # Starts big enough for everything the first table held before its last growth.
+        self.assertGreater(tuner.peak_count, 0)
+        for i in range(tuner.peak_count):
+            second[str(i)] = i
+        self.assertEqual(second.stats.rehashes, 0)
+
+    @number("13.6")
+    def test_shrink_follows_threshold(self):
+        lpt = LinearProbeTable()
+        lpt.max_load = 0.25
+        for i in range(100):
+            lpt[str(i)] = i
+        self.assertEqual(lpt.table_size, 769)
+        for i in range(50):
+            del lpt[str(i)]
+        # Half the entries left is still above a quarter of max_load.
+        self.assertEqual(lpt.table_size, 769)
+        for i in range(50, 95):
+            del lpt[str(i)]
+        self.assertEqual(lpt.table_size, 53)
+        for i in range(95, 100):
+            self.assertEqual(lpt[str(i)], i)
+
+    @number("13.7")
+    def test_stats_disabled(self):
+        tuner = LoadTuner(max_slots=400)
+        lpt = LinearProbeTable(tuner=tuner)
+        for i in range(100):
+            lpt[str(i)] = i
+        self.assertGreater(tuner.lookups_seen, 0)
+
+        lpt.disable_stats()
+        for i in range(100, 300):
+            lpt[str(i)] = i
+        # Without stats only the slot budget applies.
+        self.assertEqual(lpt.table_size, 389)
+        self.assertEqual(lpt.max_load, tuner.max_load)
+
+        # Fresh stats start a fresh window.
+        lpt.enable_stats()
+        for i in range(300, 350):
+            lpt[str(i)] = i
+        tuner.adjust(lpt)
+        self.assertEqual(tuner.lookups_seen, sum(lpt.stats.hit_probes.values()) + sum(lpt.stats.miss_probes.values()))
+        self.assertEqual([lpt[str(i)] for i in range(350)], list(range(350)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+import gc
+import os
+import tempfile
+import unittest
+import warnings
+from ed_utils.decorators import number
+
+from data_structures.mmap_hash_table import MmapProbeTable
+
+
+class TestMmapProbeTable(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "table.lpt")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    @number("10.1")
+    def test_persist(self):
+        with MmapProbeTable(self.path) as table:
+            for i in range(500):
+                table[f"host-{i}"] = {"id": i}
+            table["host-7"] = "updated"
+            self.assertEqual(len(table), 500)
+            self.assertEqual(table.table_size, 1543)
+
+        with MmapProbeTable(self.path) as table:
+            self.assertEqual(len(table), 500)
+            self.assertEqual(table["host-499"], {"id": 499})
+            self.assertEqual(table["host-7"], "updated")
+            self.assertNotIn("host-500", table)
+            self.assertRaises(KeyError, lambda: table["host-500"])
+            self.assertEqual(set(table.keys()), {f"host-{i}" for i in range(500)})
+
+            for i in range(0, 500, 2):
+                del table[f"host-{i}"]
+            self.assertRaises(KeyError, lambda: table.__delitem__("host-0"))
+
+        with MmapProbeTable(self.path, readonly=True) as table:
+            self.assertEqual(len(table), 250)
+            for i in range(500):
+                self.assertEqual(f"host-{i}" in table, i % 2 == 1)
+            self.assertEqual(table["host-1"], {"id": 1})
+            self.assertRaises(ValueError, lambda: table.__setitem__("host-0", 0))
+
+    @number("10.2")
+    def test_example(self):
+        class TestingMPT(MmapProbeTable):
+            def full_hash(self, key_bytes):
+                return key_bytes[0]
+
+        # Disable resizing / rehashing.
+        with TestingMPT(self.path, sizes=[10]) as table:
+            table["h1"] = 1   # h -> 4
+            table["h2"] = 2   # h -> 4, probed to 5
+            table["i1"] = 3   # i -> 5, probed to 6
+            self.assertEqual(table._linear_probe(b"i1", ord("i"), False), 6)
+            del table["h1"]
+            self.assertEqual(table._linear_probe(b"h2", ord("h"), False), 4)
+            self.assertEqual(table._linear_probe(b"i1", ord("i"), False), 5)
+            self.assertEqual(str(table), "(h2,2)\n(i1,3)\n")
+
+        junk = os.path.join(self.directory.name, "junk")
+        with open(junk, "wb") as f:
+            f.write(bytes(100))
+        self.assertRaises(ValueError, lambda: MmapProbeTable(junk, readonly=True))
+
+    @number("10.3")
+    def test_short_files(self):
+        for length in (0, 10):
+            short = os.path.join(self.directory.name, f"short{length}")
+            with open(short, "wb") as f:
+                f.write(b"LPTMMAP1"[:length] + bytes(max(0, length - 8)))
+            for readonly in (True, False):
+                with warnings.catch_warnings():
+                    # A leaked file handle would show up as a ResourceWarning.
+                    warnings.simplefilter("error", ResourceWarning)
+                    self.assertRaises(ValueError, lambda: MmapProbeTable(short, readonly=readonly))
+                    gc.collect()
+
+    @number("10.4")
+    def test_delete_from_full(self):
+        keys = [str(i) for i in range(10)]
+        for deleted in keys:
+            with MmapProbeTable(self.path, sizes=[10]) as table:
+                for i, key in enumerate(keys):
+                    table[key] = i
+                self.assertEqual(len(table), table.table_size)
+                del table[deleted]
+                self.assertNotIn(deleted, table)
+                for i, key in enumerate(keys):
+                    if key != deleted:
+                        self.assertEqual(table[key], i)
+                for key in keys:
+                    if key != deleted:
+                        del table[key]
+                self.assertEqual(len(table), 0)
+            os.remove(self.path)
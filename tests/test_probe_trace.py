@@ -0,0 +1,56 @@
+import unittest
+from ed_utils.decorators import number
+
+from data_structures.probe_trace import ProbeTrace, ProbeEvent
+from double_key_table import DoubleKeyTable
+
+
+class TestProbeTrace(unittest.TestCase):
+
+    @number("22.1")
+    def test_ring_buffer(self):
+        trace = ProbeTrace(3)
+        for i in range(5):
+            trace.record("k", i, i, None, 1, False)
+        self.assertEqual(len(trace), 3)
+        self.assertEqual(trace.recorded, 5)
+        self.assertEqual([event.key2 for event in trace.recent()], [2, 3, 4])
+        trace.clear()
+        self.assertEqual(trace.recent(), [])
+        self.assertRaises(ValueError, lambda: ProbeTrace(0))
+
+    @number("22.2")
+    def test_double_key_table(self):
+        class TestingDKT(DoubleKeyTable):
+            def hash1(self, k):
+                return ord(k[0]) % 12
+            def hash2(self, k, sub_table):
+                return ord(k[-1]) % 5
+
+        dt = TestingDKT(sizes=[12], internal_sizes=[5])
+        dt["Tim", "Jen"] = 1
+        self.assertIsNone(dt.trace)
+
+        dt.enable_trace(capacity=8)
+        dt["May", "Ben"] = 3
+        dt["May", "Tom"] = 5
+        self.assertEqual(dt._linear_probe("May", "Tom", False), (5, 4))
+        self.assertRaises(KeyError, lambda: dt._linear_probe("May", "Jim", False))
+        self.assertRaises(KeyError, lambda: dt._linear_probe("Amy", "Ben", False))
+        self.assertEqual(dt.trace.recent(), [
+            ProbeEvent("May", "Ben", 5, 0, 2, False),
+            ProbeEvent("May", "Tom", 5, 4, 2, False),
+            ProbeEvent("May", "Tom", 5, 4, 2, True),
+            # Jim goes past Tom and Ben in May's table.
+            ProbeEvent("May", "Jim", 5, 1, 4, False),
+            # Amy goes past May, and stops at the top level.
+            ProbeEvent("Amy", "Ben", 6, None, 2, False),
+        ])
+
+        dt.disable_trace()
+        self.assertEqual(dt["May", "Tom"], 5)
+        self.assertIsNone(dt.trace)
+
+
+if __name__ == '__main__':
+    unittest.main()
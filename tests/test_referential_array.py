@@ -0,0 +1,59 @@
+import unittest
+from ed_utils.decorators import number
+
+from data_structures.referential_array import ArrayR
+
+
+class TestArrayR(unittest.TestCase):
+
+    @number("20.1")
+    def test_construct_and_iterate(self):
+        array = ArrayR(3000)
+        self.assertEqual(list(array), [None] * 3000)
+        array = ArrayR.from_iterable(range(3000))
+        self.assertEqual(len(array), 3000)
+        self.assertEqual(list(array), list(range(3000)))
+        # Iteration is live, not over a copy.
+        iterator = iter(array)
+        next(iterator)
+        array[1] = "x"
+        self.assertEqual(next(iterator), "x")
+        self.assertEqual(array[2999], 2999)
+        self.assertRaises(ValueError, lambda: ArrayR.from_iterable([]))
+        self.assertRaises(ValueError, lambda: ArrayR(0))
+
+    @number("20.2")
+    def test_slices(self):
+        array = ArrayR.from_iterable("abcdef")
+        self.assertEqual(array[1:4], ["b", "c", "d"])
+        self.assertEqual(array[::2], ["a", "c", "e"])
+        array[1:3] = "XY"
+        array[4:6] = (item for item in [5, 6])
+        self.assertEqual(list(array), ["a", "X", "Y", "d", 5, 6])
+        self.assertRaises(ValueError, lambda: array.__setitem__(slice(0, 2), [1]))
+
+    @number("20.3")
+    def test_fill_copy_resize(self):
+        array = ArrayR(6)
+        array.fill(0)
+        array.fill(1, 2, 4)
+        self.assertEqual(list(array), [0, 0, 1, 1, 0, 0])
+        array.fill(2, 5, 100)
+        self.assertEqual(array[5], 2)
+
+        src = ArrayR.from_iterable("abcd")
+        array.copy_from(src, 1, 3, dest=4)
+        self.assertEqual(list(array), [0, 0, 1, 1, "b", "c"])
+        array.copy_from(src)
+        self.assertEqual(list(array), ["a", "b", "c", "d", "b", "c"])
+        self.assertRaises(ValueError, lambda: array.copy_from(src, dest=3))
+
+        array.resize(8)
+        self.assertEqual(list(array), ["a", "b", "c", "d", "b", "c", None, None])
+        array.resize(2)
+        self.assertEqual(list(array), ["a", "b"])
+        self.assertRaises(ValueError, lambda: array.resize(0))
+
+
+if __name__ == '__main__':
+    unittest.main()
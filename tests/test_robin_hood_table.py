@@ -0,0 +1,89 @@
+import random
+import unittest
+from ed_utils.decorators import number
+
+from data_structures.hash_table import FullError
+from data_structures.robin_hood_table import RobinHoodTable
+
+
+class TestRobinHoodTable(unittest.TestCase):
+
+    def assertOrdered(self, table):
+        """ Along every cluster, entries are no closer to home than the one before. """
+        size = table.table_size
+        for position in range(size):
+            item = table.array[position]
+            before = table.array[(position - 1) % size]
+            if item is not None and before is not None:
+                self.assertLessEqual((position - item[2]) % size, (position - 1 - before[2]) % size + 1)
+
+    @number("8.1")
+    def test_example(self):
+        class TestingRHT(RobinHoodTable):
+            def full_hash(self, k):
+                return ord(k[0])
+
+        # Disable resizing / rehashing.
+        rh = TestingRHT(sizes=[10])
+        rh["aa"] = 1    # a -> 7
+        rh["ab"] = 2    # a -> 7, pushed to 8
+        rh["ib"] = 3    # i -> 5
+        rh["hb"] = 4    # h -> 4
+        rh["ac"] = 5    # a -> 7, pushed to 9
+        rh["hc"] = 6    # h -> 4, takes 5 from ib which is closer to home.
+        self.assertEqual(rh._linear_probe("hc", False), 5)
+        self.assertEqual(rh._linear_probe("ib", False), 6)
+        self.assertEqual(rh._linear_probe("aa", False), 7)
+        self.assertEqual(rh._linear_probe("ac", False), 9)
+        self.assertNotIn("hz", rh)
+        self.assertRaises(KeyError, lambda: rh["az"])
+
+        del rh["hb"]
+        self.assertEqual(rh._linear_probe("hc", False), 4)
+        self.assertEqual(rh._linear_probe("ib", False), 5)
+        # aa is home, so the shift stops before it.
+        self.assertIsNone(rh.array[6])
+        self.assertEqual(rh._linear_probe("aa", False), 7)
+        rh["ab"] = 20
+        self.assertEqual(rh["ab"], 20)
+        self.assertEqual(len(rh), 5)
+
+        for key in "bcdef":
+            rh[key] = 0
+        self.assertTrue(rh.is_full())
+        self.assertRaises(FullError, lambda: rh.__setitem__("zz", 0))
+
+    @number("8.2")
+    def test_random(self):
+        rng = random.Random(1008)
+        rh = RobinHoodTable()
+        expected = {}
+        for _ in range(5000):
+            key = str(rng.randrange(2000))
+            if key in expected and rng.random() < 0.4:
+                del rh[key]
+                del expected[key]
+            else:
+                rh[key] = expected[key] = rng.random()
+        self.assertOrdered(rh)
+        self.assertEqual(len(rh), len(expected))
+        self.assertEqual(sorted(rh.keys()), sorted(expected))
+        for key in map(str, range(2000)):
+            self.assertEqual(key in rh, key in expected)
+
+    @number("8.3")
+    def test_delete_from_full(self):
+        keys = [str(i) for i in range(5)]
+        for deleted in keys:
+            rh = RobinHoodTable(sizes=[5])
+            for i, key in enumerate(keys):
+                rh[key] = i
+            self.assertEqual(len(rh), rh.table_size)
+            del rh[deleted]
+            self.assertOrdered(rh)
+            self.assertNotIn(deleted, rh)
+            self.assertEqual(sorted(rh.keys()), [key for key in keys if key != deleted])
+            for key in keys:
+                if key != deleted:
+                    del rh[key]
+            self.assertEqual(len(rh), 0)
@@ -0,0 +1,50 @@
+import unittest
+from ed_utils.decorators import number
+
+from data_structures.shared_hash_table import SharedProbeTable
+
+
+class TestSharedProbeTable(unittest.TestCase):
+
+    @number("16.1")
+    def test_share(self):
+        table = SharedProbeTable()
+        try:
+            first_name = table.name
+            for i in range(500):
+                table[f"host-{i}"] = {"id": i}
+            table["host-7"] = "updated"
+            del table["host-8"]
+            # Outgrew the first block, and moved to a new one.
+            self.assertNotEqual(table.name, first_name)
+            self.assertEqual(table.table_size, 1543)
+
+            reader = SharedProbeTable(table.name)
+            self.assertEqual(len(reader), 499)
+            self.assertEqual(reader["host-499"], {"id": 499})
+            self.assertEqual(reader["host-7"], "updated")
+            self.assertNotIn("host-8", reader)
+            self.assertEqual(set(reader.keys()), {f"host-{i}" for i in range(500)} - {"host-8"})
+            self.assertRaises(ValueError, lambda: reader.__setitem__("host-8", 8))
+            self.assertRaises(ValueError, reader.unlink)
+            reader.close()
+        finally:
+            table.unlink()
+        self.assertRaises(FileNotFoundError, lambda: SharedProbeTable(table.name))
+
+    @number("16.2")
+    def test_expected_size(self):
+        table = SharedProbeTable(expected_size=1000)
+        try:
+            self.assertEqual(table.table_size, 3079)
+            for i in range(1000):
+                table[str(i)] = i
+            # Never rehashed, so the slots are still right after the header.
+            self.assertEqual(table.size_index, 9)
+            self.assertEqual(table.slots_offset, 64)
+        finally:
+            table.unlink()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+import random
+import unittest
+from ed_utils.decorators import number
+
+from data_structures.hash_table import FullError
+from data_structures.swiss_table import SwissTable
+from data_structures.table_stats import largest_cluster
+
+
+class TestSwissTable(unittest.TestCase):
+
+    @number("11.1")
+    def test_example(self):
+        class TestingST(SwissTable):
+            def full_hash(self, k):
+                return ord(k[0])
+
+        # Disable resizing / rehashing.
+        st = TestingST(sizes=[10])
+        st["h1"] = 1   # h -> 4
+        st["h2"] = 2   # h -> 4, probed to 5
+        st["i1"] = 3   # i -> 5, probed to 6
+        st["c1"] = 4   # c -> 9
+        st["c2"] = 5   # c -> 9, wraps to 0
+        self.assertEqual(st._linear_probe("i1", False), 6)
+        self.assertEqual(st._linear_probe("c2", False), 0)
+        self.assertEqual(st.used[4], st._tag(ord("h")))
+        self.assertGreaterEqual(st.used[4], 0x80)
+        self.assertRaises(KeyError, lambda: st["h3"])
+        self.assertRaises(KeyError, lambda: st["c3"])
+
+        del st["h1"]
+        self.assertEqual(st._linear_probe("h2", False), 4)
+        self.assertEqual(st._linear_probe("i1", False), 5)
+        self.assertEqual(st.used[6], 0)
+
+        for key in ["a", "b", "d", "e", "f", "g"]:
+            st[key] = 0
+        self.assertTrue(st.is_full())
+        self.assertEqual(st["f"], 0)
+        self.assertNotIn("j", st)
+        self.assertRaises(FullError, lambda: st.__setitem__("j", 0))
+
+    @number("11.2")
+    def test_random(self):
+        rng = random.Random(1008)
+        st = SwissTable()
+        expected = {}
+        for _ in range(5000):
+            key = rng.choice([str, int])(rng.randrange(2000))
+            if key in expected and rng.random() < 0.4:
+                del st[key]
+                del expected[key]
+            else:
+                st[key] = expected[key] = rng.random()
+        self.assertEqual(len(st), len(expected))
+        self.assertEqual(set(st.keys()), set(expected))
+        for key in range(2000):
+            self.assertEqual(key in st, key in expected)
+            self.assertEqual(str(key) in st, str(key) in expected)
+
+    @number("11.3")
+    def test_consecutive_ints(self):
+        st = SwissTable()
+        for i in range(5000):
+            st[i] = i
+        # Unmixed, the keys would hash to themselves and fill one run of 5000 slots.
+        self.assertLess(largest_cluster(map(bool, st.used)), 100)
+        for i in range(5000):
+            del st[i]
+        self.assertEqual(len(st), 0)
+        self.assertNotIn(0, st)
+
+    @number("11.4")
+    def test_delete_from_full(self):
+        keys = [str(i) for i in range(5)]
+        for deleted in keys:
+            table = SwissTable(sizes=[5])
+            for i, key in enumerate(keys):
+                table[key] = i
+            self.assertEqual(len(table), table.table_size)
+            del table[deleted]
+            self.assertNotIn(deleted, table)
+            for i, key in enumerate(keys):
+                if key != deleted:
+                    self.assertEqual(table[key], i)
+            for key in keys:
+                if key != deleted:
+                    del table[key]
+            self.assertEqual(len(table), 0)
@@ -0,0 +1,46 @@
+import struct
+import unittest
+from ed_utils.decorators import number
+
+from data_structures.typed_array import TypedArray
+
+
+class TestTypedArray(unittest.TestCase):
+
+    @number("19.1")
+    def test_elements(self):
+        ints = TypedArray(5)
+        self.assertEqual(list(ints), [0] * 5)
+        ints[0] = -2 ** 63
+        ints[4] = 2 ** 63 - 1
+        self.assertEqual(ints[0], -2 ** 63)
+        self.assertRaises(OverflowError, lambda: ints.__setitem__(1, 2 ** 63))
+        self.assertRaises(IndexError, lambda: ints[5])
+
+        floats = TypedArray(3, "float64")
+        floats[1] = 0.5
+        self.assertEqual(list(floats), [0.0, 0.5, 0.0])
+        self.assertRaises(TypeError, lambda: floats.__setitem__(0, "x"))
+
+        flags = TypedArray(4, "uint8")
+        self.assertEqual(flags.itemsize, 1)
+        self.assertRaises(OverflowError, lambda: flags.__setitem__(0, 256))
+
+        self.assertRaises(ValueError, lambda: TypedArray(0))
+        self.assertRaises(ValueError, lambda: TypedArray(3, "int32"))
+
+    @number("19.2")
+    def test_buffer(self):
+        floats = TypedArray(4, "float64")
+        view = floats.memoryview()
+        self.assertEqual((view.format, view.itemsize, view.nbytes), ("d", 8, 32))
+        # Writes through the view show up in the array, and the other way round.
+        struct.pack_into("d", view, 8, 2.5)
+        self.assertEqual(floats[1], 2.5)
+        floats[3] = -1.0
+        self.assertEqual(view[3], -1.0)
+        self.assertEqual(memoryview(floats.__buffer__(0)).tolist(), [0.0, 2.5, 0.0, -1.0])
+
+
+if __name__ == '__main__':
+    unittest.main()